@@ -15,6 +15,7 @@ class CatalystCenter:
         self.token = None
         self.username = username
         self.password = password
+        self._site_ids: Optional[Dict[str, str]] = None  # nameHierarchy -> siteId, loaded once
 
     def auth(self):
         r = self.s.post(f"{self.base}/dna/system/api/v1/auth/token",
@@ -37,9 +38,17 @@ class CatalystCenter:
         Match exact nameHierarchy (e.g., 'Global/Orlando/Building A/Floor 3')
         Use the exact hierarchy string you see in the GUI.
         """
-        for s in self.get_sites():
-            if s.get("nameHierarchy") == name_hierarchy or s.get("groupNameHierarchy") == name_hierarchy:
-                return s["id"]
+        if self._site_ids is None:
+            data = self.get_sites()
+            sites = data.get("response", []) if isinstance(data, dict) else data
+            self._site_ids = {}
+            for s in sites:
+                for key in ("nameHierarchy", "groupNameHierarchy"):
+                    if s.get(key):
+                        self._site_ids[s[key]] = s["id"]
+        site_id = self._site_ids.get(name_hierarchy)
+        if site_id:
+            return site_id
         _die(f"Site not found by nameHierarchy: {name_hierarchy}")
 
     def get_pnp_devices(self) -> List[Dict[str, Any]]:
@@ -0,0 +1,515 @@
+#!/usr/bin/env python
+# End-to-end benchmarks for the client hot paths, run against the local mock Catalyst Center.
+#
+#   python -m bench.run                          # all cases, results in bench/results/<stamp>.json
+#   python -m bench.run --only paginate parsers  # a subset
+#   python -m bench.run --compare bench/results/<previous>.json   # exit 1 on regressions
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import decoding  # noqa: E402
+from src.aphunt import COMMANDS as APHUNT_COMMANDS, FleetTables, find_suspects, parse_outputs  # noqa: E402
+from src.cmd_batcher import CommandBatcher  # noqa: E402
+from src.cmdrunner import collect_read_results, command_rows, run_read_cli_commands  # noqa: E402
+from src.concurrency import WorkerPool  # noqa: E402
+from src.compliance_rules import RuleSet, evaluate_fleet, latest_snapshots  # noqa: E402
+from src.config_history import ConfigHistory  # noqa: E402
+from src.config_search import ConfigIndex  # noqa: E402
+from src.dnac_client import DNACClient  # noqa: E402
+from src.drift import DiffCache, save_snapshot, snapshot_device  # noqa: E402
+from src.hedging import Hedger, RetryBudget  # noqa: E402
+from src.instrumentation import RequestMetrics  # noqa: E402
+from src.jobs import wait_for_task  # noqa: E402
+from src.mock_dnac import MockConfig, MockDNAC, command_output, device_config, synthetic_fleet  # noqa: E402
+from src.parsers import parse_lldp_local_intf, parse_poe_on  # noqa: E402
+from src.ports_audit import AUDIT_FIELDS, COMMANDS as PORT_COMMANDS, audit_rows, fetch_interfaces  # noqa: E402
+from src.sinks import CsvSink  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Each metric is {"value": float, "unit": str, "better": "higher" | "lower"}.
+Metrics = Dict[str, Dict[str, Any]]
+
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict[str, Any]:
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+def pct(samples: List[float], p: float) -> float:
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(round(p / 100.0 * (len(s) - 1))))]
+
+
+def _client(mock: MockDNAC) -> DNACClient:
+    return DNACClient(mock.base_url, "bench", "bench")
+
+
+def bench_paginate(args: argparse.Namespace) -> Metrics:
+    out: Metrics = {}
+    for size in args.fleet_sizes:
+        with MockDNAC(synthetic_fleet(size)) as mock:
+            client = _client(mock)
+            client.get("/dna/intent/api/v1/network-device", {"limit": 1})  # warm token
+            t0 = time.perf_counter()
+            devices = client.paginate("/dna/intent/api/v1/network-device")
+            elapsed = time.perf_counter() - t0
+        assert len(devices) == size
+        out[f"paginate_{size}_s"] = metric(elapsed, "s")
+        out[f"paginate_{size}_devices_per_s"] = metric(size / elapsed, "devices/s", "higher")
+    return out
+
+
+def bench_cmdrunner(args: argparse.Namespace) -> Metrics:
+    with MockDNAC(synthetic_fleet(50)) as mock:
+        client = _client(mock)
+        uuids = [d["id"] for d in mock.devices[:10]]
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            entries = collect_read_results(client, uuids, ["show power inline", "show lldp neighbors"], poll_s=0.01)
+            samples.append(time.perf_counter() - t0)
+            assert len(entries) == len(uuids)
+    return {
+        "cmdrunner_submit_to_result_p50_ms": metric(pct(samples, 50) * 1000, "ms"),
+        "cmdrunner_submit_to_result_p95_ms": metric(pct(samples, 95) * 1000, "ms"),
+    }
+
+
+def bench_batcher(args: argparse.Namespace) -> Metrics:
+    # 40 concurrent callers of 5 devices each, direct vs. through the micro-batcher: jobs and task polls.
+    callers = 40
+    out: Metrics = {}
+    with MockDNAC(synthetic_fleet(callers * 5), MockConfig(task_delay_s=0.2)) as mock:
+        client = _client(mock)
+        uuids = [d["id"] for d in mock.devices]
+        asks = [uuids[i * 5:(i + 1) * 5] for i in range(callers)]
+        for label in ("direct", "batched"):
+            jobs, polls = mock.hits["read_request"], mock.hits["task"]
+            batcher = CommandBatcher(client, window_s=0.25, poll_s=0.05) if label == "batched" else None
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(callers) as pool:
+                list(pool.map(lambda devs: collect_read_results(client, devs, ["show version"], poll_s=0.05,
+                                                                batcher=batcher), asks))
+            out[f"batcher_{label}_s"] = metric(time.perf_counter() - t0, "s")
+            if batcher is not None:
+                batcher.close()
+            out[f"batcher_{label}_jobs"] = metric(mock.hits["read_request"] - jobs, "count")
+            out[f"batcher_{label}_task_polls"] = metric(mock.hits["task"] - polls, "count")
+    return out
+
+
+def bench_wait_for_task(args: argparse.Namespace) -> Metrics:
+    # Overhead = time past the task's actual completion, plus how many polls it took.
+    delay, poll = 0.2, 0.05
+    with MockDNAC(synthetic_fleet(10), MockConfig(task_delay_s=delay)) as mock:
+        client = _client(mock)
+        overheads, polls = [], []
+        for _ in range(max(3, args.repeat // 4)):
+            job = run_read_cli_commands(client, [mock.devices[0]["id"]], ["show version"])
+            before = mock.hits["task"]
+            t0 = time.perf_counter()
+            wait_for_task(client, job["response"]["taskId"], poll_s=poll)
+            overheads.append(time.perf_counter() - t0 - delay)
+            polls.append(mock.hits["task"] - before)
+    return {
+        "wait_for_task_overhead_mean_ms": metric(statistics.mean(overheads) * 1000, "ms"),
+        "wait_for_task_polls_mean": metric(statistics.mean(polls), "polls"),
+    }
+
+
+def bench_hedge(args: argparse.Namespace) -> Metrics:
+    # Config GETs against a server where 3% of responses stall for 1s: tail latency plain vs hedged at p95.
+    out: Metrics = {}
+    cfg = MockConfig(latency_ms=10, slow_rate=0.03, slow_ms=1000)
+    with MockDNAC(synthetic_fleet(args.hedge_requests), cfg) as mock:
+        paths = [f"/dna/intent/api/v1/network-device/{d['id']}/config" for d in mock.devices]
+        for label, hedged in (("plain", False), ("hedged", True)):
+            metrics = RequestMetrics()
+            hedger = Hedger(metrics, RetryBudget(ratio=0.1), max_workers=32) if hedged else None  # 4 x 8 callers
+            client = DNACClient(mock.base_url, "bench", "bench", hooks=[metrics], hedger=hedger)
+            client.get("/dna/intent/api/v1/network-device/count")  # warm token
+            before = mock.hits["config"]
+
+            def timed_get(path: str) -> float:
+                t0 = time.perf_counter()
+                client.get(path)
+                return time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                samples = list(ex.map(timed_get, paths))
+            out[f"hedge_{label}_s"] = metric(time.perf_counter() - t0, "s")
+            out[f"hedge_{label}_p99_ms"] = metric(pct(samples, 99) * 1000, "ms")
+            if hedger is not None:
+                time.sleep(cfg.slow_ms / 1000)  # let the losing requests drain before the mock stops
+                out["hedge_extra_requests"] = metric(mock.hits["config"] - before - len(paths), "requests")
+                hedger.close()
+    return out
+
+
+def bench_drift(args: argparse.Namespace) -> Metrics:
+    count = args.drift_devices
+    outdir = tempfile.mkdtemp(prefix="bench-drift-")
+    try:
+        with MockDNAC(synthetic_fleet(count)) as mock:
+            client = _client(mock)
+            ids = [d["id"] for d in mock.devices]
+            for dev in ids:
+                snapshot_device(client, dev, outdir, stamp="00000000_000000")
+            mock.mutate_configs(0.2)
+            diffs = DiffCache()
+            t0 = time.perf_counter()
+            for dev in ids:
+                snapshot_device(client, dev, outdir, stamp="00000000_000001", diffs=diffs)
+            elapsed = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+    return {"drift_snapshot_diff_ms_per_device": metric(elapsed / count * 1000, "ms"),
+            "drift_distinct_diffs": metric(diffs.misses, "count")}
+
+
+def bench_parsers(args: argparse.Namespace) -> Metrics:
+    fleet = synthetic_fleet(args.parse_switches)
+    poe = [command_output(d, "show power inline") for d in fleet]
+    lldp = [command_output(d, "show lldp neighbors") for d in fleet]
+    lines = sum(o.count("\n") for o in poe) + sum(o.count("\n") for o in lldp)
+    t0 = time.perf_counter()
+    for p, l in zip(poe, lldp):
+        parse_poe_on(p)
+        parse_lldp_local_intf(l)
+    elapsed = time.perf_counter() - t0
+    return {
+        "parse_switches_per_s": metric(len(fleet) / elapsed, "switches/s", "higher"),
+        "parse_lines_per_s": metric(lines / elapsed, "lines/s", "higher"),
+    }
+
+
+def bench_decode(args: argparse.Namespace) -> Metrics:
+    # Decode + keep an inventory page set: full dicts vs projected __slots__ records.
+    size = max(args.fleet_sizes)
+    pages = [json.dumps({"response": chunk}).encode()
+             for chunk in (synthetic_fleet(size)[i:i + 500] for i in range(0, size, 500))]
+    fields = ("hostname", "managementIpAddress", "platformId", "softwareVersion", "serialNumber", "id")
+    out: Metrics = {"decode_backend_orjson": metric(1.0 if decoding.orjson else 0.0, "bool", "higher")}
+    for mode in ("full", "projected"):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        kept: List[Any] = []
+        for page in pages:
+            items = decoding.loads(page)["response"]
+            kept.extend(decoding.project(items, fields) if mode == "projected" else items)
+        elapsed = time.perf_counter() - t0
+        del items  # the last page must not count towards what is kept
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        del kept
+        tracemalloc.stop()
+        out[f"decode_{mode}_devices_per_s"] = metric(size / elapsed, "devices/s", "higher")
+        out[f"decode_{mode}_kib_per_1k_devices"] = metric(current / 1024 / size * 1000, "KiB")
+    return out
+
+
+def bench_aphunt(args: argparse.Namespace) -> Metrics:
+    # Fleet join over pre-parsed records (ingest + suspects), sized in access ports.
+    ports = 48
+    fleet = synthetic_fleet(max(args.aphunt_ports // ports, 1))
+    parsed = [(d["hostname"], parse_outputs({c: command_output(d, c, ports) for c in APHUNT_COMMANDS.values()}))
+              for d in fleet]
+    t0 = time.perf_counter()
+    tables = FleetTables()
+    for host, records in parsed:
+        tables.add(host, **records)
+    t1 = time.perf_counter()
+    rows = find_suspects(tables)
+    t2 = time.perf_counter()
+    assert tables.ports == len(fleet) * ports and rows
+    return {
+        "aphunt_ingest_ports_per_s": metric(tables.ports / (t1 - t0), "ports/s", "higher"),
+        f"aphunt_join_{tables.ports}_ports_ms": metric((t2 - t1) * 1000, "ms"),
+    }
+
+
+def bench_ports(args: argparse.Namespace) -> Metrics:
+    # Full port audit against the mock: bulk interface pull, 20-switch Command Runner chunks, join, CSV.
+    count = args.ports_switches
+    outdir = tempfile.mkdtemp(prefix="bench-ports-")
+    try:
+        with MockDNAC(synthetic_fleet(count)) as mock:
+            client = _client(mock)
+            for d in mock.devices:
+                d["reachabilityStatus"] = "Reachable"
+            hosts = {d["id"]: d["hostname"] for d in mock.devices}
+            ids = list(hosts)
+
+            def run(chunk: List[str]) -> List[Dict[str, Any]]:
+                return command_rows(collect_read_results(client, chunk, PORT_COMMANDS, poll_s=0.01))
+
+            t0 = time.perf_counter()
+            interfaces = fetch_interfaces(client)
+            t1 = time.perf_counter()
+            with CsvSink(os.path.join(outdir, "ports_audit.csv"), AUDIT_FIELDS) as sink:
+                for out in WorkerPool(8).map(run, [ids[i:i + 20] for i in range(0, count, 20)]):
+                    by_dev: Dict[str, Dict[str, str]] = {}
+                    for row in out.result:
+                        by_dev.setdefault(row["deviceUuid"], {})[row["command"]] = row["output"]
+                    for dev, outputs in by_dev.items():
+                        sink.write_many(audit_rows(hosts[dev], interfaces[dev], parse_outputs(outputs)))
+            elapsed = time.perf_counter() - t0
+            assert sink.rows == sum(map(len, interfaces.values()))
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+    return {
+        "ports_audit_interfaces_fetch_ms": metric((t1 - t0) * 1000, "ms"),
+        "ports_audit_ports_per_s": metric(sink.rows / elapsed, "ports/s", "higher"),
+    }
+
+
+def bench_history(args: argparse.Namespace) -> Metrics:
+    # Reverse-delta history: a 1.5k-line config with small edits per version; point-in-time reads.
+    import random
+    rnd = random.Random(5)
+    outdir = tempfile.mkdtemp(prefix="bench-history-")
+    try:
+        hist = ConfigHistory(os.path.join(outdir, "history.db"))
+        lines = [f"interface GigabitEthernet1/0/{i}\n switchport access vlan {i % 40}\n!\n" for i in range(500)]
+        t0 = time.perf_counter()
+        for n in range(args.history_versions):
+            lines[rnd.randrange(len(lines))] = f"interface Loopback{n}\n description rev {n}\n!\n"
+            hist.add("dev", "".join(lines), at=n)
+        write_s = time.perf_counter() - t0
+        samples = []
+        for _ in range(args.repeat * 5):
+            at = rnd.randrange(args.history_versions)
+            t0 = time.perf_counter()
+            assert hist.get_config("dev", at=at)
+            samples.append(time.perf_counter() - t0)
+        st = hist.stats()
+        hist.close()
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+    return {
+        "history_add_ms_per_version": metric(write_s / args.history_versions * 1000, "ms"),
+        "history_get_config_p95_ms": metric(pct(samples, 95) * 1000, "ms"),
+        "history_stored_vs_raw_ratio": metric(st["stored_bytes"] / st["raw_bytes"], "ratio"),
+    }
+
+
+def bench_search(args: argparse.Namespace) -> Metrics:
+    # Inverted config index: build over a synthetic fleet, then exact / regex / block-scoped queries.
+    outdir = tempfile.mkdtemp(prefix="bench-search-")
+    try:
+        idx = ConfigIndex(os.path.join(outdir, "index.db"))
+        fleet = synthetic_fleet(args.search_devices)
+        t0 = time.perf_counter()
+        for n, d in enumerate(fleet):
+            idx.index_snapshot(d["id"], device_config(d, generation=n % 3), "00000000_000000")
+        build_s = time.perf_counter() - t0
+        queries = {
+            "exact": lambda: idx.search_line("logging host 10.0.0.50"),
+            "regex": lambda: idx.search(r"^ip address 10\.0\.\d+\.\d+ 255\.255\.255\.0$"),
+            "block": lambda: idx.search(r"^switchport access vlan 20$", block=r"^interface GigabitEthernet1/0/8$"),
+        }
+        out = {"search_index_ms_per_device": metric(build_s / len(fleet) * 1000, "ms")}
+        for name, q in queries.items():
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                assert q()
+                samples.append(time.perf_counter() - t0)
+            out[f"search_{name}_p50_ms"] = metric(pct(samples, 50) * 1000, "ms")
+        idx.close()
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+    return out
+
+
+def synthetic_rules(n: int) -> List[Dict[str, Any]]:
+    # A golden-config rule mix: global must/must-not lines, and block-scoped checks on SVIs and access ports.
+    rules: List[Dict[str, Any]] = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            rules.append({"id": f"r{i}", "must_not_contain": rf"^logging host 10\.0\.{i % 256}\.{i // 256}$"})
+        elif kind == 1:
+            rules.append({"id": f"r{i}", "must_contain": rf"^ip domain name \S+\.local$"})
+        elif kind == 2:
+            rules.append({"id": f"r{i}", "block": rf"^interface GigabitEthernet1/0/{i % 8 + 1}$",
+                          "must_contain": r"^switchport access vlan \d+$", "must_not_contain": "^shutdown$"})
+        else:
+            rules.append({"id": f"r{i}", "block": "^interface Vlan${mgmt_vlan}$",
+                          "must_contain": "^vrf forwarding ${mgmt_vrf}$"})
+    return rules
+
+
+def bench_rules(args: argparse.Namespace) -> Metrics:
+    # Local golden-config rules: --rules-count rules over the newest snapshot of --rules-devices devices.
+    outdir = tempfile.mkdtemp(prefix="bench-rules-")
+    try:
+        for n, d in enumerate(synthetic_fleet(args.rules_devices)):
+            cfg = device_config(d, generation=n % 3)
+            # Seed violations so the reporting path is exercised: a forbidden logging host (rule r4) on
+            # every 7th device, the domain name (every must_contain rule of that kind) missing on every 10th.
+            if n % 7 == 0:
+                cfg += "logging host 10.0.4.0\n"
+            if n % 10 == 0:
+                cfg = cfg.replace("ip domain name mock.local\n", "")
+            save_snapshot(d["id"], cfg, outdir, stamp="00000000_000000")
+        ruleset = RuleSet(synthetic_rules(args.rules_count), {"mgmt_vlan": 10, "mgmt_vrf": "MGMT"})
+        snapshots = latest_snapshots(outdir)
+        out: Metrics = {}
+        for label, workers in (("serial", 1), ("pool", None)):
+            t0 = time.perf_counter()
+            violations = sum(len(v) for _, v in evaluate_fleet(ruleset, snapshots, workers=workers))
+            elapsed = time.perf_counter() - t0
+            out[f"rules_{label}_s"] = metric(elapsed, "s")
+            out[f"rules_{label}_configs_per_s"] = metric(len(snapshots) / elapsed, "configs/s", better="higher")
+        out["rules_violations"] = metric(violations, "count")
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+    return out
+
+
+def bench_startup(args: argparse.Namespace) -> Metrics:
+    # Wall time of fresh interpreters, as cron sees it; "net" subtracts a bare `python -c pass`.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    tmp = tempfile.mkdtemp(prefix="bench-startup-")
+    try:
+        a, b = os.path.join(tmp, "a.cfg"), os.path.join(tmp, "b.cfg")
+        fleet = synthetic_fleet(1)
+        with open(a, "w") as f:
+            f.write(device_config(fleet[0]))
+        with open(b, "w") as f:
+            f.write(device_config(fleet[0], generation=1))
+        runs = {
+            "python": [sys.executable, "-c", "pass"],
+            "import_cli": [sys.executable, "-c", "import src.cli"],
+            "cli_help": [sys.executable, "-m", "src.cli", "--help"],
+            "cli_diff": [sys.executable, "-m", "src.cli", "diff", a, b],
+        }
+        samples: Dict[str, List[float]] = {}
+        for name, cmd in runs.items():
+            subprocess.run(cmd, cwd=root, capture_output=True)  # warm bytecode and page cache
+            samples[name] = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                subprocess.run(cmd, cwd=root, capture_output=True)
+                samples[name].append(time.perf_counter() - t0)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    base = statistics.median(samples.pop("python"))
+    out: Metrics = {"startup_python_ms": metric(base * 1000, "ms")}
+    for name, s in samples.items():
+        out[f"startup_{name}_ms"] = metric(statistics.median(s) * 1000, "ms")
+        out[f"startup_{name}_net_ms"] = metric(max(statistics.median(s) - base, 0.0) * 1000, "ms")
+    return out
+
+
+CASES: Dict[str, Callable[[argparse.Namespace], Metrics]] = {
+    "paginate": bench_paginate,
+    "cmdrunner": bench_cmdrunner,
+    "batcher": bench_batcher,
+    "wait_for_task": bench_wait_for_task,
+    "hedge": bench_hedge,
+    "drift": bench_drift,
+    "parsers": bench_parsers,
+    "decode": bench_decode,
+    "startup": bench_startup,
+    "aphunt": bench_aphunt,
+    "ports": bench_ports,
+    "history": bench_history,
+    "search": bench_search,
+    "rules": bench_rules,
+}
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR)).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(current: Metrics, baseline: Metrics, threshold: float) -> List[str]:
+    # A metric regresses when it moves the wrong way by more than threshold (fractional).
+    regressions = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base or not base["value"]:
+            continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        worse = change > threshold if cur["better"] == "lower" else change < -threshold
+        if worse:
+            regressions.append(f"{name}: {base['value']} -> {cur['value']} {cur['unit']} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark client, pagination, polling and parsing hot paths.")
+    ap.add_argument("--only", nargs="*", choices=sorted(CASES), help="Run only these cases")
+    ap.add_argument("--fleet-sizes", nargs="*", type=int, default=[500, 2000, 10000])
+    ap.add_argument("--repeat", type=int, default=20, help="Samples for latency cases (default: 20)")
+    ap.add_argument("--drift-devices", type=int, default=200)
+    ap.add_argument("--hedge-requests", type=int, default=400, help="Config GETs in the hedging case")
+    ap.add_argument("--parse-switches", type=int, default=1000)
+    ap.add_argument("--aphunt-ports", type=int, default=100_000, help="Access ports for the aphunt join")
+    ap.add_argument("--ports-switches", type=int, default=500, help="Switches in the ports audit case")
+    ap.add_argument("--history-versions", type=int, default=300, help="Versions in the config history case")
+    ap.add_argument("--search-devices", type=int, default=2000, help="Configs in the config search case")
+    ap.add_argument("--rules-count", type=int, default=500, help="Rules in the golden-config rules case")
+    ap.add_argument("--rules-devices", type=int, default=5000, help="Configs in the golden-config rules case")
+    ap.add_argument("--out", default=None, help="Results JSON (default: bench/results/<stamp>.json)")
+    ap.add_argument("--compare", default=None, help="Previous results JSON to check for regressions")
+    ap.add_argument("--threshold", type=float, default=0.10, help="Regression threshold (default: 0.10)")
+    args = ap.parse_args()
+
+    results: Metrics = {}
+    for name in args.only or CASES:
+        t0 = time.perf_counter()
+        results.update(CASES[name](args))
+        print(f"[bench] {name} done in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+    for name, m in results.items():
+        print(f"{name:45} {m['value']:>14} {m['unit']}")
+
+    doc = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    print(f"[bench] wrote {out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"[REGRESSION] {r}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,43 @@
 #!/usr/bin/env python
 # List all network devices and (optionally) write CSV.
-import argparse, csv
+import argparse
+from itertools import islice
 from src.config import Settings
 from src.dnac_client import DNACClient
+from src.instrumentation import RequestMetrics
+from src.inventory import SITE_FIELD, Inventory
+from src.site_index import device_sites
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--csv", default=None, help="Path to write inventory CSV (optional)")
+    parser.add_argument("--metrics", default=None, help="Write Prometheus text metrics to this path (optional)")
     args = parser.parse_args()
 
     s = Settings()
+    metrics = RequestMetrics()
     client = DNACClient(
         base_url=s.dnac_url, username=s.username, password=s.password,
-        verify=s.verify_ssl, timeout=s.timeout, proxies=s.proxies()
+        verify=s.verify_ssl, timeout=s.timeout, proxies=s.proxies(), hooks=[metrics]
     )
-    devices = client.paginate("/dna/intent/api/v1/network-device")
-    print(f"Devices: {len(devices)}")
-    for d in devices[:10]:
-        print(d.get("hostname"), d.get("managementIpAddress"), d.get("platformId"))
+    inv = Inventory.fetch(client)
+    print(f"Devices: {len(inv)}")
+    for row in islice(inv.rows(["hostname", "managementIpAddress", "platformId"]), 10):
+        print(*row)
 
     if args.csv:
-        import os
-        os.makedirs(os.path.dirname(args.csv), exist_ok=True)
-        with open(args.csv, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["hostname","mgmtIp","platformId","softwareVersion","serialNumber","id","site"])
-            for d in devices:
-                w.writerow([
-                    d.get("hostname"),
-                    d.get("managementIpAddress"),
-                    d.get("platformId"),
-                    d.get("softwareVersion"),
-                    d.get("serialNumber"),
-                    d.get("id"),
-                    (d.get("locationName") or ""),
-                ])
+        inv.assign_sites(device_sites(client))  # the site column comes from site membership, not the device records
+        inv.to_csv(
+            args.csv,
+            ["hostname", "managementIpAddress", "platformId", "softwareVersion", "serialNumber", "id", SITE_FIELD],
+            header=["hostname", "mgmtIp", "platformId", "softwareVersion", "serialNumber", "id", "site"],
+        )
         print(f"Wrote CSV: {args.csv}")
 
+    print()
+    print(metrics.summary_table())
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,15 +1,41 @@
 #!/usr/bin/env python
 # Fetch config compliance summary (category varies by version).
-import json
+# With --details, collect per-device compliance into a local store and print non-compliant devices.
+import argparse, json
 from src.config import Settings
 from src.dnac_client import DNACClient
-from src.compliance_api import get_compliance_status
+from src.compliance_api import get_compliance_status, collect_device_compliance
+from src.compliance_store import ComplianceStore
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--details", action="store_true", help="Collect per-device compliance detail")
+    parser.add_argument("--db", default="compliance.db", help="Local compliance store (default: compliance.db)")
+    parser.add_argument("--no-trigger", action="store_true", help="Only pull detail; do not trigger a new run")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent detail fetches (default: 8)")
+    args = parser.parse_args()
+
     s = Settings()
     client = DNACClient(s.dnac_url, s.username, s.password, verify=s.verify_ssl, timeout=s.timeout, proxies=s.proxies())
-    data = get_compliance_status(client)
-    print(json.dumps(data, indent=2))
+    if not args.details:
+        data = get_compliance_status(client)
+        print(json.dumps(data, indent=2))
+        return
+
+    devices = client.paginate("/dna/intent/api/v1/network-device")
+    uuids = [d["id"] for d in devices if d.get("id")]
+    store = ComplianceStore(args.db)
+    run_id = collect_device_compliance(client, uuids, store, trigger=not args.no_trigger, workers=args.workers)
+    bad = store.non_compliant(run_id)
+    print(f"Run {run_id}: {len(uuids)} devices, {len(bad)} non-compliant item(s)")
+    for row in bad:
+        print(row["deviceUuid"], row["category"], row["status"])
+    changes = store.delta(run_id)
+    if changes:
+        print(f"\nChanged since previous run: {len(changes)}")
+        for c in changes:
+            print(c["deviceUuid"], c["category"], f"{c['previous']} -> {c['current']}")
+    store.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
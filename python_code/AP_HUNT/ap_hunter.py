@@ -1,6 +1,5 @@
 import csv
 import os
-import re
 import sys
 import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -11,105 +10,11 @@ from netmiko import ConnectHandler, NetmikoTimeoutException, NetmikoAuthenticati
 
 # ---- Helpers -------------------------------------------------------------------------------------
 
-SHORTEN_MAP = {
-    "GigabitEthernet": "Gi",
-    "TenGigabitEthernet": "Te",
-    "TwentyFiveGigE": "Twe",      # seen on some platforms
-    "FortyGigabitEthernet": "Fo",
-    "HundredGigE": "Hu",
-    "FastEthernet": "Fa",
-    "TwoGigabitEthernet": "Tw",
-    "AppGigabitEthernet": "Ap",
-    "Ethernet": "Eth",
-}
-
-def norm_intf(name: str) -> str:
-    """
-    Normalize interface names so 'GigabitEthernet1/0/1' and 'Gi1/0/1' match.
-    - trims spaces
-    - titlecase long names to consistent map
-    - converts long names to Cisco short forms (Gi/Te/Fa, etc.)
-    - uppercases final
-    """
-    if not name:
-        return ""
-    s = name.strip()
-    # remove trailing commas/colons common in outputs
-    s = s.rstrip(",:")
-    # compress multiple spaces
-    s = re.sub(r"\s+", "", s)
-
-    # If already looks short (Gi1/0/1), just uppercase Gi->GI for stable compare
-    m = re.match(r"^[A-Za-z]{1,3}\d", s)
-    if m:
-        return s[:2].capitalize() + s[2:]  # keep Gi/Te/Hu casing consistent
-
-    # Try replacing long names to short
-    for long, short in SHORTEN_MAP.items():
-        if s.startswith(long):
-            return short + s[len(long):]
-    return s  # fallback unchanged
-
-
-def parse_poe_on(output: str) -> set:
-    """
-    Parse 'show power inline' output.
-    We accept any line where the operational state shows 'on'.
-    Works with table lines like:
-    Gi1/0/1  auto   on   15.4   Ieee PD   4     30.0
-    """
-    poe_on = set()
-    for line in output.splitlines():
-        # quick pass: must start with an interface token
-        line = line.strip()
-        if not line or line.lower().startswith(("interface", "module", "device", "system", "available", "max", "admin", "----")):
-            continue
-        # Find a leading interface token
-        m = re.match(r"^(?P<intf>[A-Za-z][A-Za-z0-9/._-]+)\s+.*?\b(on)\b", line, flags=re.IGNORECASE)
-        if m:
-            poe_on.add(norm_intf(m.group("intf")))
-    return poe_on
-
-
-def parse_lldp_local_intf(output: str) -> set:
-    """
-    Parse 'show lldp neighbors' (summary) output to collect Local Intf column.
-    Typical table rows start with Local Intf in column 1.
-    Also supports 'show lldp neighbors detail' by detecting 'Local Intf:' lines.
-    """
-    lldp_ports = set()
-    lines = output.splitlines()
-
-    # Try 'detail' style first
-    for line in lines:
-        dm = re.search(r"Local\s+Intf\s*:\s*([A-Za-z0-9/._-]+)", line, flags=re.IGNORECASE)
-        if dm:
-            lldp_ports.add(norm_intf(dm.group(1)))
-
-    if lldp_ports:
-        return lldp_ports
-
-    # Summary table style: header contains 'Local Intf'
-    header_idx = None
-    for i, line in enumerate(lines):
-        if re.search(r"\bLocal\s+Intf\b", line, flags=re.IGNORECASE):
-            header_idx = i
-            break
-
-    # After header, rows usually begin with interface names until a blank
-    if header_idx is not None:
-        for line in lines[header_idx + 1:]:
-            if not line.strip():
-                continue
-            # stop at separators or non-table content
-            if re.match(r"^-{3,}|={3,}", line):
-                continue
-            # First column token should be the local interface
-            first = line.strip().split()[0]
-            # Must look like an interface
-            if re.match(r"^[A-Za-z][A-Za-z0-9/._-]+$", first):
-                lldp_ports.add(norm_intf(first))
-    return lldp_ports
+# Parsers live in src/parsers.py so the fleet tools and benchmarks share them.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.parsers import parse_poe_on, parse_lldp_local_intf  # noqa: E402
+from src.reachability import probe  # noqa: E402
+from src.sinks import BufferedSink, CsvSink  # noqa: E402
 
 
 def ensure_dir(path: str):
@@ -213,6 +118,9 @@ def main():
     ap.add_argument("--out", default="./aphunt_out", help="Output directory (default: ./aphunt_out)")
     ap.add_argument("--workers", type=int, default=8, help="Parallel workers (default: 8)")
     ap.add_argument("--timeout", type=int, default=20, help="SSH timeout seconds (default: 20)")
+    ap.add_argument("--probe", action="store_true",
+                    help="TCP-probe port 22 on every switch first and skip silent ones (listed in skipped.csv)")
+    ap.add_argument("--probe-timeout", type=float, default=2.0, help="Deadline for the probe sweep (default: 2)")
     args = ap.parse_args()
 
     ensure_dir(args.out)
@@ -229,36 +137,43 @@ def main():
         print("No devices loaded from inventory.", file=sys.stderr)
         sys.exit(2)
 
-    combined = []
+    if args.probe:
+        # One parallel connect sweep instead of a full SSH timeout per dead switch
+        answered = probe({d["host"]: d["host"] for d in devices}, (22,), args.probe_timeout)
+        silent = [d["host"] for d in devices if answered.get(d["host"]) is None]
+        if silent:
+            with CsvSink(os.path.join(args.out, "skipped.csv"), ["host", "reason"]) as skipped:
+                skipped.write_many({"host": h, "reason": f"no answer on 22 within {args.probe_timeout:g}s"} for h in silent)
+            print(f"[i] Skipping {len(silent)} switch(es) not answering on 22; see {args.out}/skipped.csv")
+        devices = [d for d in devices if answered.get(d["host"]) is not None]
+
     errors = []
 
-    with ThreadPoolExecutor(max_workers=args.workers) as ex:
-        futs = [
-            ex.submit(
-                process_switch,
-                d["host"], d["username"], d["password"], d["device_type"],
-                args.out, args.timeout
-            )
-            for d in devices
-        ]
-        for fut in as_completed(futs):
-            res = fut.result()
-            host = res["host"]
-            if res["ok"]:
-                combined.extend(res["suspects"])
-                print(f"[OK] {host}: {len(res['suspects'])} suspect port(s)")
-            else:
-                errors.append((host, res["error"]))
-                print(f"[ERR] {host}: {res['error']}", file=sys.stderr)
-
-    # Combined CSV
+    # Combined CSV, streamed as each switch finishes (completion order) so nothing piles up in memory
     combined_path = os.path.join(args.out, "combined_all_suspects.csv")
-    with open(combined_path, "w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["switch", "interface", "reason", "timestamp"])
-        ts = datetime.utcnow().isoformat() + "Z"
-        for host, iface in sorted(combined):
-            w.writerow([host, iface, "PoE on, no LLDP neighbor", ts])
+    ts = datetime.utcnow().isoformat() + "Z"
+    with BufferedSink(CsvSink(combined_path, ["switch", "interface", "reason", "timestamp"])) as combined:
+        with ThreadPoolExecutor(max_workers=args.workers) as ex:
+            futs = [
+                ex.submit(
+                    process_switch,
+                    d["host"], d["username"], d["password"], d["device_type"],
+                    args.out, args.timeout
+                )
+                for d in devices
+            ]
+            for fut in as_completed(futs):
+                res = fut.result()
+                host = res["host"]
+                if res["ok"]:
+                    combined.write_many(
+                        {"switch": h, "interface": iface, "reason": "PoE on, no LLDP neighbor", "timestamp": ts}
+                        for h, iface in res["suspects"]
+                    )
+                    print(f"[OK] {host}: {len(res['suspects'])} suspect port(s)")
+                else:
+                    errors.append((host, res["error"]))
+                    print(f"[ERR] {host}: {res['error']}", file=sys.stderr)
 
     print(f"\nWrote combined suspects: {combined_path}")
 
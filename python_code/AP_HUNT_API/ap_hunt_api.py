@@ -3,8 +3,16 @@ import json
 import time
 import getpass
 import csv
+import os
+import sys
+import argparse
 from urllib3.exceptions import InsecureRequestWarning
 
+# Checkpoint journal and show-output parsers live in src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.checkpoint import Checkpoint  # noqa: E402
+from src.parsers import parse_lldp_local_intf, parse_poe_on  # noqa: E402
+
 # === CONFIGURATION ===
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
 
@@ -15,6 +23,12 @@ SWITCH_FILE = "switches.txt"
 COMMANDS = ["show power inline", "show lldp neighbors"]
 TEXT_OUT = "ap_hunt_results.txt"
 CSV_OUT = "ap_hunt_results.csv"
+JOURNAL = "checkpoint.db"          # per-switch status and suspects, for --resume
+
+parser = argparse.ArgumentParser(description="Find PoE ports without an LLDP neighbor via Command Runner")
+parser.add_argument("--resume", action="store_true", help="Skip switches completed by the previous run; retry failures")
+parser.add_argument("--journal", default=JOURNAL, help="Checkpoint journal (SQLite)")
+args = parser.parse_args()
 
 
 # === AUTHENTICATION ===
@@ -37,11 +51,6 @@ with open(SWITCH_FILE, "r") as f:
 print(f"[+] Loaded {len(switch_names)} switches from {SWITCH_FILE}\n")
 
 
-# === RESULT STORAGE ===
-results_summary = []
-text_output = []
-
-
 # === FUNCTION: RUN COMMANDS ON ONE SWITCH ===
 def run_commands_for_switch(hostname):
     print(f"[>] Processing switch: {hostname}")
@@ -52,7 +61,7 @@ def run_commands_for_switch(hostname):
     data = device_resp.json()
     if not data.get("response"):
         print(f"    [!] Switch {hostname} not found in Catalyst Center.")
-        return
+        return None
 
     device_uuid = data["response"][0]["id"]
     print(f"    [i] Found UUID: {device_uuid}")
@@ -85,40 +94,49 @@ def run_commands_for_switch(hostname):
     power_output = command_output.get("show power inline", "")
     lldp_output = command_output.get("show lldp neighbors", "")
 
-    # Step 5: Parse + Diff
-    suspect_ports = []
+    # Step 5: Parse + Diff (PoE on, no LLDP neighbor on the same normalized interface)
+    suspect_ports = sorted(parse_poe_on(power_output) - parse_lldp_local_intf(lldp_output))
 
-    # Identify PoE ports that are "on" or "delivering power"
-    for line in power_output.splitlines():
-        if line and ("on" in line.lower() or "deliver" in line.lower()):
-            port = line.split()[0]
-            # If port not in LLDP output → suspect
-            if port not in lldp_output:
-                suspect_ports.append(port)
-
-    # Step 6: Save Results
     if suspect_ports:
         print(f"    [!] {len(suspect_ports)} suspect ports found.")
-        text_output.append(f"\n=== Switch: {hostname} ===\nSuspect Ports:\n" +
-                           "\n".join(suspect_ports))
-        for p in suspect_ports:
-            results_summary.append({"Switch": hostname, "Port": p})
     else:
         print("    [✓] No suspect ports found.")
-        text_output.append(f"\n=== Switch: {hostname} ===\nNo suspect ports found.\n")
-
     print("")
+    return suspect_ports
 
 
 # === MAIN LOOP ===
-for switch in switch_names:
+ckpt = Checkpoint(args.journal, "ap_hunt", resume=args.resume)
+todo = ckpt.pending(switch_names)
+if args.resume:
+    print(f"[i] Resuming: {len(switch_names) - len(todo)} switches already done, {len(todo)} to go.\n")
+
+for switch in todo:
     try:
-        run_commands_for_switch(switch)
+        ckpt.done(switch, run_commands_for_switch(switch))
     except Exception as e:
+        ckpt.failed(switch, e)
         print(f"[!] Error processing {switch}: {e}\n")
         continue
 
 
+# === Step 6: Collect results (this run + journaled switches from earlier runs) ===
+results_summary = []
+text_output = []
+suspects_by_switch = ckpt.outputs()
+for switch in switch_names:
+    if switch not in suspects_by_switch or suspects_by_switch[switch] is None:
+        continue  # failed or not found
+    suspect_ports = suspects_by_switch[switch]
+    if suspect_ports:
+        text_output.append(f"\n=== Switch: {switch} ===\nSuspect Ports:\n" +
+                           "\n".join(suspect_ports))
+        for p in suspect_ports:
+            results_summary.append({"Switch": switch, "Port": p})
+    else:
+        text_output.append(f"\n=== Switch: {switch} ===\nNo suspect ports found.\n")
+
+
 # === WRITE OUTPUT FILES ===
 with open(TEXT_OUT, "w") as txt:
     txt.write("\n".join(text_output))
@@ -131,4 +149,7 @@ if results_summary:
         writer.writerows(results_summary)
     print(f"[+] CSV summary written to {CSV_OUT}")
 
+failed = ckpt.failures()
+if failed:
+    print(f"[!] {len(failed)} switches failed; rerun with --resume to retry only those.")
 print("\n✅ AP Hunt completed successfully.")
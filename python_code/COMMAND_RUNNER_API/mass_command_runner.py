@@ -3,9 +3,17 @@ import requests
 import json
 import time
 import getpass
-import csv
+import os
+import sys
+import argparse
 from urllib3.exceptions import InsecureRequestWarning
 
+# Checkpoint journal lives in src/checkpoint.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.checkpoint import Checkpoint  # noqa: E402
+from src.cmdrunner import command_rows  # noqa: E402
+from src.sinks import CsvSink, JsonlSink  # noqa: E402
+
 # === CONFIGURATION ===
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
 
@@ -15,6 +23,14 @@ SWITCH_FILE = "device_uuids.txt"   # one deviceUuid per line
 COMMANDS = ["show version", "show ip interface brief"]
 TEXT_OUT = "command_runner_results.txt"
 CSV_OUT = "command_runner_results.csv"
+CSV_FIELDS = ["deviceUuid", "command", "output", "error"]
+CHUNK = 50                         # devices per Command Runner job; progress is journaled per chunk
+JOURNAL = "checkpoint.db"          # per-device status and outputs, for --resume
+
+parser = argparse.ArgumentParser(description="Run read-only commands on many devices via Command Runner")
+parser.add_argument("--resume", action="store_true", help="Skip devices completed by the previous run; retry failures")
+parser.add_argument("--journal", default=JOURNAL, help="Checkpoint journal (SQLite)")
+args = parser.parse_args()
 
 # === AUTHENTICATION ===
 print("🔐 Catalyst Center Login")
@@ -27,37 +43,43 @@ token = auth_resp.json().get("Token") or auth_resp.json().get("token")
 HEADERS = {"X-Auth-Token": token, "Content-Type": "application/json"}
 print("[+] Authentication successful.\n")
 
-# === SUBMIT COMMAND RUNNER JOB ===
+# === SUBMIT COMMAND RUNNER JOBS (one per chunk) ===
 with open(SWITCH_FILE, "r", encoding="utf-8") as f:
     device_uuids = [ln.strip() for ln in f if ln.strip()]
 
-submit_url = f"{DNAC}/dna/intent/api/v1/network-device-poller/cli/read-request"
-payload = {"deviceUuids": device_uuids, "commands": COMMANDS, "timeout": 60}
-r = requests.post(submit_url, headers=HEADERS, json=payload, verify=False)
-r.raise_for_status()
-task_id = r.json().get("response", {}).get("taskId") or r.json().get("taskId")
-print(f"[>] Submitted Command Runner task: {task_id}")
-
-# === POLL TASK ===
-detail_url = f"{DNAC}/dna/intent/api/v1/tasks/{task_id}/detail"
-file_id = None
-while True:
-    tr = requests.get(detail_url, headers=HEADERS, verify=False)
-    tr.raise_for_status()
-    tj = tr.json() or {}
-    prog = str(tj.get("progress", "")).lower()
-    file_id = tj.get("fileId")
-    if tj.get("isError"):
-        print("[x] Task error:", json.dumps(tj, indent=2))
-        break
-    if "complete" in prog or "success" in prog:
-        print("[✓] Task complete.")
-        break
-    time.sleep(2)
-
-# === FETCH RESULT FILE ===
-rows = []
-if file_id:
+ckpt = Checkpoint(args.journal, "mass_command_runner", resume=args.resume)
+todo = ckpt.pending(device_uuids)
+if args.resume:
+    print(f"[i] Resuming: {len(device_uuids) - len(todo)} devices already done, {len(todo)} to go.\n")
+
+
+def run_chunk(uuids):
+    submit_url = f"{DNAC}/dna/intent/api/v1/network-device-poller/cli/read-request"
+    payload = {"deviceUuids": uuids, "commands": COMMANDS, "timeout": 60}
+    r = requests.post(submit_url, headers=HEADERS, json=payload, verify=False)
+    r.raise_for_status()
+    task_id = r.json().get("response", {}).get("taskId") or r.json().get("taskId")
+    print(f"[>] Submitted Command Runner task: {task_id} ({len(uuids)} devices)")
+
+    # === POLL TASK ===
+    detail_url = f"{DNAC}/dna/intent/api/v1/tasks/{task_id}/detail"
+    file_id = None
+    while True:
+        tr = requests.get(detail_url, headers=HEADERS, verify=False)
+        tr.raise_for_status()
+        tj = tr.json() or {}
+        prog = str(tj.get("progress", "")).lower()
+        file_id = tj.get("fileId")
+        if tj.get("isError"):
+            raise RuntimeError("Task error: " + json.dumps(tj))
+        if "complete" in prog or "success" in prog:
+            print("[✓] Task complete.")
+            break
+        time.sleep(2)
+
+    # === FETCH RESULT FILE ===
+    if not file_id:
+        raise RuntimeError(f"Task {task_id} finished without a fileId")
     fr = requests.get(f"{DNAC}/dna/intent/api/v1/file/{file_id}",
                       headers=HEADERS, verify=False)
     fr.raise_for_status()
@@ -66,30 +88,48 @@ if file_id:
     except Exception:
         data = {"raw": fr.text}
 
-    # minimal flatten for typical shape
-    cr = data.get("commandResponses") if isinstance(data, dict) else None
-    if cr and isinstance(cr, dict):
-        for dev, outs in (cr.get("SUCCESS") or {}).items():
-            if isinstance(outs, dict):
-                for cmd, out in outs.items():
-                    rows.append({"deviceUuid": dev, "command": cmd, "output": out})
-            elif isinstance(outs, list):
-                for i, out in enumerate(outs, 1):
-                    rows.append({"deviceUuid": dev, "index": i, "output": out})
-        for dev, err in (cr.get("FAILURE") or {}).items():
-            rows.append({"deviceUuid": dev, "error": str(err)})
-    else:
-        rows.append({"payload": json.dumps(data)})
-
-# === WRITE OUTPUTS ===
-with open(TEXT_OUT, "w", encoding="utf-8") as f:
-    for rrow in rows:
-        f.write(json.dumps(rrow, ensure_ascii=False) + "\n")
+    # The result file is a list of {"deviceUuid", "commandResponses"}; each device's rows are its output
+    entries = data if isinstance(data, list) else (data.get("response") if isinstance(data, dict) else None)
+    if not isinstance(entries, list):
+        raise RuntimeError("Unexpected result payload: " + json.dumps(data)[:200])
+    by_dev = {dev: [] for dev in uuids}
+    for row in command_rows(entries):
+        by_dev.setdefault(row["deviceUuid"], []).append(row)
+    for dev, dev_rows in by_dev.items():
+        errors = [r["error"] for r in dev_rows if r["error"]]
+        if not dev_rows:
+            ckpt.failed(dev, "no result returned")
+        elif errors:
+            ckpt.failed(dev, "; ".join(errors))
+        else:
+            ckpt.done(dev, dev_rows)
+
+
+for i in range(0, len(todo), CHUNK):
+    chunk = todo[i:i + CHUNK]
+    try:
+        run_chunk(chunk)
+    except Exception as e:
+        # token expiry / network blip: journal the chunk as failed and keep going
+        print(f"[x] Chunk {i // CHUNK + 1} failed: {e}")
+        for dev in chunk:
+            ckpt.failed(dev, e)
+
+# === WRITE OUTPUTS (all devices in the journal, including earlier runs) ===
+# Streamed from the journal with a declared CSV schema, so the result set never sits in memory.
+wanted = set(device_uuids)
+failures = ckpt.failures()
+with JsonlSink(TEXT_OUT) as text_out, CsvSink(CSV_OUT, CSV_FIELDS) as csv_out:
+    for dev, dev_rows in ckpt.iter_outputs():
+        if dev in wanted:
+            text_out.write_many(dev_rows or [])
+            csv_out.write_many(dev_rows or [])
+    for dev, err in failures.items():
+        if dev in wanted:
+            text_out.write({"deviceUuid": dev, "error": err})
+            csv_out.write({"deviceUuid": dev, "error": err})
 print(f"[+] Wrote text -> {TEXT_OUT}")
+print(f"[+] Wrote CSV  -> {CSV_OUT}")
 
-if rows:
-    headers = sorted({k for rrow in rows for k in rrow.keys()})
-    with open(CSV_OUT, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=headers)
-        w.writeheader(); w.writerows(rows)
-    print(f"[+] Wrote CSV  -> {CSV_OUT}")
+if failures:
+    print(f"[!] {len(failures)} devices failed; rerun with --resume to retry only those.")
@@ -5,7 +5,14 @@ import time
 import getpass
 import csv
 from urllib3.exceptions import InsecureRequestWarning
-import os, difflib
+import os, sys, argparse
+
+# Checkpoint journal lives in src/checkpoint.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.checkpoint import Checkpoint  # noqa: E402
+from src.config_history import ConfigHistory  # noqa: E402
+from src.config_search import ConfigIndex  # noqa: E402
+from src.drift import DIFF_CACHE, cluster_drift, write_drift_report  # noqa: E402
 
 # === CONFIGURATION ===
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
@@ -14,6 +21,15 @@ DNAC = "https://10.147.3.62"        # e.g. https://10.10.10.5
 USERNAME = "206889554"
 SWITCH_FILE = "device_ids.txt"    # one networkDeviceId per line
 OUTDIR = "baselines"              # local snapshots & diffs
+JOURNAL = "checkpoint.db"         # per-device progress, for --resume
+REPORT = "drift_report.txt"       # drifted devices grouped by identical change
+
+parser = argparse.ArgumentParser(description="Snapshot running configs and diff against the previous baseline")
+parser.add_argument("--resume", action="store_true", help="Skip devices completed by the previous run; retry failures")
+parser.add_argument("--journal", default=JOURNAL, help="Checkpoint journal (SQLite)")
+parser.add_argument("--history", default=None, help="Also record snapshots in this config history DB (src/config_history.py)")
+parser.add_argument("--index", default=None, help="Also keep this config search index current (src/config_search.py)")
+args = parser.parse_args()
 
 # === AUTHENTICATION ===
 print("🔐 Catalyst Center Login")
@@ -33,45 +49,75 @@ stamp = time.strftime("%Y%m%d_%H%M%S")
 with open(SWITCH_FILE, "r", encoding="utf-8") as f:
     device_ids = [ln.strip() for ln in f if ln.strip()]
 
-for dev in device_ids:
-    dev_dir = os.path.join(OUTDIR, dev)
-    os.makedirs(dev_dir, exist_ok=True)
-
-    # Pull current running config (per-device endpoint)
-    url = f"{DNAC}/dna/intent/api/v1/network-device/{dev}/config"
-    r = requests.get(url, headers=HEADERS, verify=False)
-    r.raise_for_status()
-    obj = r.json() if r.headers.get("Content-Type","").startswith("application/json") else None
-
-    if isinstance(obj, dict) and "response" in obj:
-        resp = obj["response"]
-        if isinstance(resp, str):
-            cfg = resp
-        elif isinstance(resp, list) and resp and isinstance(resp[0], dict):
-            cfg = resp[0].get("runningConfig") or resp[0].get("config") or ""
+ckpt = Checkpoint(args.journal, "config_drift", resume=args.resume)
+history = ConfigHistory(args.history) if args.history else None
+index = ConfigIndex(args.index) if args.index else None
+todo = ckpt.pending(device_ids)
+# Devices finished by an earlier run (--resume) are skipped below but still belong in the drift report
+wanted = set(device_ids)
+results = [out for dev, out in ckpt.iter_outputs() if dev in wanted and out]
+if args.resume:
+    print(f"[i] Resuming: {len(device_ids) - len(todo)} devices already done, {len(todo)} to go.\n")
+
+for dev in todo:
+    try:
+        dev_dir = os.path.join(OUTDIR, dev)
+        os.makedirs(dev_dir, exist_ok=True)
+
+        # Pull current running config (per-device endpoint)
+        url = f"{DNAC}/dna/intent/api/v1/network-device/{dev}/config"
+        r = requests.get(url, headers=HEADERS, verify=False)
+        r.raise_for_status()
+        obj = r.json() if r.headers.get("Content-Type","").startswith("application/json") else None
+
+        if isinstance(obj, dict) and "response" in obj:
+            resp = obj["response"]
+            if isinstance(resp, str):
+                cfg = resp
+            elif isinstance(resp, list) and resp and isinstance(resp[0], dict):
+                cfg = resp[0].get("runningConfig") or resp[0].get("config") or ""
+            else:
+                cfg = json.dumps(obj)
         else:
-            cfg = json.dumps(obj)
-    else:
-        cfg = r.text
-
-    cur_path = os.path.join(dev_dir, f"{stamp}.cfg")
-    with open(cur_path, "w", encoding="utf-8") as f:
-        f.write(cfg)
-
-    # Diff against previous snapshot (if any)
-    snaps = sorted([p for p in os.listdir(dev_dir) if p.endswith(".cfg")])
-    status = "BASELINED"
-    if len(snaps) >= 2:
-        prev_path = os.path.join(dev_dir, snaps[-2])
-        with open(prev_path, "r", encoding="utf-8") as f:
-            old = f.read()
-        diff_txt = "".join(difflib.unified_diff(
-            old.splitlines(keepends=True),
-            cfg.splitlines(keepends=True),
-            fromfile="previous", tofile="current"
-        ))
-        with open(os.path.join(dev_dir, f"{stamp}.diff"), "w", encoding="utf-8") as f:
-            f.write(diff_txt)
-        status = "DRIFT" if diff_txt.strip() else "NO_CHANGE"
-
-    print(json.dumps({"deviceId": dev, "snapshot": cur_path, "status": status}, indent=2))
+            cfg = r.text
+
+        cur_path = os.path.join(dev_dir, f"{stamp}.cfg")
+        with open(cur_path, "w", encoding="utf-8") as f:
+            f.write(cfg)
+        if history is not None:
+            history.add(dev, cfg, stamp)
+        if index is not None:
+            index.index_snapshot(dev, cfg, stamp)
+
+        # Diff against previous snapshot (if any)
+        snaps = sorted([p for p in os.listdir(dev_dir) if p.endswith(".cfg")])
+        result = {"deviceId": dev, "snapshot": cur_path, "status": "BASELINED"}
+        if len(snaps) >= 2:
+            prev_path = os.path.join(dev_dir, snaps[-2])
+            with open(prev_path, "r", encoding="utf-8") as f:
+                old = f.read()
+            # Memoized: a fleet-wide change is diffed once, and devices sharing it share a change id
+            change, diff_txt = DIFF_CACHE.change(old, cfg)
+            diff_path = os.path.join(dev_dir, f"{stamp}.diff")
+            with open(diff_path, "w", encoding="utf-8") as f:
+                f.write(diff_txt)
+            if diff_txt.strip():
+                result.update(status="DRIFT", change=change, diff=diff_path)
+            else:
+                result["status"] = "NO_CHANGE"
+
+        results.append(result)
+        ckpt.done(dev, result)
+        print(json.dumps(result, indent=2))
+    except Exception as e:
+        ckpt.failed(dev, e)
+        print(f"[!] Error processing {dev}: {e}")
+
+clusters = cluster_drift(results)
+if clusters:
+    write_drift_report(REPORT, clusters)
+    print(f"[+] {sum(len(c['devices']) for c in clusters)} drifted devices in {len(clusters)} distinct change(s) -> {REPORT}")
+
+counts = ckpt.counts()
+print(f"[+] Done: {counts.get('DONE', 0)}  Failed: {counts.get('FAILED', 0)}"
+      + ("  (rerun with --resume to retry failures)" if counts.get("FAILED") else ""))
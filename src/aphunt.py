@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from array import array
+from itertools import compress, repeat
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .parsers import parse_cdp_neighbors, parse_lldp_neighbors, parse_mac_table, parse_poe_ports
+
+# Fleet-wide AP hunt: "PoE is on, but nothing on the port announces itself over LLDP or CDP".
+# Parsed PoE / LLDP / CDP / MAC records for every switch go into columnar tables (parallel columns, switch
+# names dictionary-encoded), and suspects come out of one keyed join on (switch, interface) across the
+# whole fleet instead of a loop per switch. compare_runs() then splits suspects into new / persisting /
+# cleared against the previous run's state file.
+#
+#   tables = FleetTables()
+#   tables.add_outputs("sw1", {"show power inline": ..., "show lldp neighbors": ..., "show cdp neighbors": ...})
+#   rows = find_suspects(tables)
+#   diff = compare_runs(suspect_keys(rows), load_state("aphunt_state.json"))
+
+COMMANDS = {
+    "poe": "show power inline",
+    "lldp": "show lldp neighbors",
+    "cdp": "show cdp neighbors",
+    "mac": "show mac address-table",
+}
+PARSERS = {"poe": parse_poe_ports, "lldp": parse_lldp_neighbors, "cdp": parse_cdp_neighbors, "mac": parse_mac_table}
+
+Key = Tuple[int, str]  # (switch code, normalized interface)
+
+
+class _Table:
+    __slots__ = ("fields", "sw", "cols")
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        self.sw = array("I")
+        self.cols: Dict[str, List[Any]] = {f: [] for f in self.fields}
+
+    def extend(self, code: int, records: Sequence[Dict[str, Any]]) -> None:
+        self.sw.extend(repeat(code, len(records)))
+        for f, col in self.cols.items():
+            col.extend(r.get(f) for r in records)
+
+    def keys(self) -> Iterable[Key]:
+        return zip(self.sw, self.cols["intf"])
+
+    def __len__(self) -> int:
+        return len(self.sw)
+
+
+class FleetTables:
+
+    def __init__(self) -> None:
+        self.switches: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.poe = _Table(("intf", "oper", "watts", "device"))
+        self.lldp = _Table(("intf", "neighbor", "capability"))
+        self.cdp = _Table(("intf", "neighbor", "platform"))
+        self.mac = _Table(("intf", "mac", "vlan"))
+
+    def code(self, switch: str) -> int:
+        code = self._codes.get(switch)
+        if code is None:
+            code = self._codes[switch] = len(self.switches)
+            self.switches.append(switch)
+        return code
+
+    def add(self, switch: str, poe: Sequence[Dict[str, Any]] = (), lldp: Sequence[Dict[str, Any]] = (),
+            cdp: Sequence[Dict[str, Any]] = (), mac: Sequence[Dict[str, Any]] = ()) -> None:
+        # Records as produced by the src/parsers.py parse_* functions.
+        code = self.code(switch)
+        self.poe.extend(code, poe)
+        self.lldp.extend(code, lldp)
+        self.cdp.extend(code, cdp)
+        self.mac.extend(code, mac)
+
+    def add_outputs(self, switch: str, outputs: Dict[str, str]) -> None:
+        # outputs: command -> raw text; commands not collected are simply absent.
+        self.add(switch, **parse_outputs(outputs))
+
+    @property
+    def ports(self) -> int:
+        return len(self.poe)
+
+
+def parse_outputs(outputs: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+    return {name: PARSERS[name](outputs[cmd]) for name, cmd in COMMANDS.items() if outputs.get(cmd)}
+
+
+def find_suspects(tables: FleetTables, min_watts: float = 0.0) -> List[Dict[str, Any]]:
+    # One pass per table: PoE-on keys, minus every key with an LLDP or CDP neighbor, enriched with MACs.
+    poe = tables.poe
+    on = [o == "on" and (w or 0.0) >= min_watts for o, w in zip(poe.cols["oper"], poe.cols["watts"])]
+    powered = dict(zip(compress(poe.keys(), on), compress(zip(poe.cols["watts"], poe.cols["device"]), on)))
+    with_neighbor = set(tables.lldp.keys())
+    with_neighbor.update(tables.cdp.keys())
+    suspects = powered.keys() - with_neighbor
+
+    macs: Dict[Key, List[str]] = {}
+    for key, mac in zip(tables.mac.keys(), tables.mac.cols["mac"]):
+        if key in suspects:
+            macs.setdefault(key, []).append(mac)
+
+    names = tables.switches
+    rows = []
+    for key in sorted(suspects, key=lambda k: (names[k[0]], k[1])):
+        watts, device = powered[key]
+        found = macs.get(key, ())
+        rows.append({"switch": names[key[0]], "interface": key[1], "watts": watts, "device": device,
+                     "mac_count": len(found), "macs": " ".join(sorted(found)[:5])})
+    return rows
+
+
+def suspect_keys(rows: Iterable[Dict[str, Any]]) -> Set[Tuple[str, str]]:
+    return {(r["switch"], r["interface"]) for r in rows}
+
+
+def compare_runs(current: Set[Tuple[str, str]], previous: Set[Tuple[str, str]]) -> Dict[str, Set[Tuple[str, str]]]:
+    return {"new": current - previous, "persisting": current & previous, "cleared": previous - current}
+
+
+def classify(rows: List[Dict[str, Any]], previous: Set[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    # Adds "status" (NEW / PERSISTING) to suspects and appends CLEARED rows for suspects that went away.
+    diff = compare_runs(suspect_keys(rows), previous)
+    out = [dict(r, status="NEW" if (r["switch"], r["interface"]) in diff["new"] else "PERSISTING") for r in rows]
+    out += [{"switch": s, "interface": i, "status": "CLEARED"} for s, i in sorted(diff["cleared"])]
+    return out
+
+
+def load_state(path: str, switches: Optional[Iterable[str]] = None) -> Set[Tuple[str, str]]:
+    # Previous run's suspects; limited to `switches` so a partial sweep doesn't "clear" everything else.
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    keys = {(s, i) for s, i in data.get("suspects", [])}
+    if switches is not None:
+        wanted = set(switches)
+        keys = {k for k in keys if k[0] in wanted}
+    return keys
+
+
+def save_state(path: str, rows: Iterable[Dict[str, Any]], switches: Optional[Iterable[str]] = None) -> None:
+    # Merges into the existing state: suspects for switches swept this run are replaced, others kept.
+    current = suspect_keys(r for r in rows if r.get("status") != "CLEARED")
+    keep = set()
+    if switches is not None:
+        swept = set(switches)
+        keep = {k for k in load_state(path) if k[0] not in swept}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"saved": time.time(), "suspects": sorted(current | keep)}, f)
+    os.replace(tmp, path)
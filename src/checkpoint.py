@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DONE = "DONE"
+FAILED = "FAILED"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job TEXT NOT NULL,
+    item TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    output TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (job, item)
+);
+"""
+
+
+class Checkpoint:
+    # Per-item journal for long fleet sweeps (one row per device, keyed by job name).
+    # Every result is committed as soon as it is recorded, so a crash, token expiry or network blip
+    # loses at most the items in flight. A rerun with resume=True skips DONE items and retries FAILED ones;
+    # resume=False starts the job over.
+    #
+    #   ckpt = Checkpoint("checkpoint.db", "config_drift", resume=args.resume)
+    #   for dev in ckpt.pending(device_ids):
+    #       try:
+    #           ckpt.done(dev, snapshot_device(...))
+    #       except Exception as e:
+    #           ckpt.failed(dev, e)
+
+    def __init__(self, path: str = "checkpoint.db", job: str = "default", resume: bool = False) -> None:
+        self.path = path
+        self.job = job
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        if not resume:
+            self.reset()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.db.execute("DELETE FROM checkpoints WHERE job = ?", (self.job,))
+            self.db.commit()
+
+    def _record(self, item: str, status: str, output: Any, error: Optional[str]) -> None:
+        with self._lock:
+            self.db.execute(
+                "INSERT INTO checkpoints (job, item, status, output, error, updated) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job, item) DO UPDATE SET status = excluded.status, output = excluded.output, "
+                "error = excluded.error, updated = excluded.updated, attempts = attempts + 1",
+                (self.job, item, status, None if output is None else json.dumps(output), error, time.time()),
+            )
+            self.db.commit()
+
+    def done(self, item: str, output: Any = None) -> None:
+        self._record(item, DONE, output, None)
+
+    def failed(self, item: str, error: Any) -> None:
+        self._record(item, FAILED, None, str(error))
+
+    def completed(self) -> set:
+        with self._lock:
+            rows = self.db.execute("SELECT item FROM checkpoints WHERE job = ? AND status = ?", (self.job, DONE))
+            return {r[0] for r in rows}
+
+    def pending(self, items: Iterable[str]) -> List[str]:
+        # Input order is kept; items already DONE in this job are dropped.
+        done = self.completed()
+        return [it for it in items if it not in done]
+
+    def outputs(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT item, output FROM checkpoints WHERE job = ? AND status = ?", (self.job, DONE)
+            ).fetchall()
+        return {item: (json.loads(out) if out is not None else None) for item, out in rows}
+
+    def iter_outputs(self, batch: int = 500) -> Iterator[Tuple[str, Any]]:
+        # Like outputs(), paged by rowid so replaying a large journal into a sink stays flat in memory.
+        last = 0
+        while True:
+            with self._lock:
+                rows = self.db.execute(
+                    "SELECT rowid, item, output FROM checkpoints WHERE job = ? AND status = ? AND rowid > ? "
+                    "ORDER BY rowid LIMIT ?", (self.job, DONE, last, batch)
+                ).fetchall()
+            if not rows:
+                return
+            for last, item, out in rows:
+                yield item, (json.loads(out) if out is not None else None)
+
+    def failures(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT item, error FROM checkpoints WHERE job = ? AND status = ?", (self.job, FAILED)
+            ).fetchall()
+        return dict(rows)
+
+    def counts(self) -> Counter:
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT status, COUNT(*) FROM checkpoints WHERE job = ? GROUP BY status", (self.job,)
+            ).fetchall()
+        return Counter(dict(rows))
@@ -0,0 +1,715 @@
+#!/usr/bin/env python
+# `catalyst` command line: one entry point for the fleet workflows in python_code/, built on the shared
+# DNACClient (pagination, token refresh, 429 handling, caching) and src/concurrency.py.
+#
+#   catalyst inventory --csv out/inventory.csv
+#   catalyst cmd --devices device_uuids.txt --commands "show version" --workers 8 --rate 10
+#   catalyst drift --devices device_ids.txt --resume
+#   catalyst pnp --payload pnp_payload.json --template-id <id> --targets targets.json
+#   catalyst aphunt --switches switches.txt
+#   catalyst ports --out csv/ports_audit.csv
+#   catalyst compliance --details
+#
+#   catalyst diff baselines/<deviceId>                 # offline: last two snapshots, no login
+#   catalyst history <deviceId> --at 20250601_080000   # offline: config in force at a point in time
+#   catalyst search "ip http server"                    # offline: which devices have this line
+#   catalyst rules --rules rules/golden_config.yaml     # offline: golden-config rules over stored snapshots
+#
+# --resume skips devices finished by the previous run of the same subcommand (see src/checkpoint.py).
+# Startup matters (cron calls this thousands of times): workflow modules are imported inside each
+# subcommand and only online subcommands build a client, so `--help` and offline subcommands stay fast.
+# Keep module-level imports to the stdlib basics below; tests/test_cli.py checks requests isn't loaded.
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .checkpoint import Checkpoint
+    from .dnac_client import DNACClient
+
+APHUNT_FIELDS = ["switch", "interface", "status", "watts", "device", "mac_count", "macs"]
+CMD_FIELDS = ["deviceUuid", "command", "output", "error"]
+RULE_FIELDS = ["device", "site", "rule", "severity", "message", "block", "line"]
+
+
+# ---- shared plumbing ----
+
+def build_client(args: argparse.Namespace) -> DNACClient:
+    from .concurrency import RateLimiter
+    from .config import Settings
+    s = Settings(args.settings)
+    hooks = [args.metrics_hook] if args.metrics_hook else None
+    hedger = None
+    if args.hedge:
+        # --hedge: duplicate GETs still running past their endpoint's p95 (src/hedging.py)
+        from .hedging import Hedger, RetryBudget
+        hedger = Hedger(args.metrics_hook, RetryBudget(ratio=args.hedge_budget), max_workers=4 * args.workers)
+    from .dnac_client import DNACClient
+    from .http_cache import ResponseCache
+    # --http-cache: read-mostly GETs (sites, templates, device list) answered from disk while fresh
+    cache = ResponseCache(path=args.http_cache) if args.http_cache else None
+    return DNACClient(s.dnac_url, s.username, s.password, verify=s.verify_ssl, timeout=s.timeout,
+                      proxies=s.proxies(), hooks=hooks, limiter=RateLimiter(args.rate), hedger=hedger,
+                      cache=cache)
+
+
+def start_listener(args: argparse.Namespace):
+    # --webhook PORT: receive task notifications instead of polling (src/webhooks.py).
+    if not getattr(args, "webhook", None):
+        return None
+    from .config import Settings
+    from .webhooks import WebhookListener
+    token = Settings(args.settings).webhook_token
+    # Without DNAC_WEBHOOK_TOKEN anyone who can reach the port can post notifications, so the listener
+    # stays on loopback unless --webhook-host says otherwise.
+    host = args.webhook_host or ("0.0.0.0" if token else "127.0.0.1")
+    if not token:
+        if host in ("127.0.0.1", "localhost", "::1"):
+            print("[!] DNAC_WEBHOOK_TOKEN is not set: webhook listener bound to loopback only")
+        else:
+            print(f"[!] WARNING: DNAC_WEBHOOK_TOKEN is not set: {host}:{args.webhook} accepts unauthenticated "
+                  "notifications from anyone who can reach it")
+    listener = WebhookListener(host=host, port=args.webhook, headers={"Authorization": token} if token else None)
+    print(f"[i] Listening for task notifications on {listener.start()}")
+    return listener
+
+
+def read_lines(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
+
+
+def device_ids(client: DNACClient, path: Optional[str]) -> List[str]:
+    # Explicit list from a file, otherwise every device in inventory.
+    if path:
+        return read_lines(path)
+    from .inventory import Inventory
+    return Inventory.fetch(client, fields=("id",)).column("id")
+
+
+def chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), max(size, 1))]
+
+
+def report(ckpt: Checkpoint, what: str) -> int:
+    counts = ckpt.counts()
+    failed = counts.get("FAILED", 0)
+    print(f"[+] {what}: {counts.get('DONE', 0)} done, {failed} failed"
+          + ("  (rerun with --resume to retry failures)" if failed else ""))
+    return 1 if failed else 0
+
+
+# ---- subcommands ----
+
+def cmd_inventory(args: argparse.Namespace, client: DNACClient) -> int:
+    from itertools import islice
+    from .inventory import SITE_FIELD, Inventory
+    from .site_index import device_sites
+    fields = ["hostname", "managementIpAddress", "platformId", "softwareVersion", "serialNumber", "id", SITE_FIELD]
+    header = ["hostname", "mgmtIp", "platformId", "softwareVersion", "serialNumber", "id", "site"]
+    errors: Dict[str, Exception] = {}
+    if args.clusters:
+        # Every cluster under `clusters:` in settings.yaml at once, tagged with a cluster column.
+        from .cluster_group import ClusterGroup
+        from .config import Settings
+        hooks = [args.metrics_hook] if args.metrics_hook else None
+        group = ClusterGroup.from_settings(Settings(args.settings), hooks=hooks)
+        inv, errors = group.inventory(site=args.site, sites=bool(args.csv), workers=args.workers)
+        fields, header = fields + ["cluster"], header + ["cluster"]
+        for name, e in errors.items():
+            print(f"[x] Cluster {name}: {e}")
+    else:
+        inv = Inventory.fetch(client)
+        if args.site:
+            inv = inv.filter_site(client, args.site, workers=args.workers)   # membership of that subtree only
+        elif args.csv:
+            inv.assign_sites(device_sites(client, workers=args.workers))
+    print(f"Devices: {len(inv)}")
+    for row in islice(inv.rows(["hostname", "managementIpAddress", "platformId"]), args.limit):
+        print(*row)
+    if args.csv:
+        inv.to_csv(args.csv, fields, header=header)
+        print(f"[+] Wrote CSV: {args.csv}")
+    return 1 if errors else 0
+
+
+def reachable_targets(client: DNACClient, uuids: List[str], args: argparse.Namespace,
+                      inv: Any = None) -> Tuple[List[str], Dict[str, str]]:
+    # Dispatch pre-filter (src/reachability.py): drop devices the inventory marks unreachable and, with
+    # --probe, those not answering on 22/443; skipped devices are listed in --skipped, not journaled.
+    if args.include_unreachable or not uuids:
+        return uuids, {}
+    from .reachability import FIELDS, PROBE_PORTS, prefilter, write_skipped
+    if inv is None or not set(FIELDS) <= set(inv.fields):
+        from .inventory import Inventory
+        inv = Inventory.fetch(client, fields=FIELDS)
+    targets, skipped = prefilter(inv, uuids, PROBE_PORTS if args.probe else None, args.probe_timeout)
+    if skipped:
+        write_skipped(args.skipped, skipped, inv)
+        print(f"[i] Skipping {len(skipped)} unreachable device(s), listed in {args.skipped}")
+    return targets, skipped
+
+
+def run_command_chunks(client: DNACClient, ckpt: Checkpoint, uuids: List[str], commands: List[str],
+                       args: argparse.Namespace, on_device, inv: Any = None) -> Dict[str, str]:
+    # One Command Runner job per chunk, `--workers` jobs in flight; on_device(uuid, rows) -> journal output.
+    # Unreachable devices are filtered out first; returns them as {uuid: reason}.
+    from .cmdrunner import collect_read_results, command_rows
+    from .concurrency import WorkerPool
+
+    targets, skipped = reachable_targets(client, ckpt.pending(uuids), args, inv)
+
+    cache = None
+    if args.cmd_cache:
+        from .cmd_cache import CommandCache
+        cache = CommandCache(args.cmd_cache)
+    batcher = None
+    if args.batch_window:
+        from .cmd_batcher import CommandBatcher
+        batcher = CommandBatcher(client, window_s=args.batch_window / 1000, workers=args.workers,
+                                 listener=args.listener)
+
+    def run(chunk: List[str]) -> List[Dict[str, Any]]:
+        return command_rows(collect_read_results(client, chunk, commands, listener=args.listener,
+                                                 cache=cache, max_age=args.max_age, batcher=batcher))
+
+    for out in WorkerPool(args.workers, deadline_s=args.deadline).map(run, chunks(targets, args.chunk)):
+        if not out.ok:
+            for dev in out.item:
+                ckpt.failed(dev, out.error)
+            print(f"[x] Job for {len(out.item)} devices failed: {out.error}")
+            continue
+        by_dev: Dict[str, List[Dict[str, Any]]] = {dev: [] for dev in out.item}
+        for row in out.result:
+            by_dev.setdefault(row["deviceUuid"], []).append(row)
+        for dev, rows in by_dev.items():
+            errors = [r["error"] for r in rows if r["error"]]
+            if not rows:
+                ckpt.failed(dev, "no result returned")
+            elif errors:
+                ckpt.failed(dev, "; ".join(errors))
+            else:
+                ckpt.done(dev, on_device(dev, rows))
+    if batcher is not None:
+        batcher.close()
+        print(f"[i] Batcher: {batcher.requests} submission(s) merged into {batcher.jobs} job(s)")
+    if cache is not None:
+        st = cache.stats()
+        print(f"[i] Command cache: {st['hits']} output(s) reused, {st['misses']} fetched")
+        cache.close()
+    return skipped
+
+
+def cmd_cmd(args: argparse.Namespace, client: DNACClient) -> int:
+    from .checkpoint import Checkpoint
+    from .sinks import BufferedSink, open_sink
+    uuids = device_ids(client, args.devices)
+    wanted = set(uuids)
+    ckpt = Checkpoint(args.journal, "cmd", resume=args.resume)
+
+    # Rows stream to --out (.csv/.jsonl/.parquet) as each device completes: devices finished by an
+    # earlier run first, then this run's, then one error row per device that still failed.
+    with BufferedSink(open_sink(args.out, CMD_FIELDS)) as sink:
+        for dev, rows in ckpt.iter_outputs():
+            if dev in wanted:
+                sink.write_many(rows)
+
+        def emit(dev: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            sink.write_many(rows)
+            return rows
+
+        run_command_chunks(client, ckpt, uuids, args.commands, args, emit)
+        for dev, err in ckpt.failures().items():
+            if dev in wanted:
+                sink.write({"deviceUuid": dev, "error": err})
+    print(f"[+] Wrote {args.out}")
+    return report(ckpt, "Devices")
+
+
+def cmd_drift(args: argparse.Namespace, client: DNACClient) -> int:
+    import time
+    from .checkpoint import Checkpoint
+    from .concurrency import WorkerPool
+    from .drift import DiffCache, cluster_drift, snapshot_device, write_drift_report
+    ids = device_ids(client, args.devices)
+    ckpt = Checkpoint(args.journal, "drift", resume=args.resume)
+    history = index = None
+    if args.history:
+        from .config_history import ConfigHistory
+        history = ConfigHistory(args.history)
+    if args.index:
+        from .config_search import ConfigIndex
+        index = ConfigIndex(args.index)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    diffs = DiffCache()
+    # Devices finished by an earlier run (--resume) are skipped below but still belong in the report.
+    wanted = set(ids)
+    results = [out for dev, out in ckpt.iter_outputs() if dev in wanted and out]
+    pool = WorkerPool(args.workers, checkpoint=ckpt, deadline_s=args.deadline)
+    for out in pool.map(lambda dev: snapshot_device(client, dev, args.outdir, stamp, history, index, diffs), ids):
+        if not out.ok:
+            print(f"[x] {out.item}: {out.error}")
+        else:
+            results.append(out.result)
+    clusters = cluster_drift(results)
+    for c in clusters:
+        print(f"[!] DRIFT {c['change']}: {len(c['devices'])} device(s), e.g. {c['devices'][0]}")
+    if clusters:
+        write_drift_report(args.report, clusters)
+        print(f"[+] {len(clusters)} distinct change(s) ({diffs.misses} diffed, {diffs.hits} reused) -> {args.report}")
+    return report(ckpt, "Devices")
+
+
+def cmd_pnp(args: argparse.Namespace, client: DNACClient) -> int:
+    # Same flow as python_code/PNP_PROVISION_API/mass_pnp_and_dayn.py: import, claim, then DayN deploy.
+    import json
+    from .checkpoint import Checkpoint
+    from .concurrency import WorkerPool
+    from .jobs import wait_for_task
+    from .pnp_api import SITE_CLAIM_PATH, site_claim_by_hierarchy
+    from .templates_api import deploy_template_to_devices
+
+    try:
+        with open(args.payload, "r", encoding="utf-8") as f:
+            pnp = json.load(f)
+    except FileNotFoundError:
+        pnp = {"devices": [], "claims": []}
+
+    if pnp.get("devices"):
+        job = client.post("/dna/intent/api/v1/onboarding/pnp-device/import", {"deviceInfoList": pnp["devices"]})
+        task_id = job.get("response", {}).get("taskId") or job.get("taskId")
+        if task_id:
+            task = wait_for_task(client, task_id, listener=args.listener)
+            print("[x] PnP import error:" if task.get("isError") else "[✓] PnP import done.", task.get("failureReason", ""))
+
+    ckpt = Checkpoint(args.journal, "pnp", resume=args.resume)
+
+    def claim(c: Dict[str, Any]) -> Dict[str, Any]:
+        body = dict(c)
+        site = body.pop("siteNameHierarchy", None) or body.pop("siteName", None)
+        if site and not body.get("siteId"):
+            # siteId from the shared site index, not a sites download per claim
+            job = site_claim_by_hierarchy(client, body.pop("deviceId", ""), site,
+                                          claim_type=body.pop("type", "Default"), **body)
+        else:
+            job = client.post(SITE_CLAIM_PATH, body)
+        task_id = job.get("response", {}).get("taskId") or job.get("taskId")
+        if task_id:
+            task = wait_for_task(client, task_id, listener=args.listener)
+            if task.get("isError"):
+                raise RuntimeError(task.get("failureReason") or "claim failed")
+        return {"taskId": task_id}
+
+    claims = pnp.get("claims") or []
+    pool = WorkerPool(args.workers, checkpoint=ckpt, deadline_s=args.deadline)
+    for out in pool.map(claim, claims, key=lambda c: c.get("deviceId", "")):
+        print(f"[{'✓' if out.ok else 'x'}] Claim {out.item.get('deviceId')}" + ("" if out.ok else f": {out.error}"))
+
+    if args.template_id and args.targets:
+        with open(args.targets, "r", encoding="utf-8") as f:
+            targets = json.load(f)
+        target_info = [{"id": t.get("id"), "type": t.get("type", "MANAGED_DEVICE_IP"), "params": t.get("params", {})}
+                       for t in targets]
+        job = deploy_template_to_devices(client, args.template_id, target_info, force_push=True)
+        task_id = job.get("response", {}).get("taskId") or job.get("taskId")
+        if task_id:
+            task = wait_for_task(client, task_id, listener=args.listener)
+            print("[x] DayN deploy error:" if task.get("isError") else "[✓] DayN deploy done.", task.get("failureReason", ""))
+        else:
+            print("[i] DayN deploy response:", job)
+    return report(ckpt, "Claims") if claims else 0
+
+
+def cmd_aphunt(args: argparse.Namespace, client: DNACClient) -> int:
+    # PoE ports that are on with no LLDP/CDP neighbor, joined fleet-wide (src/aphunt.py). Parsed records are
+    # journaled per switch; suspects are computed once every switch is in, then compared with --state.
+    from .aphunt import COMMANDS, FleetTables, classify, find_suspects, load_state, parse_outputs, save_state
+    from .checkpoint import Checkpoint
+    from .inventory import Inventory
+    from .sinks import BufferedSink, open_sink
+
+    hostnames = read_lines(args.switches)
+    inv = Inventory.fetch(client, fields=("id", "hostname", "managementIpAddress", "reachabilityStatus"))
+    uuid_by_host = dict(zip(inv.column("hostname"), inv.column("id")))
+    host_by_uuid = {u: h for h, u in uuid_by_host.items()}
+
+    ckpt = Checkpoint(args.journal, "aphunt", resume=args.resume)
+    missing = [h for h in ckpt.pending(hostnames) if h not in uuid_by_host]
+    for h in missing:
+        print(f"[!] Switch {h} not found in Catalyst Center.")
+        ckpt.done(h, None)
+
+    commands = [COMMANDS["poe"], COMMANDS["lldp"], COMMANDS["cdp"]] + ([COMMANDS["mac"]] if args.mac else [])
+
+    def parse(dev: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return parse_outputs({r["command"]: r["output"] for r in rows})
+
+    # Journal by hostname: translate uuids on the way in and out.
+    uuids = [uuid_by_host[h] for h in hostnames if h in uuid_by_host]
+    run_command_chunks(client, _HostJournal(ckpt, host_by_uuid), uuids, commands, args, parse, inv)
+
+    wanted = set(hostnames)
+    tables = FleetTables()
+    for host, parsed in ckpt.iter_outputs():
+        if host in wanted and parsed:
+            tables.add(host, **parsed)
+    swept = tables.switches
+    suspects = find_suspects(tables)
+    rows = classify(suspects, load_state(args.state, swept))
+    save_state(args.state, suspects, swept)
+
+    counts = {st: sum(1 for r in rows if r["status"] == st) for st in ("NEW", "PERSISTING", "CLEARED")}
+    with BufferedSink(open_sink(args.out, APHUNT_FIELDS)) as sink:
+        sink.write_many(r for r in rows if args.all or r["status"] != "PERSISTING")
+    print(f"[+] {tables.ports} PoE ports on {len(swept)} switches: {counts['NEW']} new, "
+          f"{counts['PERSISTING']} persisting, {counts['CLEARED']} cleared suspects -> {args.out}")
+    return report(ckpt, "Switches")
+
+
+def cmd_ports(args: argparse.Namespace, client: DNACClient) -> int:
+    # Port audit (src/ports_audit.py): interface state for every switch from one paginated API pull, PoE and
+    # neighbors from chunked Command Runner jobs; each switch's rows stream to --out as its chunk lands.
+    from .aphunt import parse_outputs
+    from .checkpoint import Checkpoint
+    from .inventory import Inventory
+    from .ports_audit import AUDIT_FIELDS, COMMANDS, audit_rows, fetch_interfaces
+    from .sinks import BufferedSink, open_sink
+
+    inv = Inventory.fetch(client, fields=("id", "hostname", "family", "managementIpAddress", "reachabilityStatus"))
+    if args.switches:
+        wanted = set(read_lines(args.switches))
+        uuid_by_host = {h: u for u, h in zip(inv.column("id"), inv.column("hostname")) if h in wanted}
+        for h in sorted(wanted - uuid_by_host.keys()):
+            print(f"[!] Switch {h} not found in Catalyst Center.")
+    else:
+        uuid_by_host = {h: u for u, h, fam in zip(inv.column("id"), inv.column("hostname"), inv.column("family"))
+                        if "switch" in (fam or "").lower()}
+    host_by_uuid = {u: h for h, u in uuid_by_host.items()}
+    interfaces = fetch_interfaces(client, host_by_uuid)
+    print(f"[i] {sum(map(len, interfaces.values()))} interfaces on {len(uuid_by_host)} switches")
+
+    ckpt = Checkpoint(args.journal, "ports", resume=args.resume)
+    with BufferedSink(open_sink(args.out, AUDIT_FIELDS)) as sink:
+        def emit(host: str, parsed: Dict[str, Any]) -> None:
+            sink.write_many(audit_rows(host, interfaces.get(uuid_by_host[host], ()), parsed or {}))
+
+        for host, parsed in ckpt.iter_outputs():
+            if host in uuid_by_host:
+                emit(host, parsed)
+
+        def on_device(dev: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+            parsed = parse_outputs({r["command"]: r["output"] for r in rows})
+            emit(host_by_uuid[dev], parsed)
+            return parsed
+
+        skipped = run_command_chunks(client, _HostJournal(ckpt, host_by_uuid), list(host_by_uuid), COMMANDS, args,
+                                     on_device, inv)
+        # Switches whose commands failed or that were skipped as unreachable still get their API interface state.
+        for host in list(ckpt.failures()) + [host_by_uuid[u] for u in skipped]:
+            if host in uuid_by_host:
+                emit(host, {})
+    print(f"[+] Wrote {args.out}")
+    return report(ckpt, "Switches")
+
+
+class _HostJournal:
+    # Checkpoint view keyed by device UUID over a journal keyed by hostname.
+
+    def __init__(self, ckpt: Checkpoint, host_by_uuid: Dict[str, str]) -> None:
+        self.ckpt = ckpt
+        self.host_by_uuid = host_by_uuid
+
+    def pending(self, uuids: List[str]) -> List[str]:
+        done = self.ckpt.completed()
+        return [u for u in uuids if self.host_by_uuid[u] not in done]
+
+    def done(self, uuid: str, output: Any = None) -> None:
+        self.ckpt.done(self.host_by_uuid.get(uuid, uuid), output)
+
+    def failed(self, uuid: str, error: Any) -> None:
+        self.ckpt.failed(self.host_by_uuid.get(uuid, uuid), error)
+
+
+def cmd_compliance(args: argparse.Namespace, client: DNACClient) -> int:
+    import json
+    from .compliance_api import collect_device_compliance, get_compliance_status
+    from .compliance_store import ComplianceStore
+    if not args.details:
+        print(json.dumps(get_compliance_status(client), indent=2))
+        return 0
+    uuids = device_ids(client, args.devices)
+    store = ComplianceStore(args.db)
+    run_id = collect_device_compliance(client, uuids, store, trigger=not args.no_trigger, workers=args.workers,
+                                       listener=args.listener)
+    bad = store.non_compliant(run_id)
+    print(f"Run {run_id}: {len(uuids)} devices, {len(bad)} non-compliant item(s)")
+    for row in bad:
+        print(row["deviceUuid"], row["category"], row["status"])
+    store.close()
+    return 0
+
+
+def cmd_history(args: argparse.Namespace, client: None) -> int:
+    # Offline: point-in-time configs and diffs from the reverse-delta history (src/config_history.py).
+    from .config_history import ConfigHistory
+    hist = ConfigHistory(args.db)
+    try:
+        if args.import_dir:
+            print(f"[+] Imported {hist.import_baselines(args.import_dir)} new version(s) from {args.import_dir}")
+        if not args.device:
+            st = hist.stats()
+            print(f"[i] {st['devices']} devices, {st['versions']} versions, "
+                  f"{st['stored_bytes']} bytes stored for {st['raw_bytes']} bytes of config")
+            return 0
+        if args.diff:
+            diff = hist.diff(args.device, *args.diff)
+            sys.stdout.write(diff)
+            return 1 if diff else 0
+        if args.at:
+            cfg = hist.get_config(args.device, args.at)
+            if cfg is None:
+                print(f"[x] No snapshot of {args.device} at or before {args.at}", file=sys.stderr)
+                return 1
+            sys.stdout.write(cfg)
+            return 0
+        import time
+        for ts, sha in hist.versions(args.device):
+            print(time.strftime("%Y%m%d_%H%M%S", time.localtime(ts)), sha[:12])
+        return 0
+    finally:
+        hist.close()
+
+
+def cmd_search(args: argparse.Namespace, client: None) -> int:
+    # Offline: fleet-wide config search over the inverted index (src/config_search.py).
+    import re
+    from .config_search import ConfigIndex
+    idx = ConfigIndex(args.db)
+    try:
+        if args.refresh:
+            print(f"[i] Re-indexed {idx.index_baselines(args.refresh)} changed snapshot(s) from {args.refresh}",
+                  file=sys.stderr)
+        if args.regex:
+            hits = idx.search(args.query, block=args.block, flags=re.IGNORECASE if args.ignore_case else 0)
+        else:
+            hits = idx.search_line(args.query, block=args.block)
+    finally:
+        idx.close()
+    if args.devices_only:
+        for dev in sorted({h["device"] for h in hits}):
+            print(dev)
+    else:
+        for h in hits:
+            where = f"  [{h['block']}]" if h["block"] else ""
+            print(f"{h['device']}\t{h['snapshot']}:{h['lineno']}\t{h['line']}{where}")
+    print(f"[+] {len(hits)} line(s) on {len({h['device'] for h in hits})} device(s)", file=sys.stderr)
+    return 0 if hits else 1
+
+
+def cmd_rules(args: argparse.Namespace, client: None) -> int:
+    # Offline: golden-config rules (src/compliance_rules.py) over the newest stored snapshot of every device.
+    from .compliance_rules import RuleSet, evaluate_fleet, latest_snapshots, load_sites
+    from .sinks import BufferedSink, open_sink
+    ruleset = RuleSet.from_yaml(args.rules, vars_dir=args.vars)
+    sites = load_sites(args.sites) if args.sites else {}
+    if args.history:
+        from .config_history import ConfigHistory
+        hist = ConfigHistory(args.history)
+        snapshots = [(dev, None) for dev in hist.devices()]
+        hist.close()
+    else:
+        snapshots = latest_snapshots(args.baselines)
+    devices = bad = 0
+    by_rule: Dict[str, int] = {}
+    with BufferedSink(open_sink(args.out, RULE_FIELDS)) as sink:
+        for device, found in evaluate_fleet(ruleset, snapshots, sites, workers=args.workers, history=args.history):
+            devices += 1
+            bad += bool(found)
+            for v in found:
+                by_rule[v.rule] = by_rule.get(v.rule, 0) + 1
+                sink.write({"site": sites.get(device, ""), **vars(v)})
+    for rule, n in sorted(by_rule.items(), key=lambda kv: -kv[1]):
+        print(f"  {rule}: {n}")
+    print(f"[+] {len(ruleset.rules)} rules on {devices} devices: {bad} non-compliant, "
+          f"{sum(by_rule.values())} violation(s) -> {args.out}")
+    return 1 if bad else 0
+
+
+def cmd_diff(args: argparse.Namespace, client: None) -> int:
+    # Offline: unified diff of two config files, or of the last two snapshots in a device directory.
+    from .drift import diff_configs
+    paths = list(args.paths)
+    if len(paths) == 1 and os.path.isdir(paths[0]):
+        snaps = sorted(p for p in os.listdir(paths[0]) if p.endswith(".cfg"))
+        if len(snaps) < 2:
+            print(f"[i] Fewer than two snapshots in {paths[0]}")
+            return 0
+        paths = [os.path.join(paths[0], p) for p in snaps[-2:]]
+    if len(paths) != 2:
+        print("[x] diff needs two config files or one snapshot directory", file=sys.stderr)
+        return 2
+    texts = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    diff = diff_configs(*texts)
+    sys.stdout.write(diff)
+    return 1 if diff else 0
+
+
+# ---- argument parsing ----
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--settings", default="settings.yaml", help="Settings file (default: settings.yaml)")
+    common.add_argument("--workers", type=int, default=8, help="Concurrent jobs/requests (default: 8)")
+    common.add_argument("--rate", type=float, default=0.0, help="Max API requests per second, 0 = unlimited")
+    common.add_argument("--resume", action="store_true", help="Skip items finished by the previous run; retry failures")
+    common.add_argument("--journal", default="checkpoint.db", help="Checkpoint journal (default: checkpoint.db)")
+    common.add_argument("--metrics", default=None, help="Write Prometheus text metrics to this path")
+    common.add_argument("--cmd-cache", default=None, metavar="DB",
+                        help="Reuse recent Command Runner outputs from this cache (e.g. cmd_cache.db)")
+    common.add_argument("--max-age", type=float, default=None, metavar="SECONDS",
+                        help="Oldest cached output to accept (default: per-command TTL; 0 = refresh)")
+    common.add_argument("--batch-window", type=float, default=0, metavar="MS",
+                        help="Merge Command Runner submissions arriving within this window (e.g. 250)")
+    common.add_argument("--probe", action="store_true",
+                        help="TCP-probe targets on 22/443 before Command Runner jobs; skip silent ones")
+    common.add_argument("--probe-timeout", type=float, default=2.0, metavar="SECONDS",
+                        help="Deadline for the whole probe sweep (default: 2)")
+    common.add_argument("--include-unreachable", action="store_true",
+                        help="Dispatch devices the inventory marks unreachable too")
+    common.add_argument("--skipped", default="skipped_devices.csv", help="Where skipped devices are listed")
+    common.add_argument("--http-cache", default=None, metavar="PATH",
+                        help="Keep read-mostly API responses in this file between runs (e.g. .cache/http.json)")
+    common.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                        help="Time budget per device/claim/job, shared by every request it makes")
+    common.add_argument("--hedge", action="store_true",
+                        help="Re-send GETs still running past their endpoint's p95; first answer wins")
+    common.add_argument("--hedge-budget", type=float, default=0.05, metavar="RATIO",
+                        help="Hedges allowed per request sent (default: 0.05)")
+    common.add_argument("--webhook", type=int, default=None, metavar="PORT",
+                        help="Receive task notifications on this port; polling drops to a slow fallback")
+    common.add_argument("--webhook-host", default=None, metavar="ADDR",
+                        help="Listener address (default: 0.0.0.0 with DNAC_WEBHOOK_TOKEN, else 127.0.0.1)")
+
+    parser = argparse.ArgumentParser(prog="catalyst", description="Catalyst Center fleet operations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("inventory", parents=[common], help="List network devices")
+    p.add_argument("--csv", default=None, help="Write inventory CSV")
+    p.add_argument("--limit", type=int, default=10, help="Preview rows to print (default: 10)")
+    p.add_argument("--site", default=None, help="Only devices at or under this site (nameHierarchy or siteId)")
+    p.add_argument("--clusters", action="store_true",
+                   help="Query every cluster in settings.yaml `clusters:` concurrently; adds a cluster column")
+    p.set_defaults(func=cmd_inventory)
+
+    p = sub.add_parser("cmd", parents=[common], help="Run read-only CLI commands via Command Runner")
+    p.add_argument("--devices", default=None, help="File of device UUIDs (default: whole inventory)")
+    p.add_argument("--commands", nargs="+", default=["show version"], help="Commands to run")
+    p.add_argument("--chunk", type=int, default=50, help="Devices per Command Runner job (default: 50)")
+    p.add_argument("--out", default="command_runner_results.csv", help="Output CSV")
+    p.set_defaults(func=cmd_cmd)
+
+    p = sub.add_parser("drift", parents=[common], help="Snapshot running configs and diff against baselines")
+    p.add_argument("--devices", default=None, help="File of device ids (default: whole inventory)")
+    p.add_argument("--outdir", default="baselines", help="Snapshot directory (default: baselines)")
+    p.add_argument("--history", default=None, help="Also record snapshots in this config history DB")
+    p.add_argument("--index", default=None, help="Also keep this config search index current")
+    p.add_argument("--report", default="drift_report.txt", help="Drift grouped by distinct change (default: drift_report.txt)")
+    p.set_defaults(func=cmd_drift)
+
+    p = sub.add_parser("pnp", parents=[common], help="PnP import/claim and DayN template deploy")
+    p.add_argument("--payload", default="pnp_payload.json", help='{"devices": [...], "claims": [...]}')
+    p.add_argument("--template-id", default=None, help="DayN templateId to deploy")
+    p.add_argument("--targets", default=None, help='[{"id": ..., "type": ..., "params": {...}}]')
+    p.set_defaults(func=cmd_pnp)
+
+    p = sub.add_parser("aphunt", parents=[common], help="Find PoE ports without an LLDP/CDP neighbor")
+    p.add_argument("--switches", default="switches.txt", help="File of switch hostnames")
+    p.add_argument("--chunk", type=int, default=20, help="Switches per Command Runner job (default: 20)")
+    p.add_argument("--out", default="ap_hunt_results.csv", help="Output CSV")
+    p.add_argument("--state", default="aphunt_state.json", help="Previous suspects, for new/cleared reporting")
+    p.add_argument("--all", action="store_true", help="Also list suspects already reported by earlier runs")
+    p.add_argument("--mac", action="store_true", help="Also collect MAC tables to show what is on each port")
+    p.set_defaults(func=cmd_aphunt)
+
+    p = sub.add_parser("ports", parents=[common], help="Audit every switch port: state, PoE, neighbor")
+    p.add_argument("--switches", default=None, help="File of switch hostnames (default: every switch)")
+    p.add_argument("--chunk", type=int, default=20, help="Switches per Command Runner job (default: 20)")
+    p.add_argument("--out", default="csv/ports_audit.csv", help="Output file (.csv/.jsonl/.parquet)")
+    p.set_defaults(func=cmd_ports)
+
+    p = sub.add_parser("compliance", parents=[common], help="Compliance summary or per-device detail")
+    p.add_argument("--details", action="store_true", help="Collect per-device compliance detail")
+    p.add_argument("--devices", default=None, help="File of device UUIDs (default: whole inventory)")
+    p.add_argument("--db", default="compliance.db", help="Local compliance store (default: compliance.db)")
+    p.add_argument("--no-trigger", action="store_true", help="Only pull detail; do not trigger a new run")
+    p.set_defaults(func=cmd_compliance)
+
+    p = sub.add_parser("history", help="Offline: configs at a point in time and diffs between dates")
+    p.add_argument("device", nargs="?", help="Device id (omit for store stats)")
+    p.add_argument("--db", default="config_history.db", help="History DB (default: config_history.db)")
+    p.add_argument("--at", default=None, help="Print the config in force at this time (20250601_080000, ISO, epoch)")
+    p.add_argument("--diff", nargs=2, metavar=("T1", "T2"), default=None, help="Diff the configs in force at T1 and T2")
+    p.add_argument("--import", dest="import_dir", default=None, help="Import a baselines/ snapshot tree first")
+    p.set_defaults(func=cmd_history, offline=True)
+
+    p = sub.add_parser("search", help="Offline: search every indexed device config")
+    p.add_argument("query", help="Exact config line, or a regex with --regex")
+    p.add_argument("--regex", "-e", action="store_true", help="Treat the query as a regular expression")
+    p.add_argument("--ignore-case", "-i", action="store_true", help="Case-insensitive regex")
+    p.add_argument("--block", default=None, help="Only lines inside blocks whose header matches this regex")
+    p.add_argument("--devices-only", "-l", action="store_true", help="Print matching device ids only")
+    p.add_argument("--db", default="config_index.db", help="Index DB (default: config_index.db)")
+    p.add_argument("--refresh", default=None, metavar="DIR", help="Re-index changed snapshots from DIR first")
+    p.set_defaults(func=cmd_search, offline=True)
+
+    p = sub.add_parser("rules", help="Offline: evaluate golden-config rules against stored snapshots")
+    p.add_argument("--rules", default="rules/golden_config.yaml", help="Rules file (default: rules/golden_config.yaml)")
+    p.add_argument("--baselines", default="baselines", help="Snapshot directory (default: baselines)")
+    p.add_argument("--history", default=None, help="Read the newest configs from this history DB instead")
+    p.add_argument("--sites", default=None, help="device -> site map (.yaml or .csv) for per-site variables")
+    p.add_argument("--vars", default="vars", help="Variables directory: global.yaml, site/<site>.yaml (default: vars)")
+    p.add_argument("--out", default="rule_violations.csv", help="Violations output (.csv/.jsonl/.parquet)")
+    p.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    p.set_defaults(func=cmd_rules, offline=True)
+
+    p = sub.add_parser("diff", help="Offline: diff two configs or a device's last two snapshots")
+    p.add_argument("paths", nargs="+", help="<old.cfg> <new.cfg> | <baselines/deviceId>")
+    p.set_defaults(func=cmd_diff, offline=True)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "offline", False):
+        return args.func(args, None)
+    from .instrumentation import RequestMetrics
+    metrics = RequestMetrics() if args.metrics or args.hedge else None  # hedging needs the latencies
+    args.metrics_hook = metrics
+    client = build_client(args)
+    args.listener = start_listener(args)
+    try:
+        return args.func(args, client)
+    finally:
+        if args.listener:
+            args.listener.stop()
+        if client.hedger is not None:
+            h = client.hedger
+            print(f"[i] Hedging: {h.hedged} duplicate GET(s) sent, {h.won} answered first, {h.denied} over budget, "
+                  f"{h.inline} unhedged (pool busy)")
+            h.close()
+        if client.cache is not None:
+            c = client.cache
+            print(f"[i] HTTP cache: {c.hits} hit(s), {c.misses} miss(es), {c.revalidated} revalidated")
+            c.save()
+        if args.metrics:
+            metrics.write_prometheus(args.metrics)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
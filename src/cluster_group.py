@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from .cmdrunner import collect_read_results, command_rows
+from .compliance_api import get_compliance_status
+from .config import Settings
+from .dnac_client import DNACClient
+from .inventory import CATEGORICAL, DEFAULT_FIELDS, Inventory
+from .site_index import device_sites
+
+# Fan the same query out to several Catalyst Center clusters at once and merge the results,
+# tagging every item with its cluster name. A run takes as long as the slowest cluster.
+#
+#   group = ClusterGroup.from_settings(Settings())
+#   inv, errors = group.inventory()             # Inventory with a "cluster" column
+#   inv.counts("cluster"); errors               # {name: exception}: one failed cluster doesn't abort the others
+#
+# Every call returns its own errors next to its result, so one group can serve concurrent callers.
+# From the CLI: catalyst inventory --clusters (clusters: in settings.yaml).
+
+Errors = Dict[str, Exception]
+
+
+class ClusterGroup:
+
+    def __init__(self, clients: Dict[str, DNACClient], max_workers: Optional[int] = None) -> None:
+        self.clients = clients
+        self.max_workers = max_workers or max(len(clients), 1)
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **client_kwargs: Any) -> "ClusterGroup":
+        clients = {
+            c.name: DNACClient(c.url, c.username, c.password, verify=c.verify_ssl, timeout=c.timeout,
+                               proxies=settings.proxies(), **client_kwargs)
+            for c in settings.clusters()
+        }
+        return cls(clients)
+
+    def map(self, fn: Callable[[str, DNACClient], Any]) -> Tuple[Dict[str, Any], Errors]:
+        # Run fn(name, client) for every cluster concurrently. Returns (results, errors): a cluster that
+        # raised is in errors and left out of results, so one unreachable cluster doesn't sink a global report.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            futs = {name: ex.submit(fn, name, client) for name, client in self.clients.items()}
+        results: Dict[str, Any] = {}
+        errors: Errors = {}
+        for name, fut in futs.items():
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                errors[name] = e
+        return results, errors
+
+    def gather(self, fn: Callable[[str, DNACClient], List[Any]]) -> Tuple[List[Dict[str, Any]], Errors]:
+        # Concatenate list results, adding "cluster" to each item.
+        results, errors = self.map(fn)
+        merged: List[Dict[str, Any]] = []
+        for name, items in results.items():
+            merged.extend({"cluster": name, **dict(item.items())} for item in items)
+        return merged, errors
+
+    def paginate(self, path: str, params: Optional[Dict[str, Any]] = None,
+                 fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Errors]:
+        return self.gather(lambda name, c: c.paginate(path, params, fields=fields))
+
+    def inventory(self, fields: Sequence[str] = DEFAULT_FIELDS, site: Optional[str] = None,
+                  sites: bool = False, workers: int = 8) -> Tuple[Inventory, Errors]:
+        # site: only devices at or under it (resolved per cluster; a cluster without it is an error).
+        # sites=True fills the site column from every cluster's membership API (one call per site).
+        fields = tuple(fields)
+
+        def fetch(name: str, c: DNACClient) -> Inventory:
+            inv = Inventory.fetch(c, fields=fields)
+            if site:
+                return inv.filter_site(c, site, workers=workers)
+            if sites:
+                inv.assign_sites(device_sites(c, workers=workers))
+            return inv
+
+        parts, errors = self.map(fetch)
+        merged = Inventory(fields + ("cluster",), categorical=CATEGORICAL + ("cluster",))
+        for name, inv in parts.items():
+            merged.extend(dict(zip(fields, row), cluster=name) for row in inv.rows(fields))
+        return merged, errors
+
+    def compliance(self, category: str = "RUNNING_CONFIG") -> Tuple[Dict[str, Any], Errors]:
+        return self.map(lambda name, c: get_compliance_status(c, category))
+
+    def run_commands(self, commands: List[str], targets: Dict[str, List[str]], cache: Any = None,
+                     max_age: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Errors]:
+        # targets: cluster name -> device UUIDs on that cluster. One Command Runner job per cluster;
+        # cache: optional src/cmd_cache.py CommandCache shared by all clusters (device UUIDs are unique).
+        def run(name: str, client: DNACClient) -> List[Dict[str, Any]]:
+            uuids = targets.get(name) or []
+            if not uuids:
+                return []
+            return command_rows(collect_read_results(client, uuids, commands, cache=cache, max_age=max_age))
+        return self.gather(run)
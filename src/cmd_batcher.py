@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Set, Tuple
+
+from .cmdrunner import collect_read_results
+from .deadline import DeadlineExceeded, remaining
+
+# Micro-batcher for Command Runner: read requests from many threads/workflows are collected for a short
+# window and merged into combined read-request jobs (within the per-job device and command limits), so
+# the cluster sees a few large jobs instead of many tiny ones, each with its own task and result file.
+# Each caller gets a Future for its own slice: entries for its devices with only its commands.
+#
+#   with CommandBatcher(client, window_s=0.25) as batcher:
+#       fut = batcher.submit(uuids, ["show version"])          # from any thread
+#       entries = fut.result()                                 # same shape as collect_read_results()
+#       entries = collect_read_results(client, uuids, cmds, batcher=batcher)   # or via the batch API
+#
+# A request joins the first job of the window whose merged device and command sets stay within the
+# limits; requests larger than max_devices are split over several jobs and resolve when all have landed.
+
+
+class _Request:
+    __slots__ = ("devices", "commands", "future", "parts", "entries", "lock")
+
+    def __init__(self, devices: List[str], commands: List[str]) -> None:
+        self.devices = devices
+        self.commands = commands
+        self.future: Future = Future()
+        self.parts = 0
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+
+class _Job:
+    __slots__ = ("devices", "commands", "parts")
+
+    def __init__(self) -> None:
+        self.devices: Dict[str, None] = {}  # insertion-ordered set
+        self.commands: Dict[str, None] = {}
+        self.parts: List[Tuple[_Request, List[str]]] = []  # (request, its devices in this job)
+
+
+class CommandBatcher:
+
+    def __init__(self, client: Any, window_s: float = 0.25, max_devices: int = 100, max_commands: int = 5,
+                 workers: int = 4, timeout_s: int = 300, poll_s: float = 2, listener: Any = None) -> None:
+        self.client = client
+        self.window_s = window_s
+        self.max_devices = max_devices
+        self.max_commands = max_commands
+        self.collect_kwargs = {"timeout_s": timeout_s, "poll_s": poll_s, "listener": listener}
+        self.requests = 0
+        self.jobs = 0
+        self._pending: List[_Request] = []
+        self._pending_devices = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cmd-batch")
+        self._thread = threading.Thread(target=self._run, name="cmd-batcher", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "CommandBatcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def submit(self, device_uuids: List[str], commands: List[str]) -> Future:
+        # Future resolving to [{"deviceUuid", "commandResponses"}] for these devices and commands.
+        if len(commands) > self.max_commands:
+            raise ValueError(f"{len(commands)} commands in one request; the limit is {self.max_commands}")
+        req = _Request(list(dict.fromkeys(device_uuids)), list(dict.fromkeys(commands)))
+        if not req.devices or not req.commands:
+            req.future.set_result([])
+            return req.future
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("CommandBatcher is closed")
+            self._pending.append(req)
+            self._pending_devices += len(req.devices)
+            self.requests += 1
+            self._cond.notify()
+        return req.future
+
+    def collect(self, device_uuids: List[str], commands: List[str]) -> List[Dict[str, Any]]:
+        # Waits no longer than the caller's deadline (src/deadline.py); the merged job itself runs on.
+        fut = self.submit(device_uuids, commands)
+        left = remaining()
+        if left is not None and not wait([fut], timeout=max(left, 0)).done:
+            raise DeadlineExceeded("Command Runner batch did not complete before the deadline")
+        return fut.result()
+
+    def close(self) -> None:
+        # Flushes what is pending, waits for in-flight jobs.
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+
+    # ---- dispatcher ----
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # Window opens with the first request; a full job's worth of devices flushes early.
+                deadline = time.monotonic() + self.window_s
+                while not self._closed and self._pending_devices < self.max_devices:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        break
+                    self._cond.wait(left)
+                batch, self._pending, self._pending_devices = self._pending, [], 0
+            for job in self._pack(batch):
+                self.jobs += 1
+                self._pool.submit(self._execute, job)
+
+    def _pack(self, batch: List[_Request]) -> List[_Job]:
+        jobs: List[_Job] = []
+        for req in batch:
+            for i in range(0, len(req.devices), self.max_devices):
+                devices = req.devices[i:i + self.max_devices]
+                job = next((j for j in jobs if self._fits(j, devices, req.commands)), None)
+                if job is None:
+                    job = _Job()
+                    jobs.append(job)
+                job.devices.update(dict.fromkeys(devices))
+                job.commands.update(dict.fromkeys(req.commands))
+                job.parts.append((req, devices))
+                req.parts += 1
+        return jobs
+
+    def _fits(self, job: _Job, devices: List[str], commands: List[str]) -> bool:
+        new_devices = sum(d not in job.devices for d in devices)
+        new_commands = sum(c not in job.commands for c in commands)
+        return (len(job.devices) + new_devices <= self.max_devices
+                and len(job.commands) + new_commands <= self.max_commands)
+
+    def _execute(self, job: _Job) -> None:
+        try:
+            entries = collect_read_results(self.client, list(job.devices), list(job.commands), **self.collect_kwargs)
+        except BaseException as e:  # noqa: BLE001 - every waiting caller gets the job's error
+            for req, _ in job.parts:
+                if not req.future.done():
+                    req.future.set_exception(e)
+            return
+        by_dev = {e.get("deviceUuid"): e for e in entries}
+        for req, devices in job.parts:
+            self._deliver(req, devices, by_dev)
+
+    @staticmethod
+    def _deliver(req: _Request, devices: List[str], by_dev: Dict[str, Dict[str, Any]]) -> None:
+        wanted: Set[str] = set(req.commands)
+        with req.lock:
+            for dev in devices:
+                entry = by_dev.get(dev)
+                if entry is None:
+                    continue
+                responses = {status: {c: out for c, out in (outputs or {}).items() if c in wanted}
+                             for status, outputs in (entry.get("commandResponses") or {}).items()}
+                req.entries[dev] = {**entry, "commandResponses": responses}
+            req.parts -= 1
+            if req.parts == 0 and not req.future.done():
+                req.future.set_result([req.entries[d] for d in req.devices if d in req.entries])
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Shared on-disk cache of Command Runner outputs, keyed by (deviceUuid, normalized command).
+# AP hunt, the ports audit and ad-hoc runs ask for the same `show power inline` / `show lldp neighbors` on the
+# same switches minutes apart; with a cache, collect_read_results() only submits the (device, command) pairs
+# that are missing or too old, and fills the rest from here.
+#
+#   cache = CommandCache("cmd_cache.db")
+#   entries = collect_read_results(client, uuids, ["show version"], cache=cache)               # per-command TTL
+#   entries = collect_read_results(client, uuids, ["show power inline"], cache=cache, max_age=60)
+#
+# TTLs match on the normalized command by longest prefix ("show power inline" covers "show power inline
+# Gi1/0/1"); commands without a TTL are only cached for callers that pass max_age. Only SUCCESS outputs
+# are stored.
+
+DEFAULT_TTLS: Dict[str, int] = {
+    "show version": 3600,
+    "show inventory": 3600,
+    "show running-config": 300,
+    "show power inline": 300,
+    "show lldp neighbors": 300,
+    "show cdp neighbors": 300,
+    "show interfaces status": 120,
+    "show mac address-table": 60,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    device TEXT NOT NULL,
+    command TEXT NOT NULL,
+    output TEXT NOT NULL,
+    stored REAL NOT NULL,
+    PRIMARY KEY (device, command)
+) WITHOUT ROWID;
+"""
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_command(command: str) -> str:
+    # Whitespace collapsed; the command itself is lowercased, anything after a `|` filter is kept as typed.
+    head, bar, tail = command.strip().partition("|")
+    head = _SPACE_RE.sub(" ", head.strip()).lower()
+    return f"{head} | {_SPACE_RE.sub(' ', tail.strip())}" if bar else head
+
+
+class CommandCache:
+
+    def __init__(self, path: str = "cmd_cache.db", ttls: Optional[Dict[str, int]] = None) -> None:
+        self.path = path
+        self.ttls = {normalize_command(k): v for k, v in (DEFAULT_TTLS if ttls is None else ttls).items()}
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def ttl_for(self, command: str) -> float:
+        cmd = normalize_command(command)
+        best, ttl = -1, 0.0
+        for prefix, value in self.ttls.items():
+            if len(prefix) > best and (cmd == prefix or cmd.startswith(prefix + " ")):
+                best, ttl = len(prefix), float(value)
+        return ttl
+
+    def lookup(self, devices: Iterable[str], commands: Iterable[str],
+               max_age: Optional[float] = None) -> Dict[Tuple[str, str], str]:
+        # {(device, command as given): output} for fresh entries. max_age overrides the command's TTL
+        # (0 forces a refresh).
+        now = time.time()
+        limits = {cmd: (self.ttl_for(cmd) if max_age is None else float(max_age)) for cmd in commands}
+        wanted = {normalize_command(cmd): cmd for cmd, limit in limits.items() if limit > 0}
+        devices = list(devices)
+        found: Dict[Tuple[str, str], str] = {}
+        if wanted:
+            with self._lock:
+                for i in range(0, len(devices), 400):  # stay under SQLite's bound-parameter limit
+                    chunk = devices[i:i + 400]
+                    rows = self.db.execute(
+                        f"SELECT device, command, output, stored FROM outputs WHERE device IN "
+                        f"({','.join('?' * len(chunk))}) AND command IN ({','.join('?' * len(wanted))})",
+                        chunk + list(wanted),
+                    ).fetchall()
+                    for dev, norm, output, stored in rows:
+                        cmd = wanted[norm]
+                        if now - stored <= limits[cmd]:
+                            found[(dev, cmd)] = output
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(devices) * len(limits) - len(found)
+        return found
+
+    def store(self, entries: Iterable[Tuple[str, str, str]], at: Optional[float] = None) -> None:
+        # entries: (device, command, output)
+        stored = time.time() if at is None else at
+        with self._lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO outputs (device, command, output, stored) VALUES (?, ?, ?, ?)",
+                [(dev, normalize_command(cmd), out, stored) for dev, cmd, out in entries],
+            )
+            self.db.commit()
+
+    def purge(self, older_than: float) -> int:
+        # Drop entries stored more than `older_than` seconds ago; returns how many.
+        with self._lock:
+            n = self.db.execute("DELETE FROM outputs WHERE stored < ?", (time.time() - older_than,)).rowcount
+            self.db.commit()
+        return n
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, devices = self.db.execute("SELECT COUNT(*), COUNT(DISTINCT device) FROM outputs").fetchone()
+        return {"entries": entries, "devices": devices, "hits": self.hits, "misses": self.misses}
+
+
+def split_pending(devices: List[str], commands: List[str],
+                  cached: Dict[Tuple[str, str], str]) -> Dict[Tuple[str, ...], List[str]]:
+    # Group devices by the commands they still need: {(commands...): [devices]}; fully cached devices drop out.
+    groups: Dict[Tuple[str, ...], List[str]] = {}
+    for dev in devices:
+        missing = tuple(cmd for cmd in commands if (dev, cmd) not in cached)
+        if missing:
+            groups.setdefault(missing, []).append(dev)
+    return groups
@@ -1,5 +1,7 @@
-from typing import List, Dict, Any
+import json
+from typing import List, Dict, Any, Optional
 from .dnac_client import DNACClient
+from .jobs import wait_for_task
 
 def run_read_cli_commands(client: DNACClient, device_uuids: List[str], commands: List[str]) -> Dict[str, Any]:
     # Submit a Command Runner read request.
@@ -9,4 +11,73 @@ def run_read_cli_commands(client: DNACClient, device_uuids: List[str], commands:
         "deviceUuids": device_uuids,
         "timeout": 30
     }
-    return client.post("/dna/intent/api/v1/network-device-poller/cli/read-request", body)
\ No newline at end of file
+    return client.post("/dna/intent/api/v1/network-device-poller/cli/read-request", body)
+
+def task_file_id(task: Dict[str, Any]) -> Optional[str]:
+    # fileId shows up either inside progress (JSON string or dict) or directly on the task.
+    progress = task.get("progress")
+    if isinstance(progress, str) and progress.startswith("{"):
+        try:
+            return json.loads(progress).get("fileId")
+        except ValueError:
+            pass
+    elif isinstance(progress, dict):
+        return progress.get("fileId")
+    return task.get("fileId")
+
+def collect_read_results(client: DNACClient, device_uuids: List[str], commands: List[str], timeout_s: int = 300, poll_s: float = 2, listener: Any = None, cache: Any = None, max_age: Optional[float] = None, batcher: Any = None) -> List[Dict[str, Any]]:
+    # Submit, wait for the task, then download the result file.
+    # listener: optional src/webhooks.py WebhookListener, so completion is pushed rather than polled.
+    # cache: optional src/cmd_cache.py CommandCache; only (device, command) pairs it can't serve are submitted,
+    # grouped into one job per distinct set of missing commands. max_age overrides the per-command TTLs.
+    # batcher: optional src/cmd_batcher.py CommandBatcher that merges this submission with concurrent ones.
+    # Returns the file entries: [{"deviceUuid": ..., "commandResponses": {"SUCCESS": {...}, "FAILURE": {...}}}]
+    if cache is not None:
+        return _collect_cached(client, device_uuids, commands, cache, max_age,
+                               timeout_s=timeout_s, poll_s=poll_s, listener=listener, batcher=batcher)
+    if batcher is not None:
+        return batcher.collect(device_uuids, commands)
+    job = run_read_cli_commands(client, device_uuids, commands)
+    task_id = job.get("response", {}).get("taskId") or job.get("taskId")
+    if not task_id:
+        raise RuntimeError(f"Unexpected read-request response: {job}")
+    task = wait_for_task(client, task_id, timeout_s=timeout_s, poll_s=poll_s, listener=listener)
+    if task.get("isError"):
+        raise RuntimeError(f"Command Runner task {task_id} failed: {task.get('failureReason') or task}")
+    file_id = task_file_id(task)
+    if not file_id:
+        raise RuntimeError(f"No fileId on completed task {task_id}")
+    return client.get(f"/dna/intent/api/v1/file/{file_id}") or []
+
+def _collect_cached(client: DNACClient, device_uuids: List[str], commands: List[str], cache: Any,
+                    max_age: Optional[float], **kwargs: Any) -> List[Dict[str, Any]]:
+    from .cmd_cache import split_pending
+    cached = cache.lookup(device_uuids, commands, max_age)
+    entries: Dict[str, Dict[str, Any]] = {}
+    for (dev, cmd), output in cached.items():
+        entry = entries.setdefault(dev, {"deviceUuid": dev, "commandResponses": {"SUCCESS": {}}})
+        entry["commandResponses"]["SUCCESS"][cmd] = output
+    # Commands without a TTL are only kept when the caller asked for cached outputs explicitly (max_age).
+    keep = {cmd for cmd in commands if max_age is not None or cache.ttl_for(cmd) > 0}
+    for missing, devs in split_pending(device_uuids, commands, cached).items():
+        fresh = collect_read_results(client, devs, list(missing), **kwargs)
+        cache.store((e.get("deviceUuid"), cmd, out) for e in fresh
+                    for cmd, out in ((e.get("commandResponses") or {}).get("SUCCESS") or {}).items() if cmd in keep)
+        for e in fresh:
+            entry = entries.setdefault(e.get("deviceUuid"), {"deviceUuid": e.get("deviceUuid"), "commandResponses": {}})
+            for status, outputs in (e.get("commandResponses") or {}).items():
+                entry["commandResponses"].setdefault(status, {}).update(outputs or {})
+    return [entries[dev] for dev in device_uuids if dev in entries]
+
+def command_rows(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Flatten result file entries into one row per (device, command).
+    rows = []
+    for entry in entries:
+        dev = entry.get("deviceUuid")
+        responses = entry.get("commandResponses") or {}
+        for cmd, out in (responses.get("SUCCESS") or {}).items():
+            rows.append({"deviceUuid": dev, "command": cmd, "output": out, "error": ""})
+        for status in ("FAILURE", "BLACKLISTED"):
+            for cmd, err in (responses.get(status) or {}).items():
+                rows.append({"deviceUuid": dev, "command": cmd, "output": "", "error": f"{status}: {err}"})
+    return rows
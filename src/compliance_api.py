@@ -1,6 +1,96 @@
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 from .dnac_client import DNACClient
+from .compliance_store import ComplianceStore
+from .jobs import wait_for_task
 
 def get_compliance_status(client: DNACClient, category: str = "RUNNING_CONFIG") -> Dict[str, Any]:
     # Fetch overall compliance status. Category can vary with version/capabilities.
-    return client.get(f"/dna/intent/api/v1/compliance/{category}/summary")
\ No newline at end of file
+    return client.get(f"/dna/intent/api/v1/compliance/{category}/summary")
+
+def run_compliance(client: DNACClient, device_uuids: List[str], categories: Optional[List[str]] = None) -> Dict[str, Any]:
+    # Trigger a compliance run for a set of devices.
+    # Endpoint: /dna/intent/api/v1/compliance/
+    body: Dict[str, Any] = {"triggerFull": True, "deviceUuids": device_uuids}
+    if categories:
+        body["categories"] = categories
+    return client.post("/dna/intent/api/v1/compliance/", body)
+
+def get_device_compliance_detail(client: DNACClient, device_uuid: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
+    # Per-device compliance detail (one item per compliance type).
+    params = {"category": category} if category else None
+    data = client.get(f"/dna/intent/api/v1/compliance/{device_uuid}/detail", params=params)
+    return data.get("response") or []
+
+def collect_device_compliance(
+    client: DNACClient,
+    device_uuids: List[str],
+    store: ComplianceStore,
+    trigger: bool = True,
+    batch_size: int = 100,
+    workers: int = 8,
+    categories: Optional[List[str]] = None,
+    listener: Any = None,
+    poll_s: float = 5,
+) -> int:
+    # Trigger compliance runs in batches, then pull per-device detail concurrently into the store.
+    # Every batch is triggered before any is waited on, and their tasks are awaited concurrently. Devices of a
+    # batch whose run failed get one ERROR row (category TRIGGER) instead of detail left over from an older run.
+    # Returns the new run_id; store.non_compliant()/store.delta() answer dashboard queries locally.
+    failed: Dict[str, str] = {}
+    if trigger:
+        failed = trigger_compliance(client, device_uuids, batch_size, workers, categories, listener, poll_s)
+
+    run_id = store.start_run()
+    for uuid, error in failed.items():
+        store.add_results(run_id, uuid, [{"complianceType": "TRIGGER", "status": "ERROR", "error": error}])
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futs = {ex.submit(get_device_compliance_detail, client, uuid): uuid
+                for uuid in device_uuids if uuid not in failed}
+        for fut in as_completed(futs):
+            uuid = futs[fut]
+            try:
+                items = fut.result()
+            except Exception as e:
+                items = [{"complianceType": "COLLECTION", "status": "ERROR", "error": str(e)}]
+            store.add_results(run_id, uuid, items)
+    store.finish_run(run_id)
+    return run_id
+
+def trigger_compliance(
+    client: DNACClient,
+    device_uuids: List[str],
+    batch_size: int = 100,
+    workers: int = 8,
+    categories: Optional[List[str]] = None,
+    listener: Any = None,
+    poll_s: float = 5,
+) -> Dict[str, str]:
+    # Start a compliance run per batch, then wait for all of their tasks at once.
+    # Returns {device_uuid: error} for every device whose run could not be started or ended with isError.
+    failed: Dict[str, str] = {}
+    tasks: List[Any] = []
+    for i in range(0, len(device_uuids), batch_size):
+        batch = device_uuids[i:i + batch_size]
+        try:
+            job = run_compliance(client, batch, categories)
+        except Exception as e:
+            failed.update(dict.fromkeys(batch, str(e)))
+            continue
+        task_id = job.get("response", {}).get("taskId") or job.get("taskId")
+        if task_id:
+            tasks.append((task_id, batch))
+
+    def finish(task_id: str) -> None:
+        task = wait_for_task(client, task_id, timeout_s=900, poll_s=poll_s, listener=listener)
+        if task.get("isError"):
+            raise RuntimeError(f"Compliance task {task_id} failed: {task.get('failureReason') or task}")
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(tasks)), 1)) as ex:
+        futs = {ex.submit(finish, task_id): batch for task_id, batch in tasks}
+        for fut in as_completed(futs):
+            try:
+                fut.result()
+            except Exception as e:
+                failed.update(dict.fromkeys(futs[fut], str(e)))
+    return failed
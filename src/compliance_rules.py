@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import os
+import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .config_search import config_lines, literal_runs
+
+# Local golden-config compliance: YAML rules evaluated against stored snapshots, no API calls.
+#
+#   rules:
+#     - id: no-http-server
+#       must_not_contain: '^ip http server$'
+#     - id: mgmt-vrf
+#       block: '^interface Vlan${mgmt_vlan}$'         # only lines inside matching blocks
+#       must_contain: '^vrf forwarding ${mgmt_vrf}$'
+#       severity: high
+#
+# Patterns are regexes matched against each config line with its indentation stripped (as in
+# src/config_search.py); must_contain / must_not_contain take one pattern or a list. ${var} is filled from
+# vars/global.yaml overridden by vars/site/<site>.yaml (values are regex-escaped), and a rule whose variables
+# are not defined for a device's site does not apply to it. Rules compile once per site into matchers that
+# check a literal substring of the pattern before running the regex; identical patterns share a matcher and
+# are scanned once per config. evaluate_fleet() spreads configs over a process pool.
+#
+#   ruleset = RuleSet.from_yaml("rules/golden_config.yaml", vars_dir="vars")
+#   results = evaluate_fleet(ruleset, latest_snapshots("baselines"), sites={"<deviceId>": "US-ORL-EPIC-1"})
+
+SEVERITIES = ("low", "medium", "high", "critical")
+_VAR_RE = re.compile(r"\$\{(\w+)\}")
+
+
+@dataclass
+class Violation:
+    device: str
+    rule: str
+    severity: str
+    message: str
+    block: str = ""
+    line: str = ""
+
+
+class ParsedConfig:
+    # A config as stripped lines joined once into `text`, with line offsets and block parents.
+
+    __slots__ = ("lines", "parents", "text", "memo", "_starts", "_children")
+
+    def __init__(self, config: str) -> None:
+        rows = config_lines(config)
+        index = {lineno: i for i, (lineno, _, _) in enumerate(rows)}
+        self.lines = [text for _, text, _ in rows]
+        self.parents = [index.get(parent, -1) for _, _, parent in rows]
+        self.text = "\n".join(self.lines)
+        self.memo: Dict[str, List[int]] = {}
+        self._starts: Optional[List[int]] = None
+        self._children: Optional[Dict[int, List[int]]] = None
+
+    def line_at(self, pos: int) -> int:
+        if self._starts is None:
+            starts, at = [], 0
+            for line in self.lines:
+                starts.append(at)
+                at += len(line) + 1
+            self._starts = starts
+        return bisect_right(self._starts, pos) - 1
+
+    def children(self, i: int) -> List[int]:
+        if self._children is None:
+            kids: Dict[int, List[int]] = {}
+            for j, p in enumerate(self.parents):
+                if p >= 0:
+                    kids.setdefault(p, []).append(j)
+            self._children = kids
+        return self._children.get(i, [])
+
+
+class _Matcher:
+    __slots__ = ("pattern", "rx", "literal")
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.rx = re.compile(pattern)
+        runs = [] if self.rx.flags & re.IGNORECASE else [r[0] for r in literal_runs(pattern)]
+        self.literal = max(runs, key=len) if runs else ""
+
+    def lines(self, cfg: ParsedConfig) -> List[int]:
+        # Indices of matching lines, memoized per config (rules share matchers for identical patterns).
+        hit = cfg.memo.get(self.pattern)
+        if hit is None:
+            hit = cfg.memo[self.pattern] = list(self._scan(cfg))
+        return hit
+
+    def _scan(self, cfg: ParsedConfig) -> Iterator[int]:
+        # Only lines containing the pattern's longest literal are tried when it has one.
+        lines, rx, lit = cfg.lines, self.rx, self.literal
+        if not lit:
+            yield from (i for i, line in enumerate(lines) if rx.search(line))
+            return
+        text, last = cfg.text, -1
+        pos = text.find(lit)
+        while pos >= 0:
+            i = cfg.line_at(pos)
+            if i != last:
+                last = i
+                if rx.search(lines[i]):
+                    yield i
+            pos = text.find(lit, pos + 1)
+
+    def any_in(self, cfg: ParsedConfig, idx: Iterable[int]) -> bool:
+        lines, rx = cfg.lines, self.rx
+        return any(rx.search(lines[i]) for i in idx)
+
+
+class CompiledRule:
+    __slots__ = ("id", "severity", "description", "block", "must", "must_not")
+
+    def __init__(self, spec: Dict[str, Any], variables: Dict[str, Any],
+                 matchers: Optional[Dict[str, _Matcher]] = None) -> None:
+        matchers = {} if matchers is None else matchers
+
+        def matcher(pattern: str) -> _Matcher:
+            pattern = _fill(pattern, variables)
+            m = matchers.get(pattern)
+            if m is None:
+                m = matchers[pattern] = _Matcher(pattern)
+            return m
+
+        self.id = str(spec["id"])
+        self.severity = str(spec.get("severity", "medium")).lower()
+        self.description = spec.get("description", "")
+        self.block = matcher(spec["block"]) if spec.get("block") else None
+        self.must = [matcher(p) for p in _as_list(spec.get("must_contain"))]
+        self.must_not = [matcher(p) for p in _as_list(spec.get("must_not_contain"))]
+
+    def check(self, device: str, cfg: ParsedConfig) -> List[Violation]:
+        out: List[Violation] = []
+        if self.block is None:
+            for m in self.must:
+                if not m.lines(cfg):
+                    out.append(self._v(device, f"missing line matching {m.pattern!r}"))
+            for m in self.must_not:
+                for i in m.lines(cfg):
+                    out.append(self._v(device, f"forbidden line matching {m.pattern!r}", line=cfg.lines[i]))
+            return out
+        for h in self.block.lines(cfg):
+            kids = cfg.children(h)
+            for m in self.must:
+                if not m.any_in(cfg, kids):
+                    out.append(self._v(device, f"block lacks a line matching {m.pattern!r}", cfg.lines[h]))
+            for m in self.must_not:
+                for i in kids:
+                    if m.rx.search(cfg.lines[i]):
+                        out.append(self._v(device, f"block has a line matching {m.pattern!r}", cfg.lines[h],
+                                           cfg.lines[i]))
+        return out
+
+    def _v(self, device: str, message: str, block: str = "", line: str = "") -> Violation:
+        if self.description:
+            message = f"{self.description}: {message}"
+        return Violation(device, self.id, self.severity, message, block, line)
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    return [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+
+
+def _fill(pattern: str, variables: Dict[str, Any]) -> str:
+    # Only ${name} is substituted: a bare $ is the regex end anchor.
+    return _VAR_RE.sub(lambda m: re.escape(str(variables[m.group(1)])), pattern)
+
+
+def _names(spec: Dict[str, Any]) -> Set[str]:
+    patterns = [spec.get("block") or ""] + _as_list(spec.get("must_contain")) + _as_list(spec.get("must_not_contain"))
+    return {name for p in patterns for name in _VAR_RE.findall(p)}
+
+
+class RuleSet:
+
+    def __init__(self, rules: Sequence[Dict[str, Any]], global_vars: Optional[Dict[str, Any]] = None,
+                 site_vars: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.rules = list(rules)
+        self.global_vars = dict(global_vars or {})
+        self.site_vars = dict(site_vars or {})
+        seen = set()
+        for spec in self.rules:
+            if "id" not in spec or not (spec.get("must_contain") or spec.get("must_not_contain")):
+                raise ValueError(f"Rule needs an id and must_contain or must_not_contain: {spec}")
+            if str(spec.get("severity", "medium")).lower() not in SEVERITIES:
+                raise ValueError(f"Rule {spec['id']}: severity must be one of {', '.join(SEVERITIES)}")
+            if spec["id"] in seen:
+                raise ValueError(f"Duplicate rule id: {spec['id']}")
+            seen.add(spec["id"])
+        self._needs = [_names(spec) for spec in self.rules]
+        self._compiled: Dict[Optional[str], List[CompiledRule]] = {}
+
+    @classmethod
+    def from_yaml(cls, path: str, vars_dir: Optional[str] = "vars") -> "RuleSet":
+        from .config import load_yaml
+        rules = load_yaml(path).get("rules") or []
+        global_vars: Dict[str, Any] = {}
+        site_vars: Dict[str, Dict[str, Any]] = {}
+        if vars_dir and os.path.isdir(vars_dir):
+            if os.path.exists(os.path.join(vars_dir, "global.yaml")):
+                global_vars = load_yaml(os.path.join(vars_dir, "global.yaml"))
+            site_dir = os.path.join(vars_dir, "site")
+            if os.path.isdir(site_dir):
+                for name in sorted(os.listdir(site_dir)):
+                    if name.endswith((".yaml", ".yml")):
+                        site_vars[os.path.splitext(name)[0]] = load_yaml(os.path.join(site_dir, name))
+        return cls(rules, global_vars, site_vars)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Ship the specs to worker processes; each compiles its own matchers.
+        return {"rules": self.rules, "global_vars": self.global_vars, "site_vars": self.site_vars}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["rules"], state["global_vars"], state["site_vars"])
+
+    def variables(self, site: Optional[str]) -> Dict[str, Any]:
+        return {**self.global_vars, **(self.site_vars.get(site) or {} if site else {})}
+
+    def compiled(self, site: Optional[str] = None) -> List[CompiledRule]:
+        # Rules that apply to devices at `site`, compiled on first use.
+        rules = self._compiled.get(site)
+        if rules is None:
+            variables = self.variables(site)
+            matchers: Dict[str, _Matcher] = {}
+            rules = self._compiled[site] = [CompiledRule(spec, variables, matchers)
+                                            for spec, needs in zip(self.rules, self._needs) if needs <= variables.keys()]
+        return rules
+
+    def evaluate(self, device: str, config: str, site: Optional[str] = None) -> List[Violation]:
+        cfg = ParsedConfig(config)
+        out: List[Violation] = []
+        for rule in self.compiled(site):
+            out.extend(rule.check(device, cfg))
+        return out
+
+
+def latest_snapshots(outdir: str = "baselines") -> List[Tuple[str, str]]:
+    # (deviceId, path of its newest <stamp>.cfg) for the drift snapshot layout.
+    out = []
+    for device in sorted(os.listdir(outdir)):
+        dev_dir = os.path.join(outdir, device)
+        snaps = sorted(p for p in os.listdir(dev_dir) if p.endswith(".cfg")) if os.path.isdir(dev_dir) else []
+        if snaps:
+            out.append((device, os.path.join(dev_dir, snaps[-1])))
+    return out
+
+
+def load_sites(path: str) -> Dict[str, str]:
+    # device -> site from a YAML mapping or a two-column CSV (device,site; a header row is skipped).
+    if path.lower().endswith(".csv"):
+        import csv
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = [r for r in csv.reader(f) if len(r) >= 2]
+        if rows and rows[0][0].strip().lower() in ("device", "deviceid", "id", "hostname"):
+            rows = rows[1:]
+        return {r[0].strip(): r[1].strip() for r in rows}
+    from .config import load_yaml
+    return {str(k): str(v) for k, v in load_yaml(path).items()}
+
+
+_worker_rules: Optional[RuleSet] = None
+_worker_history: Any = None
+
+
+def _init_worker(ruleset: RuleSet, history_path: Optional[str]) -> None:
+    global _worker_rules, _worker_history
+    _worker_rules = ruleset
+    if history_path:
+        from .config_history import ConfigHistory
+        _worker_history = ConfigHistory(history_path)
+
+
+def _load(device: str, source: Optional[str], history: Any) -> Optional[str]:
+    if source is None:
+        return history.get_config(device) if history is not None else None
+    with open(source, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _evaluate(items: List[Tuple[str, Optional[str], Optional[str]]], rules: RuleSet,
+              history: Any) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    out = []
+    for device, site, source in items:
+        try:
+            config = _load(device, source, history)
+        except OSError as e:
+            out.append((device, [asdict(Violation(device, "SNAPSHOT", "critical", f"unreadable snapshot: {e}"))]))
+            continue
+        if config is None:
+            continue
+        out.append((device, [asdict(v) for v in rules.evaluate(device, config, site)]))
+    return out
+
+
+def _evaluate_chunk(items: List[Tuple[str, Optional[str], Optional[str]]]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    # Pool entry point: the rules and history DB were set up once per worker by _init_worker.
+    return _evaluate(items, _worker_rules, _worker_history)
+
+
+def evaluate_fleet(ruleset: RuleSet, snapshots: Iterable[Tuple[str, Optional[str]]],
+                   sites: Optional[Dict[str, str]] = None, workers: Optional[int] = None,
+                   history: Optional[str] = None, chunk: int = 64) -> Iterator[Tuple[str, List[Violation]]]:
+    # Yields (device, violations) for every snapshot, in input order. snapshots: (device, .cfg path),
+    # or (device, None) to read the newest version from the config history DB at `history`.
+    # workers=1 evaluates in this process (no pool start-up cost for small runs).
+    sites = sites or {}
+    items = [(dev, sites.get(dev), src) for dev, src in snapshots]
+    batches = [items[i:i + chunk] for i in range(0, len(items), max(chunk, 1))]
+    pool = store = None
+    if workers == 1 or len(batches) <= 1:
+        if history:
+            from .config_history import ConfigHistory
+            store = ConfigHistory(history)
+        results: Iterable[List[Tuple[str, List[Dict[str, Any]]]]] = (
+            _evaluate(batch, ruleset, store) for batch in batches)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ruleset, history))
+        results = pool.map(_evaluate_chunk, batches)
+    try:
+        for batch in results:
+            for device, found in batch:
+                yield device, [Violation(**v) for v in found]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if store is not None:
+            store.close()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+NON_COMPLIANT = ("NON_COMPLIANT", "ERROR")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    device_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL,
+    device_uuid TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    detail TEXT,
+    PRIMARY KEY (run_id, device_uuid, category)
+);
+CREATE INDEX IF NOT EXISTS results_status ON results (run_id, status);
+"""
+
+
+class ComplianceStore:
+    # Local SQLite store of per-device compliance results, one row per (run, device, category).
+    # Dashboards query it instead of the cluster; delta() compares any two runs.
+
+    def __init__(self, path: str = "compliance.db") -> None:
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def start_run(self) -> int:
+        cur = self.db.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),))
+        self.db.commit()
+        return cur.lastrowid
+
+    def add_results(self, run_id: int, device_uuid: str, items: Iterable[Dict[str, Any]]) -> None:
+        rows = [
+            (
+                run_id,
+                device_uuid,
+                it.get("complianceType") or it.get("category") or "UNKNOWN",
+                (it.get("status") or "UNKNOWN").upper(),
+                json.dumps(it),
+            )
+            for it in items
+        ]
+        self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+
+    def finish_run(self, run_id: int) -> None:
+        self.db.execute(
+            "UPDATE runs SET device_count = "
+            "(SELECT COUNT(DISTINCT device_uuid) FROM results WHERE run_id = ?) WHERE run_id = ?",
+            (run_id, run_id),
+        )
+        self.db.commit()
+
+    def runs(self) -> List[int]:
+        return [r[0] for r in self.db.execute("SELECT run_id FROM runs ORDER BY run_id")]
+
+    def latest_run(self, before: Optional[int] = None) -> Optional[int]:
+        if before is None:
+            row = self.db.execute("SELECT MAX(run_id) FROM runs").fetchone()
+        else:
+            row = self.db.execute("SELECT MAX(run_id) FROM runs WHERE run_id < ?", (before,)).fetchone()
+        return row[0] if row else None
+
+    def statuses(self, run_id: int) -> Dict[tuple, str]:
+        rows = self.db.execute(
+            "SELECT device_uuid, category, status FROM results WHERE run_id = ?", (run_id,)
+        )
+        return {(d, c): s for d, c, s in rows}
+
+    def non_compliant(self, run_id: Optional[int] = None, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        run_id = run_id or self.latest_run()
+        sql = "SELECT device_uuid, category, status FROM results WHERE run_id = ? AND status IN (?, ?)"
+        args: List[Any] = [run_id, *NON_COMPLIANT]
+        if category:
+            sql += " AND category = ?"
+            args.append(category)
+        return [
+            {"deviceUuid": d, "category": c, "status": s}
+            for d, c, s in self.db.execute(sql + " ORDER BY device_uuid, category", args)
+        ]
+
+    def delta(self, run_id: Optional[int] = None, prev_run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Every (device, category) whose status changed, appeared or disappeared between two runs.
+        run_id = run_id or self.latest_run()
+        prev_run_id = prev_run_id or self.latest_run(before=run_id)
+        cur = self.statuses(run_id)
+        prev = self.statuses(prev_run_id) if prev_run_id else {}
+        changes = []
+        for key in sorted(cur.keys() | prev.keys()):
+            before, after = prev.get(key), cur.get(key)
+            if before != after:
+                changes.append({"deviceUuid": key[0], "category": key[1], "previous": before, "current": after})
+        return changes
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .deadline import bounded
+
+# Shared concurrency engine for fleet workflows (see src/cli.py).
+# - RateLimiter: token bucket shared by every worker; DNACClient(limiter=...) takes one token per request.
+# - WorkerPool: runs fn(item) on a thread pool with a bounded number of items in flight, optionally
+#   skipping/recording items through a Checkpoint (src/checkpoint.py) so runs can be resumed, and
+#   optionally giving each item a deadline (src/deadline.py) that every request it makes honors.
+#
+#   limiter = RateLimiter(rate=10)
+#   client = DNACClient(..., limiter=limiter)
+#   pool = WorkerPool(workers=16, checkpoint=Checkpoint("checkpoint.db", "drift", resume=True))
+#   for out in pool.map(lambda dev: snapshot_device(client, dev), device_ids):
+#       print(out.item, out.error or out.result)
+
+
+class RateLimiter:
+    # Token bucket: `rate` tokens per second, up to `burst` saved. rate <= 0 disables limiting.
+
+    def __init__(self, rate: float = 0.0, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.waited_s = 0.0
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        # Block until `tokens` are available; returns the time spent waiting.
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= tokens
+            wait_s = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited_s += wait_s
+        # Tokens are reserved under the lock, so sleeping outside it keeps callers in FIFO-ish order.
+        if wait_s:
+            time.sleep(wait_s)
+        return wait_s
+
+
+@dataclass
+class Outcome:
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class WorkerPool:
+
+    def __init__(self, workers: int = 8, checkpoint: Any = None, max_pending: Optional[int] = None,
+                 deadline_s: Optional[float] = None) -> None:
+        self.workers = max(int(workers), 1)
+        self.checkpoint = checkpoint
+        self.max_pending = max_pending or self.workers * 4
+        self.deadline_s = deadline_s  # per-item time budget for everything fn does (src/deadline.py)
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any],
+            key: Callable[[Any], str] = str) -> Iterator[Outcome]:
+        # Yields an Outcome per item in completion order; exceptions are captured, never raised.
+        # With a checkpoint, items already DONE are skipped and every outcome is journaled under key(item).
+        items = list(items)
+        if self.checkpoint is not None:
+            done = self.checkpoint.completed()
+            items = [it for it in items if key(it) not in done]
+        it = iter(items)
+        pending: Dict[Future, Any] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as ex:
+            # Bounded submission keeps memory flat for very large device lists
+            for item in it:
+                pending[ex.submit(bounded, self.deadline_s, fn, item)] = item
+                if len(pending) >= self.max_pending:
+                    break
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    item = pending.pop(fut)
+                    outcome = Outcome(item)
+                    try:
+                        outcome.result = fut.result()
+                    except Exception as e:
+                        outcome.error = e
+                    self._journal(key(item), outcome)
+                    yield outcome
+                    nxt = next(it, _END)
+                    if nxt is not _END:
+                        pending[ex.submit(bounded, self.deadline_s, fn, nxt)] = nxt
+
+    def _journal(self, key: str, outcome: Outcome) -> None:
+        if self.checkpoint is None:
+            return
+        if outcome.ok:
+            self.checkpoint.done(key, outcome.result)
+        else:
+            self.checkpoint.failed(key, outcome.error)
+
+
+_END = object()
@@ -1,8 +1,30 @@
 import os
-import yaml
-from dotenv import load_dotenv
+from typing import Any, Dict, List, Tuple
 
-load_dotenv()
+# Settings are cheap to construct: .env is loaded on first use, and settings.yaml is only parsed when a
+# YAML-backed attribute (global_cfg, sites, clusters_cfg) is read, then cached by (path, mtime) so
+# repeated Settings() in one process parse the file once. yaml and dotenv are imported on demand.
+
+_env_loaded = False
+_yaml_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+def load_env() -> None:
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+def load_yaml(path: str) -> Dict[str, Any]:
+    mtime = os.stat(path).st_mtime
+    cached = _yaml_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    import yaml
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    _yaml_cache[path] = (mtime, data)
+    return data
 
 def env_bool(key: str, default: bool=False) -> bool:
     v = os.getenv(key, str(default)).strip().lower()
@@ -10,6 +32,8 @@ def env_bool(key: str, default: bool=False) -> bool:
 
 class Settings:
     def __init__(self, settings_path: str = "settings.yaml") -> None:
+        load_env()
+        self.settings_path = settings_path
         self.dnac_url = os.getenv("DNAC_URL")
         self.username = os.getenv("DNAC_USERNAME")
         self.password = os.getenv("DNAC_PASSWORD")
@@ -18,11 +42,23 @@ class Settings:
         self.http_proxy = os.getenv("HTTP_PROXY")
         self.https_proxy = os.getenv("HTTPS_PROXY")
         self.no_proxy = os.getenv("NO_PROXY")
+        self.webhook_token = os.getenv("DNAC_WEBHOOK_TOKEN")
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return load_yaml(self.settings_path)
+
+    @property
+    def global_cfg(self) -> Dict[str, Any]:
+        return self.data.get("global", {})
 
-        with open(settings_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        self.global_cfg = data.get("global", {})
-        self.sites = data.get("sites", {})
+    @property
+    def sites(self) -> Dict[str, Any]:
+        return self.data.get("sites", {})
+
+    @property
+    def clusters_cfg(self) -> Dict[str, Any]:
+        return self.data.get("clusters", {})
 
     def proxies(self):
         proxies = {}
@@ -30,4 +66,35 @@ class Settings:
             proxies["http"] = self.http_proxy
         if self.https_proxy:
             proxies["https"] = self.https_proxy
-        return proxies if proxies else None
\ No newline at end of file
+        return proxies if proxies else None
+
+    def clusters(self) -> List["ClusterSettings"]:
+        # One entry per `clusters:` key in settings.yaml; without that section, the single DNAC_* cluster.
+        # Credentials come from DNAC_<NAME>_USERNAME / DNAC_<NAME>_PASSWORD (NAME upper-cased, '-' -> '_'),
+        # falling back to DNAC_USERNAME / DNAC_PASSWORD. Passwords are never read from YAML.
+        clusters_cfg = self.clusters_cfg
+        if not clusters_cfg:
+            return [ClusterSettings("default", self.dnac_url, self.username, self.password, self.verify_ssl, self.timeout)]
+        out = []
+        for name, cfg in clusters_cfg.items():
+            cfg = cfg or {}
+            prefix = "DNAC_" + name.upper().replace("-", "_") + "_"
+            out.append(ClusterSettings(
+                name=name,
+                url=cfg.get("url") or os.getenv(prefix + "URL"),
+                username=os.getenv(prefix + "USERNAME") or cfg.get("username") or self.username,
+                password=os.getenv(prefix + "PASSWORD") or self.password,
+                verify_ssl=env_bool(prefix + "VERIFY_SSL", cfg.get("verify_ssl", self.verify_ssl)),
+                timeout=int(cfg.get("timeout", self.timeout)),
+            ))
+        return out
+
+
+class ClusterSettings:
+    def __init__(self, name: str, url: str, username: str, password: str, verify_ssl: bool = False, timeout: int = 30) -> None:
+        self.name = name
+        self.url = url
+        self.username = username
+        self.password = password
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
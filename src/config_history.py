@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import datetime as _dt
+import difflib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+# Reverse-delta config history: one SQLite file for the whole fleet.
+# The newest config of each device is stored in full; every older version is stored as a reverse delta
+# (line opcodes that rebuild it from the next newer version), so storage grows with the volume of change,
+# not with the number of snapshots, and unchanged snapshots add nothing. Every `keyframe_every` versions a
+# full copy is kept, which bounds get_config() to that many delta applications. (device, ts) is the primary
+# key, so point-in-time lookups are one index seek.
+#
+#   hist = ConfigHistory("config_history.db")
+#   hist.add(device_id, cfg)                                    # or save_snapshot(..., history=hist)
+#   hist.get_config(device_id, at="2025-06-01 08:00")
+#   print(hist.diff(device_id, "20250601_080000", time.time()))
+
+FULL = "FULL"
+DELTA = "DELTA"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    device TEXT NOT NULL,
+    ts REAL NOT NULL,
+    sha TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    run INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (device, ts)
+) WITHOUT ROWID;
+"""
+
+When = Union[None, float, int, str, _dt.datetime]
+
+_STAMP_FORMATS = ("%Y%m%d_%H%M%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+
+def to_ts(when: When) -> float:
+    # Epoch seconds from an epoch number, a datetime, a snapshot stamp (20250601_080000) or an ISO-ish date.
+    if when is None:
+        return time.time()
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, _dt.datetime):
+        return when.timestamp()
+    text = str(when).strip()
+    for fmt in _STAMP_FORMATS:  # before float(): float("20250601_080000") parses as a number
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            continue
+    try:
+        return float(text)
+    except ValueError:
+        return _dt.datetime.fromisoformat(text).timestamp()
+
+
+def make_delta(newer: List[str], older: List[str]) -> List[Any]:
+    # Ops rebuilding `older` from `newer`: [i, j] copies newer[i:j]; a list of strings is inserted as-is.
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, newer, older).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(older[j1:j2])
+    return ops
+
+
+def apply_delta(newer: List[str], ops: List[Any]) -> List[str]:
+    out: List[str] = []
+    for op in ops:
+        if op and isinstance(op[0], int):
+            out.extend(newer[op[0]:op[1]])
+        else:
+            out.extend(op)
+    return out
+
+
+def _pack(obj: Any) -> bytes:
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class ConfigHistory:
+
+    def __init__(self, path: str = "config_history.db", keyframe_every: int = 32) -> None:
+        self.path = path
+        self.keyframe_every = max(int(keyframe_every), 1)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self.db.close()
+
+    # ---- writing ----
+
+    def add(self, device: str, config: str, at: When = None) -> bool:
+        # Record `config` as of `at` (default now). Returns False when it matches the version in force at
+        # that time. Snapshots older than the newest stored one are ignored (history is append-only).
+        ts = to_ts(at)
+        sha = hashlib.sha256(config.encode("utf-8")).hexdigest()
+        with self._lock:
+            head = self.db.execute(
+                "SELECT ts, sha, body FROM versions WHERE device = ? ORDER BY ts DESC LIMIT 1", (device,)
+            ).fetchone()
+            if head is not None and (head[1] == sha or ts <= head[0]):
+                return False
+            lines = config.splitlines(keepends=True)
+            if head is not None:
+                self._demote(device, head[0], _unpack(head[2]), lines)
+            self.db.execute(
+                "INSERT INTO versions (device, ts, sha, kind, run, size, body) VALUES (?, ?, ?, ?, 0, ?, ?)",
+                (device, ts, sha, FULL, len(config), _pack(lines)),
+            )
+            self.db.commit()
+        return True
+
+    def _demote(self, device: str, ts: float, old_lines: List[str], new_lines: List[str]) -> None:
+        # The previous head becomes a reverse delta against the new head, unless it is due for a keyframe.
+        below = self.db.execute(
+            "SELECT kind, run FROM versions WHERE device = ? AND ts < ? ORDER BY ts DESC LIMIT 1", (device, ts)
+        ).fetchone()
+        run = (below[1] if below and below[0] == DELTA else 0) + 1
+        if run >= self.keyframe_every:
+            return
+        self.db.execute("UPDATE versions SET kind = ?, run = ?, body = ? WHERE device = ? AND ts = ?",
+                        (DELTA, run, _pack(make_delta(new_lines, old_lines)), device, ts))
+
+    def import_baselines(self, outdir: str = "baselines") -> int:
+        # Load <outdir>/<deviceId>/<stamp>.cfg snapshots (the drift layout), oldest first; returns versions added.
+        added = 0
+        for device in sorted(os.listdir(outdir)):
+            dev_dir = os.path.join(outdir, device)
+            if not os.path.isdir(dev_dir):
+                continue
+            for name in sorted(p for p in os.listdir(dev_dir) if p.endswith(".cfg")):
+                try:
+                    ts = to_ts(name[:-4])
+                except ValueError:
+                    continue
+                with open(os.path.join(dev_dir, name), "r", encoding="utf-8") as f:
+                    added += self.add(device, f.read(), ts)
+        return added
+
+    # ---- reading ----
+
+    def devices(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self.db.execute("SELECT DISTINCT device FROM versions ORDER BY device")]
+
+    def versions(self, device: str) -> List[Tuple[float, str]]:
+        # [(ts, sha256)] oldest first.
+        with self._lock:
+            return self.db.execute("SELECT ts, sha FROM versions WHERE device = ? ORDER BY ts", (device,)).fetchall()
+
+    def get_config(self, device: str, at: When = None) -> Optional[str]:
+        # The config in force at `at` (default: latest); None before the first snapshot.
+        lines = self._lines_at(device, to_ts(at))
+        return None if lines is None else "".join(lines)
+
+    def _lines_at(self, device: str, ts: float) -> Optional[List[str]]:
+        with self._lock:
+            target = self.db.execute(
+                "SELECT ts FROM versions WHERE device = ? AND ts <= ? ORDER BY ts DESC LIMIT 1", (device, ts)
+            ).fetchone()
+            if target is None:
+                return None
+            chain: List[bytes] = []
+            for kind, body in self.db.execute(
+                "SELECT kind, body FROM versions WHERE device = ? AND ts >= ? ORDER BY ts", (device, target[0])
+            ):
+                chain.append(body)
+                if kind == FULL:
+                    break
+        lines = _unpack(chain.pop())
+        for body in reversed(chain):
+            lines = apply_delta(lines, _unpack(body))
+        return lines
+
+    def diff(self, device: str, t1: When, t2: When = None) -> str:
+        # Unified diff between the configs in force at t1 and t2 (default: latest).
+        old = self._lines_at(device, to_ts(t1)) or []
+        new = self._lines_at(device, to_ts(t2)) or []
+        return "".join(difflib.unified_diff(old, new, fromfile=f"{device}@{t1}", tofile=f"{device}@{t2 or 'latest'}"))
+
+    def iter_latest(self) -> Iterator[Tuple[str, float, str]]:
+        # (device, ts, config) for every device's newest version.
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT device, ts, body FROM versions v WHERE kind = ? AND ts = "
+                "(SELECT MAX(ts) FROM versions WHERE device = v.device)", (FULL,)
+            ).fetchall()
+        for device, ts, body in rows:
+            yield device, ts, "".join(_unpack(body))
+
+    def stats(self) -> dict:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT device), SUM(kind = 'FULL'), COALESCE(SUM(size), 0), "
+                "COALESCE(SUM(LENGTH(body)), 0) FROM versions"
+            ).fetchone()
+        return {"versions": row[0], "devices": row[1], "full": row[2] or 0, "raw_bytes": row[3], "stored_bytes": row[4]}
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:  # Python 3.11+
+    import re._parser as _sre
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre  # type: ignore[no-redef]
+
+# Fleet-wide full-text index over device configs ("which devices still have `ip http server`?").
+# Every distinct config line in the fleet is stored once (`lines`), with postings to the devices/line numbers
+# that contain it and the block header it sits under, plus a word index (`tokens`) over the distinct lines.
+# Exact-line queries are a single index lookup; regex queries only run the regex over distinct lines that
+# contain the pattern's literal words; block-scoped queries filter on the parent header. Only the newest
+# snapshot of each device is indexed, and a snapshot is re-indexed only when its content hash changes.
+#
+#   idx = ConfigIndex("config_index.db")
+#   idx.index_baselines("baselines")                 # or save_snapshot(..., index=idx) during drift
+#   idx.search_line("ip http server")
+#   idx.search(r"snmp-server community \S+ RW")
+#   idx.search(r"^shutdown$", block=r"^interface GigabitEthernet1/0/")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    dev_id INTEGER PRIMARY KEY,
+    device TEXT NOT NULL UNIQUE,
+    snapshot TEXT,
+    sha TEXT NOT NULL,
+    indexed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lines (
+    line_id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS postings (
+    line_id INTEGER NOT NULL,
+    dev_id INTEGER NOT NULL,
+    lineno INTEGER NOT NULL,
+    parent_id INTEGER NOT NULL,
+    PRIMARY KEY (line_id, dev_id, lineno)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_dev ON postings (dev_id);
+CREATE TABLE IF NOT EXISTS tokens (
+    token TEXT NOT NULL,
+    line_id INTEGER NOT NULL,
+    PRIMARY KEY (token, line_id)
+) WITHOUT ROWID;
+"""
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SKIP = ("!", "")
+
+
+def config_lines(config: str) -> List[Tuple[int, str, int]]:
+    # (lineno, text, parent lineno) for every meaningful line; text is stripped of indentation, and the
+    # parent is the nearest less-indented line above (0 at top level).
+    out: List[Tuple[int, str, int]] = []
+    stack: List[Tuple[int, int]] = []  # (indent, lineno)
+    for lineno, raw in enumerate(config.splitlines(), 1):
+        text = raw.strip()
+        if text in _SKIP or text.startswith("!"):
+            continue
+        indent = len(raw) - len(raw.lstrip(" "))
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        out.append((lineno, text, stack[-1][1] if stack else 0))
+        stack.append((indent, lineno))
+    return out
+
+
+def literal_runs(pattern: str) -> List[Tuple[str, bool, bool]]:
+    # (text, left fixed, right fixed) for each run of literal characters at the top level of the regex;
+    # an end is fixed when it touches ^, $ or \b.
+    try:
+        parsed = list(_sre.parse(pattern))
+    except re.error:
+        return []
+    runs: List[Tuple[str, bool, bool]] = []
+    run: List[str] = []
+    left = False
+    for op, av in parsed + [(None, None)]:
+        if op is _sre.LITERAL:
+            run.append(chr(av))
+            continue
+        right = op is _sre.AT and av in (_sre.AT_END, _sre.AT_BOUNDARY, _sre.AT_END_STRING)
+        if run:
+            runs.append(("".join(run), left, right))
+        run = []
+        left = op is _sre.AT and av in (_sre.AT_BEGINNING, _sre.AT_BOUNDARY, _sre.AT_BEGINNING_STRING)
+    return runs
+
+
+def required_tokens(pattern: str) -> Set[str]:
+    # Words every match of `pattern` must contain in full (both ends fixed by other literals, ^/$ or \b).
+    tokens: Set[str] = set()
+    for text, left, right in literal_runs(pattern):
+        text = text.lower()
+        for m in TOKEN_RE.finditer(text):
+            if (m.start() > 0 or left) and (m.end() < len(text) or right):
+                tokens.add(m.group())
+    return tokens
+
+
+class ConfigIndex:
+
+    def __init__(self, path: str = "config_index.db") -> None:
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._line_ids: Optional[Dict[str, int]] = None
+
+    def close(self) -> None:
+        self.db.close()
+
+    # ---- indexing ----
+
+    def index_snapshot(self, device: str, config: str, snapshot: Optional[str] = None) -> bool:
+        # (Re)index a device's config; returns False (and does nothing) when the content is unchanged.
+        sha = hashlib.sha256(config.encode("utf-8")).hexdigest()
+        rows = config_lines(config)
+        with self._lock:
+            cur = self.db.execute("SELECT dev_id, sha FROM snapshots WHERE device = ?", (device,)).fetchone()
+            if cur is not None and cur[1] == sha:
+                if snapshot:
+                    self.db.execute("UPDATE snapshots SET snapshot = ? WHERE dev_id = ?", (snapshot, cur[0]))
+                    self.db.commit()
+                return False
+            if cur is None:
+                dev_id = self.db.execute(
+                    "INSERT INTO snapshots (device, snapshot, sha, indexed) VALUES (?, ?, ?, ?)",
+                    (device, snapshot, sha, time.time()),
+                ).lastrowid
+            else:
+                dev_id = cur[0]
+                self.db.execute("DELETE FROM postings WHERE dev_id = ?", (dev_id,))
+                self.db.execute("UPDATE snapshots SET snapshot = ?, sha = ?, indexed = ? WHERE dev_id = ?",
+                                (snapshot, sha, time.time(), dev_id))
+            ids = self._ids_for(text for _, text, _ in rows)
+            by_lineno = {lineno: ids[text] for lineno, text, _ in rows}
+            self.db.executemany(
+                "INSERT OR IGNORE INTO postings (line_id, dev_id, lineno, parent_id) VALUES (?, ?, ?, ?)",
+                [(ids[text], dev_id, lineno, by_lineno.get(parent, 0)) for lineno, text, parent in rows],
+            )
+            self.db.commit()
+        return True
+
+    def _ids_for(self, texts: Iterable[str]) -> Dict[str, int]:
+        # line_id per text, adding unseen lines (and their tokens). Caller holds the lock.
+        if self._line_ids is None:
+            self._line_ids = dict(self.db.execute("SELECT text, line_id FROM lines"))
+        known = self._line_ids
+        new = [t for t in dict.fromkeys(texts) if t not in known]
+        for text in new:
+            cur = self.db.execute("INSERT OR IGNORE INTO lines (text) VALUES (?)", (text,))
+            known[text] = cur.lastrowid if cur.rowcount else self.db.execute(
+                "SELECT line_id FROM lines WHERE text = ?", (text,)).fetchone()[0]  # added by another writer
+        self.db.executemany("INSERT OR IGNORE INTO tokens (token, line_id) VALUES (?, ?)",
+                            [(tok, known[text]) for text in new for tok in set(TOKEN_RE.findall(text.lower()))])
+        return known
+
+    def index_baselines(self, outdir: str = "baselines") -> int:
+        # Index the newest <stamp>.cfg of every <outdir>/<deviceId>/; returns how many were (re)indexed.
+        changed = 0
+        for device in sorted(os.listdir(outdir)):
+            dev_dir = os.path.join(outdir, device)
+            snaps = sorted(p for p in os.listdir(dev_dir) if p.endswith(".cfg")) if os.path.isdir(dev_dir) else []
+            if not snaps:
+                continue
+            with open(os.path.join(dev_dir, snaps[-1]), "r", encoding="utf-8") as f:
+                changed += self.index_snapshot(device, f.read(), snaps[-1][:-4])
+        return changed
+
+    def index_history(self, history: Any) -> int:
+        # Same, from a src/config_history.py ConfigHistory (newest version per device).
+        return sum(self.index_snapshot(device, cfg, time.strftime("%Y%m%d_%H%M%S", time.localtime(ts)))
+                   for device, ts, cfg in history.iter_latest())
+
+    # ---- queries ----
+
+    def search_line(self, line: str, block: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Devices containing this exact line (indentation ignored).
+        with self._lock:
+            row = self.db.execute("SELECT line_id FROM lines WHERE text = ?", (line.strip(),)).fetchone()
+        return self._hits({row[0]} if row else set(), block)
+
+    def search(self, pattern: str, block: Optional[str] = None, flags: int = 0) -> List[Dict[str, Any]]:
+        # Lines matching `pattern` (re.search on the line without indentation); block= restricts hits to
+        # lines inside a block whose header matches that regex.
+        return self._hits(self._matching(pattern, flags), block, flags)
+
+    def devices(self, pattern: str, block: Optional[str] = None, flags: int = 0) -> List[str]:
+        return sorted({h["device"] for h in self.search(pattern, block, flags)})
+
+    def _matching(self, pattern: str, flags: int = 0) -> Set[int]:
+        rx = re.compile(pattern, flags)
+        tokens = sorted(required_tokens(pattern))
+        runs = [] if rx.flags & re.IGNORECASE else [r[0] for r in literal_runs(pattern)]  # incl. inline (?i)
+        with self._lock:
+            if tokens:
+                sql = " INTERSECT ".join(["SELECT line_id FROM tokens WHERE token = ?"] * len(tokens))
+                rows = self.db.execute(
+                    f"SELECT line_id, text FROM lines WHERE line_id IN ({sql})", tokens).fetchall()
+            elif runs:  # no whole word to look up: substring prefilter on the longest literal
+                rows = self.db.execute("SELECT line_id, text FROM lines WHERE instr(text, ?) > 0",
+                                       (max(runs, key=len),)).fetchall()
+            else:
+                rows = self.db.execute("SELECT line_id, text FROM lines").fetchall()
+        return {line_id for line_id, text in rows if rx.search(text)}
+
+    def _hits(self, line_ids: Set[int], block: Optional[str], flags: int = 0) -> List[Dict[str, Any]]:
+        if not line_ids:
+            return []
+        parents = self._matching(block, flags) if block else None
+        if parents is not None and not parents:
+            return []
+        ids = sorted(line_ids)
+        # Small parent sets are filtered in SQL; large ones in Python below.
+        in_sql = sorted(parents) if parents is not None and len(parents) <= 500 else []
+        where = f" AND p.parent_id IN ({','.join('?' * len(in_sql))})" if in_sql else ""
+        rows: List[Tuple[Any, ...]] = []
+        with self._lock:
+            for i in range(0, len(ids), 400):  # stay under SQLite's bound-parameter limit
+                chunk = ids[i:i + 400]
+                rows += self.db.execute(
+                    "SELECT s.device, s.snapshot, p.lineno, l.text, p.parent_id, pl.text FROM postings p "
+                    "JOIN snapshots s ON s.dev_id = p.dev_id JOIN lines l ON l.line_id = p.line_id "
+                    f"LEFT JOIN lines pl ON pl.line_id = p.parent_id WHERE p.line_id IN ({','.join('?' * len(chunk))})"
+                    + where, chunk + in_sql,
+                ).fetchall()
+        rows.sort(key=lambda r: (r[0], r[2]))
+        return [{"device": dev, "snapshot": snap, "lineno": lineno, "line": text, "block": ptext or ""}
+                for dev, snap, lineno, text, parent, ptext in rows if parents is None or parent in parents]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = [self.db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                      for t in ("snapshots", "lines", "postings", "tokens")]
+        return dict(zip(("devices", "distinct_lines", "postings", "tokens"), counts))
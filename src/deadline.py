@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+# Per-step time budgets that flow into nested calls. A workflow step (one device's snapshot, one PnP claim,
+# one Command Runner chunk) runs under a deadline; every HTTP request made inside it gets
+# min(client timeout, time left) as its timeout, task polling stops at the deadline, and a throttle
+# back-off that would outlive it is not slept through.
+#
+#   with deadline(60):                     # the whole step, however many requests it makes
+#       cfg = client.get(f"/dna/intent/api/v1/network-device/{dev}/config")
+#       with deadline(10):                 # nested budgets only ever shrink
+#           client.get(...)
+#   WorkerPool(8, deadline_s=60).map(fn, items)   # each item gets its own budget
+#
+# The deadline lives in a ContextVar, so it follows the code down the call stack but not into threads the
+# code starts itself; submit work with contextvars.copy_context().run to carry it along (src/hedging.py does).
+
+T = TypeVar("T")
+
+_DEADLINE: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("catalyst_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    # seconds=None leaves the current deadline (if any) in force.
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    outer = _DEADLINE.get()
+    token = _DEADLINE.set(at if outer is None else min(outer, at))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    # Seconds left in the current budget (may be negative once passed), None without one.
+    at = _DEADLINE.get()
+    return None if at is None else at - time.monotonic()
+
+
+def clamp(seconds: float) -> float:
+    # min(seconds, time left); raises DeadlineExceeded when nothing is left.
+    left = remaining()
+    if left is None:
+        return seconds
+    if left <= 0:
+        raise DeadlineExceeded("deadline exceeded")
+    return min(seconds, left)
+
+
+def bounded(seconds: Optional[float], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # fn(*args, **kwargs) under deadline(seconds).
+    with deadline(seconds):
+        return fn(*args, **kwargs)
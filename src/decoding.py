@@ -0,0 +1,95 @@
+import json
+import keyword
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# JSON decoding for DNACClient plus field projection into compact records.
+# orjson is used when installed (pip install orjson); otherwise the stdlib json module.
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+DECODER = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class Record:
+    # Base for projected records. Subclasses declare __slots__ = the projected fields, so a record
+    # costs one small fixed-size object instead of a 40+ key dict. Dict-style get() keeps call sites
+    # like d.get("hostname") working unchanged.
+    __slots__ = ()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default) if name in self.__slots__ else default
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__slots__
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(k, getattr(self, k)) for k in self.__slots__]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+_RECORD_TYPES: Dict[Tuple[str, ...], type] = {}
+
+
+def slot_names_ok(fields: Sequence[str]) -> bool:
+    # Whether fields can be a record's __slots__: identifiers that are not keywords, not mangled ("__x"),
+    # not repeated, and not one of Record's own attributes (a "get" or "keys" field would replace the method).
+    return len(set(fields)) == len(fields) and all(
+        isinstance(f, str) and f.isidentifier() and not keyword.iskeyword(f)
+        and not f.startswith("__") and not hasattr(Record, f)
+        for f in fields
+    )
+
+
+def record_type(fields: Sequence[str]) -> type:
+    # One class per distinct field tuple, created on first use. ValueError for names slot_names_ok() rejects.
+    key = tuple(fields)
+    cls = _RECORD_TYPES.get(key)
+    if cls is None:
+        if not slot_names_ok(key):
+            raise ValueError(f"Field names can't be record slots: {key}")
+        cls = _RECORD_TYPES[key] = type("DeviceRecord", (Record,), {"__slots__": key})
+    return cls
+
+
+def project(items: Iterable[Dict[str, Any]], fields: Sequence[str]) -> List[Any]:
+    # Records when the field names allow it; otherwise (e.g. "items", "config-id") plain dicts of those fields.
+    fields = tuple(fields)
+    if not slot_names_ok(fields):
+        return [{f: item.get(f) for f in fields} for item in items]
+    cls = record_type(fields)
+    out = []
+    for item in items:
+        rec = cls.__new__(cls)
+        for f in cls.__slots__:
+            setattr(rec, f, item.get(f))
+        out.append(rec)
+    return out
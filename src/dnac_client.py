@@ -1,15 +1,37 @@
 from __future__ import annotations
 
 import time
-import requests
-from typing import Any, Dict, List, Optional
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence
+from . import decoding
+from .deadline import DeadlineExceeded, clamp, remaining
+from .http_cache import ResponseCache
+from .instrumentation import RequestEvent, endpoint_template
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    import requests
+    from .hedging import Hedger
+
+# Auth retries: attempts, then exponential back-off bounds in seconds
+TOKEN_ATTEMPTS = 3
+TOKEN_BACKOFF = (1.0, 8.0)
 
 class DNACClient:
     # Minimal client for Catalyst Center (DNA Center) APIs.
     # - Auth via POST /dna/system/api/v1/auth/token using basic auth (username/password).
     # - Automatically injects the token in subsequent requests.
     # - Handles pagination for common list endpoints.
+    # - Honors 429 Retry-After up to throttle_retries times.
+    # - Reports every request to registered hooks (see src/instrumentation.py).
+    # - Optional ResponseCache for read-mostly GETs (see src/http_cache.py).
+    # - Concurrent identical GETs (same path + params) share one in-flight request and its parsed
+    #   result, so treat returned data as read-only when the client is shared across threads.
+    # - Pluggable JSON decoder (orjson when installed) and field projection in paginate().
+    # - Optional shared RateLimiter (src/concurrency.py): one token per HTTP request, across threads.
+    # - Per-step deadlines (src/deadline.py): each request's timeout is capped at the time left, and a
+    #   throttle back-off that would outlive the deadline raises DeadlineExceeded instead of sleeping.
+    # - Optional Hedger (src/hedging.py): GETs still running past their endpoint's p95 get a duplicate.
+    # - `requests` is imported on first request, so importing this module stays cheap for offline tools.
 
     def __init__(
         self,
@@ -19,6 +41,14 @@ class DNACClient:
         verify: bool = False,
         timeout: int = 30,
         proxies: Optional[Dict[str, str]] = None,
+        hooks: Optional[List[Callable[[RequestEvent], None]]] = None,
+        throttle_retries: int = 3,
+        max_throttle_wait: float = 60.0,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+        limiter: Optional[Any] = None,
+        hedger: Optional[Hedger] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.username = username
@@ -26,19 +56,94 @@ class DNACClient:
         self.verify = verify
         self.timeout = timeout
         self.proxies = proxies
+        self.hooks: List[Callable[[RequestEvent], None]] = list(hooks or [])
+        self.throttle_retries = throttle_retries
+        self.max_throttle_wait = max_throttle_wait
+        self.cache = cache
+        self.inflight: Optional[SingleFlight] = SingleFlight() if coalesce else None
+        self.decode: Callable[[bytes], Any] = decoder or decoding.loads
+        self.limiter = limiter
+        self.hedger = hedger
         self._token: Optional[str] = None
         self._token_ts: float = 0
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=8))
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        self.hooks.append(hook)
+
+    def _emit(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                pass  # instrumentation must never break a run
+
+    def _retry_after(self, resp: requests.Response, attempt: int) -> float:
+        try:
+            wait = float(resp.headers.get("Retry-After", ""))
+        except ValueError:
+            wait = 2.0 ** attempt
+        return min(max(wait, 0.0), self.max_throttle_wait)
+
+    def _send(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        # Single choke point for HTTP: hedging, deadlines, throttling back-off and instrumentation live here.
+        if self.hedger is not None and method == "GET":
+            return self.hedger.call(method, endpoint_template(path), lambda: self._send_once(method, path, **kwargs))
+        return self._send_once(method, path, **kwargs)
+
+    def _send_once(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        import requests
+
+        url = f"{self.base_url}{path}"
+        retries = 0
+        throttle_wait = 0.0
+        start = time.perf_counter()
+        resp: Optional[requests.Response] = None
+        try:
+            while True:
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                resp = requests.request(
+                    method, url, verify=self.verify, timeout=clamp(self.timeout), proxies=self.proxies, **kwargs
+                )
+                if resp.status_code != 429 or retries >= self.throttle_retries:
+                    break
+                wait = self._retry_after(resp, retries)
+                left = remaining()
+                if left is not None and wait >= left:
+                    raise DeadlineExceeded(f"{method} {path}: throttled for {wait:g}s with {max(left, 0):.1f}s left")
+                retries += 1
+                throttle_wait += wait
+                time.sleep(wait)
+        except (requests.RequestException, DeadlineExceeded) as e:
+            # A deadline that expired before anything was sent is not a request.
+            if self.hooks and (resp is not None or not isinstance(e, DeadlineExceeded)):
+                self._emit(RequestEvent(method, path, endpoint_template(path), 0, 0,
+                                        time.perf_counter() - start, retries, throttle_wait, repr(e)))
+            left = remaining()
+            if isinstance(e, requests.Timeout) and left is not None and left <= 0:
+                raise DeadlineExceeded(f"{method} {path}: deadline exceeded") from e
+            raise
+        if self.hooks:
+            self._emit(RequestEvent(method, path, endpoint_template(path), resp.status_code, len(resp.content),
+                                    time.perf_counter() - start, retries, throttle_wait))
+        return resp
+
     def _request_token(self) -> str:
-        url = f"{self.base_url}/dna/system/api/v1/auth/token"
-        resp = requests.post(
-            url,
-            auth=(self.username, self.password),
-            verify=self.verify,
-            timeout=self.timeout,
-            proxies=self.proxies,
-        )
+        # Retries auth with exponential back-off; the last error is raised as-is.
+        attempt = 0
+        while True:
+            try:
+                return self._fetch_token()
+            except DeadlineExceeded:
+                raise
+            except Exception:
+                attempt += 1
+                if attempt >= TOKEN_ATTEMPTS:
+                    raise
+                time.sleep(min(max(2.0 ** (attempt - 1), TOKEN_BACKOFF[0]), TOKEN_BACKOFF[1]))
+
+    def _fetch_token(self) -> str:
+        resp = self._send("POST", "/dna/system/api/v1/auth/token", auth=(self.username, self.password))
         resp.raise_for_status()
         token = resp.json().get("Token")
         if not token:
@@ -58,28 +163,44 @@ class DNACClient:
         return {"X-Auth-Token": token, "Content-Type": "application/json"}
 
     def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
-        resp = requests.get(
-            url, headers=self._headers(), params=params, verify=self.verify,
-            timeout=self.timeout, proxies=self.proxies
-        )
+        if self.inflight is None:
+            return self._get(path, params)
+        key = (path, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        return self.inflight.do(key, lambda: self._get(path, params))
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        ttl = self.cache.ttl_for(path) if self.cache is not None else 0
+        if not ttl:
+            resp = self._send("GET", path, headers=self._headers(), params=params)
+            resp.raise_for_status()
+            return self.decode(resp.content)
+        return self._cached_get(path, params, ttl)
+
+    def _cached_get(self, path: str, params: Optional[Dict[str, Any]], ttl: float) -> Dict[str, Any]:
+        key = self.cache.key(self.base_url, path, params)
+        entry, fresh = self.cache.lookup(key)
+        if fresh:
+            return self.decode(entry.body)
+
+        headers = self._headers()
+        if entry is not None:
+            headers.update(entry.validators())
+        resp = self._send("GET", path, headers=headers, params=params)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            return self.decode(entry.body)
         resp.raise_for_status()
-        return resp.json()
+        self.cache.put(key, resp.content, ttl, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return self.decode(resp.content)
 
     def post(self, path: str, json_body: Dict[str, Any]) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
-        resp = requests.post(
-            url, headers=self._headers(), json=json_body, verify=self.verify,
-            timeout=self.timeout, proxies=self.proxies
-        )
+        resp = self._send("POST", path, headers=self._headers(), json=json_body)
         resp.raise_for_status()
-        return resp.json()
+        return self.decode(resp.content)
 
-    def paginate(self, path: str, params: Optional[Dict[str, Any]] = None, key: str = "response") -> List[Dict[str, Any]]:
-        # Handle DNA Center style pagination (offset/limit) when possible.
+    def iter_pages(self, path: str, params: Optional[Dict[str, Any]] = None, key: str = "response") -> Iterator[List[Dict[str, Any]]]:
+        # Handle DNA Center style pagination (offset/limit) when possible, yielding one page at a time.
         params = dict(params or {})
-        items: List[Dict[str, Any]] = []
-
         offset = 1
         limit = params.pop("limit", 500)
 
@@ -90,8 +211,16 @@ class DNACClient:
             page_items = data.get(key) or data.get("result") or []
             if not page_items:
                 break
-            items.extend(page_items)
+            yield page_items
             if len(page_items) < limit:
                 break
             offset += limit
-        return items
\ No newline at end of file
+
+    def paginate(self, path: str, params: Optional[Dict[str, Any]] = None, key: str = "response", fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        # fields=("hostname", "managementIpAddress", ...) keeps only those keys, page by page, as
+        # __slots__ records (see src/decoding.py) so large inventories never hold full dicts; field names that
+        # can't be slots ("items", "config-id") come back as small dicts instead.
+        items: List[Dict[str, Any]] = []
+        for page_items in self.iter_pages(path, params, key):
+            items.extend(decoding.project(page_items, fields) if fields else page_items)
+        return items
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:  # offline diffing shouldn't pay for the HTTP client's imports
+    from .dnac_client import DNACClient
+
+# Running-config snapshot + diff, as done by python_code/CONFIG_DRIFT_COMPLIANCE/config_drift_process.py.
+# Layout: <outdir>/<deviceId>/<stamp>.cfg and <stamp>.diff (against the previous snapshot).
+# Pass history=ConfigHistory(...) (src/config_history.py) to also record each snapshot for point-in-time lookups,
+# and index=ConfigIndex(...) (src/config_search.py) to keep the fleet search index current.
+# Diffs go through DiffCache: a fleet-wide change (e.g. a new AAA partial) is diffed once, and every device with
+# the same change gets the same change id, which cluster_drift() groups on for the drift report.
+
+def extract_config(obj: Any) -> str:
+    # The config endpoint answers {"response": "<text>"} or {"response": [{"runningConfig": ...}]}.
+    if isinstance(obj, dict) and "response" in obj:
+        resp = obj["response"]
+        if isinstance(resp, str):
+            return resp
+        if isinstance(resp, list) and resp and isinstance(resp[0], dict):
+            return resp[0].get("runningConfig") or resp[0].get("config") or ""
+        return json.dumps(obj)
+    return obj if isinstance(obj, str) else json.dumps(obj)
+
+def fetch_running_config(client: DNACClient, device_id: str) -> str:
+    return extract_config(client.get(f"/dna/intent/api/v1/network-device/{device_id}/config"))
+
+def diff_configs(old: str, new: str) -> str:
+    return "".join(difflib.unified_diff(
+        old.splitlines(keepends=True),
+        new.splitlines(keepends=True),
+        fromfile="previous", tofile="current"
+    ))
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
+_CONTEXT = 3  # difflib.unified_diff's default n
+
+
+class DiffCache:
+    # Unified diffs memoized by content hash. Lines common to the start and end of both configs are trimmed
+    # (keeping the diff context), and the key is the (old sha256, new sha256) of what remains, so devices that
+    # differ only outside the changed region (hostname, addresses) share one entry. Hunk line numbers are
+    # shifted back per device when the diff is rendered.
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._diffs: "OrderedDict[Tuple[str, str], List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def diff(self, old: str, new: str) -> str:
+        return self.change(old, new)[1]
+
+    def change(self, old: str, new: str) -> Tuple[str, str]:
+        # (change id, unified diff); ("", "") when the configs are identical.
+        if old == new:
+            return "", ""
+        a, b = old.splitlines(keepends=True), new.splitlines(keepends=True)
+        head = 0
+        limit = min(len(a), len(b))
+        while head < limit and a[head] == b[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and a[-1 - tail] == b[-1 - tail]:
+            tail += 1
+        lo = max(head - _CONTEXT, 0)
+        cut = max(tail - _CONTEXT, 0)
+        a, b = a[lo:len(a) - cut], b[lo:len(b) - cut]
+        key = (hashlib.sha256("".join(a).encode("utf-8")).hexdigest(),
+               hashlib.sha256("".join(b).encode("utf-8")).hexdigest())
+        with self._lock:
+            body = self._diffs.get(key)
+            if body is not None:
+                self._diffs.move_to_end(key)
+                self.hits += 1
+        if body is None:
+            body = list(difflib.unified_diff(a, b, fromfile="previous", tofile="current"))
+            with self._lock:
+                self.misses += 1
+                self._diffs[key] = body
+                while len(self._diffs) > self.maxsize:
+                    self._diffs.popitem(last=False)
+        change = hashlib.sha256(("%s:%s" % key).encode("ascii")).hexdigest()[:12] if body else ""
+        return change, "".join(_shift(line, lo) for line in body)
+
+
+def _shift(line: str, offset: int) -> str:
+    if not offset or not line.startswith("@@"):
+        return line
+    m = _HUNK_RE.match(line)
+    return (f"@@ -{int(m.group(1)) + offset}{m.group(2) or ''} +{int(m.group(3)) + offset}{m.group(4) or ''} @@"
+            + line[m.end():])
+
+
+DIFF_CACHE = DiffCache()
+
+
+def save_snapshot(device_id: str, cfg: str, outdir: str = "baselines", stamp: Optional[str] = None,
+                  history: Any = None, index: Any = None, diffs: Optional[DiffCache] = None) -> Dict[str, Any]:
+    # Write <stamp>.cfg, diff against the previous snapshot and report BASELINED/NO_CHANGE/DRIFT.
+    stamp = stamp or time.strftime("%Y%m%d_%H%M%S")
+    if history is not None:
+        history.add(device_id, cfg, stamp)
+    if index is not None:
+        index.index_snapshot(device_id, cfg, stamp)
+    dev_dir = os.path.join(outdir, device_id)
+    os.makedirs(dev_dir, exist_ok=True)
+    cur_path = os.path.join(dev_dir, f"{stamp}.cfg")
+    with open(cur_path, "w", encoding="utf-8") as f:
+        f.write(cfg)
+
+    snaps = sorted(p for p in os.listdir(dev_dir) if p.endswith(".cfg"))
+    result = {"deviceId": device_id, "snapshot": cur_path, "status": "BASELINED"}
+    if len(snaps) >= 2:
+        with open(os.path.join(dev_dir, snaps[-2]), "r", encoding="utf-8") as f:
+            old = f.read()
+        change, diff_txt = (diffs or DIFF_CACHE).change(old, cfg)
+        diff_path = os.path.join(dev_dir, f"{stamp}.diff")
+        with open(diff_path, "w", encoding="utf-8") as f:
+            f.write(diff_txt)
+        if diff_txt.strip():
+            result.update(status="DRIFT", change=change, diff=diff_path)
+        else:
+            result["status"] = "NO_CHANGE"
+    return result
+
+def snapshot_device(client: DNACClient, device_id: str, outdir: str = "baselines", stamp: Optional[str] = None,
+                    history: Any = None, index: Any = None, diffs: Optional[DiffCache] = None) -> Dict[str, Any]:
+    return save_snapshot(device_id, fetch_running_config(client, device_id), outdir, stamp, history, index, diffs)
+
+def cluster_drift(results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Group DRIFT results by change id, largest cluster first: [{"change", "devices", "diff"}], where "diff"
+    # is the diff file of the cluster's first device (the others differ at most in hunk line numbers).
+    clusters: Dict[str, Dict[str, Any]] = {}
+    for r in results:
+        if r.get("status") == "DRIFT":
+            c = clusters.setdefault(r["change"], {"change": r["change"], "devices": [], "diff": r["diff"]})
+            c["devices"].append(r["deviceId"])
+    for c in clusters.values():
+        c["devices"].sort()
+    return sorted(clusters.values(), key=lambda c: (-len(c["devices"]), c["change"]))
+
+def write_drift_report(path: str, clusters: List[Dict[str, Any]]) -> None:
+    # One section per distinct change: the devices that have it, then its diff once.
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# {sum(len(c['devices']) for c in clusters)} drifted devices, {len(clusters)} distinct change(s)\n")
+        for c in clusters:
+            f.write(f"\n## change {c['change']}: {len(c['devices'])} device(s)\n")
+            f.writelines(f"{dev}\n" for dev in c["devices"])
+            f.write("\n")
+            with open(c["diff"], "r", encoding="utf-8") as d:
+                f.write(d.read())
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Optional, Set, TypeVar
+
+if TYPE_CHECKING:
+    from .instrumentation import RequestMetrics
+
+# Hedged GETs: when an idempotent GET has not answered by its endpoint's observed p95, a duplicate is sent
+# and whichever answers first wins, so one slow config or task-detail read stops dominating a run.
+# The p95 comes from the run's RequestMetrics; endpoints with fewer than min_samples requests are never
+# hedged. Every hedge spends a token from a RetryBudget shared by the whole run, which refills as a
+# fraction of requests sent, so hedging can add at most ~ratio extra load even when everything is slow.
+#
+#   metrics = RequestMetrics()
+#   hedger = Hedger(metrics, RetryBudget(ratio=0.05))
+#   client = DNACClient(url, user, pw, hooks=[metrics], hedger=hedger)    # hedges GETs only
+#   print(hedger.hedged, hedger.won, hedger.denied, hedger.inline)
+#
+# The losing request is not cancelled (requests can't abort a read); it finishes, or times out, in the
+# background and is still reported to the client's hooks.
+
+T = TypeVar("T")
+
+
+class RetryBudget:
+    # Token bucket: each request deposits `ratio` of a token, each hedge withdraws a whole one. Starts
+    # full at `burst` tokens so a run can hedge before it has sent much, and never holds more.
+
+    def __init__(self, ratio: float = 0.05, burst: float = 10.0) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.tokens + self.ratio, self.burst)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class Hedger:
+    # Every attempt reserves a pool thread before it is submitted, so no attempt ever waits in the pool's
+    # queue behind other calls. Size the pool from the number of concurrent callers (the CLI uses
+    # 4 x --workers): one thread per primary, the rest for hedges and for losers still stuck in a stall.
+    # With no thread free, a primary runs on the caller's own thread, unhedged, and a hedge is skipped. The
+    # primary can't always run on the caller's thread: a caller blocked in its own attempt could not return
+    # the hedge's earlier answer.
+
+    def __init__(self, metrics: RequestMetrics, budget: Optional[RetryBudget] = None, percentile: float = 95,
+                 min_samples: int = 20, min_delay_s: float = 0.05, max_workers: int = 32) -> None:
+        self.metrics = metrics
+        self.budget = budget or RetryBudget()
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay_s = min_delay_s
+        self.max_workers = max(int(max_workers), 1)
+        self.hedged = 0   # duplicates sent
+        self.won = 0      # ...that answered first
+        self.denied = 0   # hedges skipped: no budget, or no free pool thread
+        self.inline = 0   # hedgeable calls run unhedged on the caller's thread: no free pool thread
+        self._busy = 0    # pool threads reserved by attempts in flight
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+    def delay_for(self, method: str, endpoint: str) -> Optional[float]:
+        # How long to wait before hedging; None while the endpoint has too few samples.
+        p = self.metrics.percentile(method, endpoint, self.percentile, self.min_samples)
+        return None if p is None else max(p, self.min_delay_s)
+
+    def call(self, method: str, endpoint: str, attempt: Callable[[], T]) -> T:
+        # attempt() once, plus once more if it is still running after the endpoint's p95 and the budget
+        # allows; the first attempt to return wins. When both fail, the first error is raised.
+        self.budget.deposit()
+        delay = self.delay_for(method, endpoint)
+        if delay is None:
+            return attempt()
+        if not self._reserve():
+            with self._lock:
+                self.inline += 1
+            return attempt()
+        primary = self._submit(attempt)
+        if wait([primary], timeout=delay).done:
+            return primary.result()
+        if not self._reserve():
+            with self._lock:
+                self.denied += 1
+            return primary.result()
+        if not self.budget.withdraw():
+            with self._lock:
+                self.denied += 1
+                self._busy -= 1
+            return primary.result()
+        hedge = self._submit(attempt)
+        with self._lock:
+            self.hedged += 1
+        pending: Set[Future] = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    if fut is hedge:
+                        with self._lock:
+                            self.won += 1
+                    return fut.result()
+                error = error or fut.exception()
+        raise error
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return False
+            self._busy += 1
+            return True
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._busy -= 1
+
+    def _submit(self, attempt: Callable[[], T]) -> Future:
+        # Runs on a thread reserved by _reserve(), given back when the attempt ends (a race's loser keeps
+        # its thread until then). Each attempt runs in a copy of the caller's context, so its deadline
+        # (src/deadline.py) applies.
+        fut = self._pool.submit(contextvars.copy_context().run, attempt)
+        fut.add_done_callback(self._release)
+        return fut
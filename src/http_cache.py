@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+from .instrumentation import endpoint_template
+
+# Opt-in response cache for read-mostly GET endpoints.
+#   client = DNACClient(..., cache=ResponseCache(path=".cache/http.json"))
+# - TTL per endpoint template ("*" suffix = prefix match); endpoints without a TTL are never cached.
+# - LRU eviction once the stored bodies exceed max_bytes.
+# - Stale entries are revalidated with If-None-Match / If-Modified-Since when the cluster sent
+#   ETag / Last-Modified; a 304 refreshes the entry without re-downloading the body.
+
+DEFAULT_TTLS: Dict[str, int] = {
+    "/dna/intent/api/v1/sites": 3600,
+    "/dna/intent/api/v1/site": 3600,
+    "/dna/intent/api/v1/images": 3600,
+    "/dna/intent/api/v1/template-programmer/project": 600,
+    "/dna/intent/api/v1/template-programmer/project/{id}": 600,
+    "/dna/intent/api/v1/template-programmer/template": 600,
+    "/dna/intent/api/v1/network-device": 300,
+}
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "last_modified", "stored_at", "ttl")
+
+    def __init__(self, body: bytes, etag: Optional[str], last_modified: Optional[str],
+                 stored_at: float, ttl: float) -> None:
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    def fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, int]] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: Optional[str] = None,
+    ) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.path = path
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def key(base_url: str, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return f"{base_url}{path}?{query}"
+
+    def ttl_for(self, path: str) -> float:
+        template = endpoint_template(path)
+        ttl = self.ttls.get(template)
+        if ttl is not None:
+            return ttl
+        for pattern, value in self.ttls.items():
+            if pattern.endswith("*") and template.startswith(pattern[:-1]):
+                return value
+        return 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def lookup(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        # (entry, fresh) for a GET about to be served; the hit/miss is counted under the lock, since
+        # one cache is shared by every thread using the client.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            fresh = entry is not None and entry.fresh()
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry, fresh
+
+    def put(self, key: str, body: bytes, ttl: float, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old.body)
+            self._entries[key] = CacheEntry(body, etag, last_modified, time.time(), ttl)
+            self.size += len(body)
+            while self.size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def touch(self, key: str) -> None:
+        # Revalidated by a 304: restart the entry's TTL.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.time()
+                self.revalidated += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            data = {
+                k: {"body": e.body.decode("utf-8"), "etag": e.etag, "last_modified": e.last_modified,
+                    "stored_at": e.stored_at, "ttl": e.ttl}
+                for k, e in self._entries.items()
+            }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def load(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            for k, e in data.items():
+                body = e["body"].encode("utf-8")
+                self._entries[k] = CacheEntry(body, e.get("etag"), e.get("last_modified"), e["stored_at"], e["ttl"])
+                self.size += len(body)
+        # Honor max_bytes in case it shrank since the file was written
+        while self.size > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.body)
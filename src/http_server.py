@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+# Minimal HTTP/1.1 plumbing shared by the embedded asyncio servers (src/mock_dnac.py, src/webhooks.py):
+# read one request at a time off a keep-alive connection, hand it to a handler, write its response.
+#
+#   async def respond(method, target, headers, body):
+#       return 200, {"Content-Type": "application/json"}, b"{}"
+#   server = await asyncio.start_server(lambda r, w: serve_connection(r, w, respond), host, port)
+#
+# Header names are lowercased; bodies are read by Content-Length only (no chunked requests).
+
+Request = Tuple[str, str, Dict[str, str], bytes]
+Handler = Callable[[str, str, Dict[str, str], bytes], Awaitable[Tuple[int, Dict[str, str], bytes]]]
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    # (method, target, headers, body), or None once the client has closed the connection.
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers: Dict[str, str] = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+    length = int(headers.get("content-length") or 0)
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def response_bytes(status: int, headers: Dict[str, str], body: bytes, keep_alive: bool = True) -> bytes:
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = "OK"
+    head = [f"HTTP/1.1 {status} {reason}", f"Content-Length: {len(body)}"]
+    head += [f"{k}: {v}" for k, v in headers.items()]
+    if not keep_alive:
+        head.append("Connection: close")
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+
+async def serve_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, respond: Handler) -> None:
+    # Serve requests until the client closes the connection or asks for Connection: close.
+    try:
+        while True:
+            request = await read_request(reader)
+            if request is None:
+                break
+            status, headers, body = await respond(*request)
+            keep_alive = request[2].get("connection", "").lower() != "close"
+            writer.write(response_bytes(status, headers, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
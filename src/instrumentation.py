@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Request instrumentation for DNACClient.
+# The client calls every registered hook with a RequestEvent after each request; RequestMetrics is
+# the built-in hook (per-endpoint counters + latency histograms, tabulate summary, Prometheus export).
+#
+#   metrics = RequestMetrics()
+#   client.add_hook(metrics)
+#   ...
+#   print(metrics.summary_table())
+#   metrics.write_prometheus("out/metrics.prom")   # or metrics.serve_prometheus(9464)
+
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{16,}|\d+)$")
+
+# Upper bounds (seconds) for exported Prometheus buckets
+PROM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def endpoint_template(path: str) -> str:
+    # /dna/intent/api/v1/task/3f2a...  ->  /dna/intent/api/v1/task/{id}
+    return "/".join("{id}" if _ID_SEGMENT.match(seg) else seg for seg in path.split("?", 1)[0].split("/"))
+
+
+@dataclass
+class RequestEvent:
+    method: str
+    path: str
+    endpoint: str
+    status: int               # 0 when no response was received
+    bytes: int
+    latency_s: float          # wall time including throttle waits
+    retries: int = 0          # re-sends after 429
+    throttle_wait_s: float = 0.0
+    error: Optional[str] = None
+
+
+class LatencyHistogram:
+    # HDR-style log-linear histogram over integer microseconds: values keep their top
+    # `precision_bits` significant bits, so every bucket has <1% relative error at the default 8 bits,
+    # while the bucket count stays logarithmic in the range.
+
+    def __init__(self, precision_bits: int = 8) -> None:
+        self.precision_bits = precision_bits
+        self.counts: Counter = Counter()
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def _bucket(self, us: int) -> Tuple[int, int]:
+        shift = max(us.bit_length() - self.precision_bits, 0)
+        low = (us >> shift) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        us = max(int(seconds * 1_000_000), 0)
+        self.counts[self._bucket(us)[0]] += 1
+        self.count += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(p / 100.0 * self.count)))
+        seen = 0
+        for low in sorted(self.counts):
+            seen += self.counts[low]
+            if seen >= rank:
+                return min(self._bucket(low)[1] / 1_000_000, self.max_s)
+        return self.max_s
+
+    def count_le(self, seconds: float) -> int:
+        limit = seconds * 1_000_000
+        return sum(n for low, n in self.counts.items() if self._bucket(low)[1] <= limit)
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
+
+
+class _EndpointStats:
+    def __init__(self) -> None:
+        self.statuses: Counter = Counter()
+        self.errors = 0
+        self.bytes = 0
+        self.retries = 0
+        self.throttle_wait_s = 0.0
+        self.latency = LatencyHistogram()
+
+
+class RequestMetrics:
+    # Thread-safe aggregation of RequestEvents keyed by (method, endpoint template).
+
+    def __init__(self, namespace: str = "catalyst") -> None:
+        self.namespace = namespace
+        self.stats: Dict[Tuple[str, str], _EndpointStats] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            st = self.stats.get((event.method, event.endpoint))
+            if st is None:
+                st = self.stats[(event.method, event.endpoint)] = _EndpointStats()
+            st.statuses[event.status] += 1
+            if event.error or event.status >= 400 or event.status == 0:
+                st.errors += 1
+            st.bytes += event.bytes
+            st.retries += event.retries
+            st.throttle_wait_s += event.throttle_wait_s
+            st.latency.record(event.latency_s)
+
+    def percentile(self, method: str, endpoint: str, p: float, min_count: int = 1) -> Optional[float]:
+        # Latency percentile (seconds) of one endpoint; None until it has min_count samples.
+        with self._lock:
+            st = self.stats.get((method, endpoint))
+            if st is None or st.latency.count < min_count:
+                return None
+            return st.latency.percentile(p)
+
+    def summary_rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda kv: kv[1].latency.total_s, reverse=True)
+            return [
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": st.latency.count,
+                    "errors": st.errors,
+                    "total_s": round(st.latency.total_s, 3),
+                    "p50_ms": round(st.latency.percentile(50) * 1000, 1),
+                    "p95_ms": round(st.latency.percentile(95) * 1000, 1),
+                    "p99_ms": round(st.latency.percentile(99) * 1000, 1),
+                    "max_ms": round(st.latency.max_s * 1000, 1),
+                    "kbytes": round(st.bytes / 1024, 1),
+                    "retries": st.retries,
+                    "throttle_s": round(st.throttle_wait_s, 2),
+                }
+                for (method, endpoint), st in items
+            ]
+
+    def summary_table(self, tablefmt: str = "simple") -> str:
+        from tabulate import tabulate
+        return tabulate(self.summary_rows(), headers="keys", tablefmt=tablefmt)
+
+    def to_prometheus(self, openmetrics: bool = False) -> str:
+        ns = self.namespace
+
+        def family(total_name: str) -> str:
+            # OpenMetrics names the counter family without the _total sample suffix
+            return total_name[: -len("_total")] if openmetrics else total_name
+
+        out = [
+            f"# HELP {family(ns + '_http_requests_total')} Catalyst Center API requests by endpoint and status.",
+            f"# TYPE {family(ns + '_http_requests_total')} counter",
+        ]
+        with self._lock:
+            items = sorted(self.stats.items())
+            for (method, endpoint), st in items:
+                for status, n in sorted(st.statuses.items()):
+                    out.append(f'{ns}_http_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {n}')
+
+            name = f"{ns}_http_request_duration_seconds"
+            out += [f"# HELP {name} Request latency including throttle waits.", f"# TYPE {name} histogram"]
+            for (method, endpoint), st in items:
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                for le in PROM_BUCKETS:
+                    out.append(f'{name}_bucket{{{labels},le="{le}"}} {st.latency.count_le(le)}')
+                out.append(f'{name}_bucket{{{labels},le="+Inf"}} {st.latency.count}')
+                out.append(f"{name}_sum{{{labels}}} {st.latency.total_s:.6f}")
+                out.append(f"{name}_count{{{labels}}} {st.latency.count}")
+
+            for metric, attr, help_text in (
+                ("response_bytes", "bytes", "Response body bytes."),
+                ("retries", "retries", "Requests re-sent after HTTP 429."),
+                ("throttle_wait_seconds", "throttle_wait_s", "Time spent waiting on Retry-After."),
+            ):
+                name = f"{ns}_http_{metric}_total"
+                out += [f"# HELP {family(name)} {help_text}", f"# TYPE {family(name)} counter"]
+                for (method, endpoint), st in items:
+                    out.append(f'{name}{{method="{method}",endpoint="{endpoint}"}} {getattr(st, attr)}')
+        if openmetrics:
+            out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+    def write_prometheus(self, path: str, openmetrics: bool = False) -> None:
+        # Text-file collector format (node_exporter --collector.textfile) or OpenMetrics.
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(openmetrics))
+        os.replace(tmp, path)
+
+    def serve_prometheus(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        # Expose /metrics on a local port from a daemon thread for the lifetime of the run.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                openmetrics = "application/openmetrics-text" in (self.headers.get("Accept") or "")
+                body = metrics.to_prometheus(openmetrics).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8"
+                                 if openmetrics else "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+    def stop_server(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server = None
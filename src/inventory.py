@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import csv
+import os
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from .dnac_client import DNACClient
+
+# Column-wise device inventory.
+# Low-cardinality fields (platformId, softwareVersion, siteNameHierarchy, ...) are dictionary-encoded: one array of
+# small integer codes plus a list of distinct values, so 20k devices on 12 platforms store 12 strings.
+# Other fields are plain lists of interned strings. Filters and group-bys work on codes and return
+# views that share the columns; nothing is materialized per row until exported.
+#
+# Device records carry no usable site (locationName is null on real clusters), so the site column starts
+# empty and is filled from the site membership API: assign_sites(device_sites(client)), or filter_site().
+
+SITE_FIELD = "siteNameHierarchy"
+DEFAULT_FIELDS = (
+    "id", "hostname", "managementIpAddress", "serialNumber", "macAddress",
+    "platformId", "softwareVersion", "reachabilityStatus", SITE_FIELD, "family", "role", "series",
+)
+CATEGORICAL = ("platformId", "softwareVersion", "reachabilityStatus", SITE_FIELD, "family", "role", "series")
+
+Match = Union[None, str, Iterable[str]]
+
+
+class _DictColumn:
+    __slots__ = ("codes", "values", "index")
+
+    def __init__(self) -> None:
+        self.codes = array("I")
+        self.values: List[Any] = []
+        self.index: Dict[Any, int] = {}
+
+    def _code(self, value: Any) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(sys.intern(value) if isinstance(value, str) else value)
+        return code
+
+    def append(self, value: Any) -> None:
+        self.codes.append(self._code(value))
+
+    def get(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+    def set(self, row: int, value: Any) -> None:
+        self.codes[row] = self._code(value)
+
+
+class _StrColumn:
+    __slots__ = ("values",)
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+
+    def append(self, value: Any) -> None:
+        self.values.append(sys.intern(value) if isinstance(value, str) else value)
+
+    def get(self, row: int) -> Any:
+        return self.values[row]
+
+    def set(self, row: int, value: Any) -> None:
+        self.values[row] = sys.intern(value) if isinstance(value, str) else value
+
+
+def _under(value: Any, prefixes: Set[str]) -> bool:
+    # Hierarchy match by whole segments: "Global/US/Orlando" is under "Global/US", not under "Global/US/Orl".
+    return isinstance(value, str) and any(value == p or value.startswith(p + "/") for p in prefixes)
+
+
+class Inventory:
+
+    def __init__(self, fields: Sequence[str] = DEFAULT_FIELDS, categorical: Sequence[str] = CATEGORICAL) -> None:
+        self.fields = tuple(fields)
+        self._cols: Dict[str, Union[_DictColumn, _StrColumn]] = {
+            f: (_DictColumn() if f in categorical else _StrColumn()) for f in self.fields
+        }
+        self._size = 0
+        self._rows: Optional[array] = None  # None = every row; otherwise a view over these row ids
+
+    # ---- building ----
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any], fields: Sequence[str] = DEFAULT_FIELDS,
+                     categorical: Sequence[str] = CATEGORICAL) -> "Inventory":
+        inv = cls(fields, categorical)
+        inv.extend(records)
+        return inv
+
+    @classmethod
+    def fetch(cls, client: DNACClient, params: Optional[Dict[str, Any]] = None,
+              fields: Sequence[str] = DEFAULT_FIELDS) -> "Inventory":
+        # Page-at-a-time: each page of full device dicts is dropped once its fields are copied in.
+        inv = cls(fields)
+        for page in client.iter_pages("/dna/intent/api/v1/network-device", params):
+            inv.extend(page)
+        return inv
+
+    def extend(self, records: Iterable[Any]) -> None:
+        if self._rows is not None:
+            raise ValueError("Cannot extend a filtered view")
+        cols = [(f, self._cols[f]) for f in self.fields]
+        for rec in records:
+            for f, col in cols:
+                col.append(rec.get(f))
+            self._size += 1
+
+    def assign_sites(self, sites: Dict[str, str]) -> int:
+        # Set the site column from a deviceId -> nameHierarchy map (site_index.device_sites()); devices
+        # not in the map keep their current value. Columns are shared, so views see it too. Returns rows set.
+        if SITE_FIELD not in self._cols:
+            raise ValueError(f"Inventory has no {SITE_FIELD} column")
+        ids, col, n = self._cols["id"], self._cols[SITE_FIELD], 0
+        for r in range(self._size):
+            site = sites.get(ids.get(r))
+            if site is not None:
+                col.set(r, site)
+                n += 1
+        return n
+
+    # ---- access ----
+
+    def __len__(self) -> int:
+        return self._size if self._rows is None else len(self._rows)
+
+    def row_ids(self) -> Iterable[int]:
+        return range(self._size) if self._rows is None else self._rows
+
+    def column(self, field: str) -> List[Any]:
+        col = self._cols[field]
+        if isinstance(col, _DictColumn):
+            values = col.values
+            return [values[c] for c in self._codes(col)]
+        if self._rows is None:
+            return list(col.values)
+        return [col.values[r] for r in self._rows]
+
+    def _codes(self, col: _DictColumn) -> Iterable[int]:
+        return col.codes if self._rows is None else (col.codes[r] for r in self._rows)
+
+    def rows(self, fields: Optional[Sequence[str]] = None) -> Iterator[Tuple[Any, ...]]:
+        return zip(*(self.column(f) for f in (fields or self.fields)))
+
+    def to_dicts(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        fields = tuple(fields or self.fields)
+        return [dict(zip(fields, r)) for r in self.rows(fields)]
+
+    def _view(self, rows: Iterable[int]) -> "Inventory":
+        view = Inventory.__new__(Inventory)
+        view.fields, view._cols, view._size = self.fields, self._cols, self._size
+        view._rows = array("I", rows)
+        return view
+
+    # ---- filters / group-bys ----
+
+    def _match_rows(self, field: str, wanted: Match, prefix: bool = False) -> List[int]:
+        col = self._cols[field]
+        if isinstance(wanted, str) or wanted is None:
+            wanted = (wanted,)
+        wanted = set(wanted)
+        if prefix:
+            if None in wanted:
+                raise ValueError(f"{field}: None is not a hierarchy prefix")
+            wanted = {w.rstrip("/") for w in wanted}
+        if isinstance(col, _DictColumn):
+            # Resolve the predicate once per distinct value, then compare integer codes.
+            if prefix:
+                codes = {i for i, v in enumerate(col.values) if _under(v, wanted)}
+            else:
+                codes = {col.index[w] for w in wanted if w in col.index}
+            src = col.codes
+            return [r for r in self.row_ids() if src[r] in codes]
+        values = col.values
+        if prefix:
+            return [r for r in self.row_ids() if _under(values[r], wanted)]
+        return [r for r in self.row_ids() if values[r] in wanted]
+
+    def filter(self, platform: Match = None, version: Match = None, site: Match = None,
+               reachable: Optional[bool] = None, **equals: Match) -> "Inventory":
+        # platform/version: exact values (str or list); site: hierarchy prefix ("Global/US/Orlando") against
+        # the site column, which is empty until assign_sites();
+        # reachable: True/False against reachabilityStatus == "Reachable"; other kwargs: field=value(s).
+        view = self
+        if platform is not None:
+            view = view._view(view._match_rows("platformId", platform))
+        if version is not None:
+            view = view._view(view._match_rows("softwareVersion", version))
+        if site is not None:
+            view = view._view(view._match_rows(SITE_FIELD, site, prefix=True))
+        if reachable is not None:
+            hit = set(view._match_rows("reachabilityStatus", "Reachable"))
+            view = view._view(r for r in view.row_ids() if (r in hit) == reachable)
+        for field, wanted in equals.items():
+            view = view._view(view._match_rows(field, wanted))
+        return view
+
+    def filter_site(self, client: DNACClient, site: str, workers: int = 8) -> "Inventory":
+        # Devices at or under a site (nameHierarchy or siteId). The site is resolved through the shared site
+        # index (src/site_index.py), so an unknown one raises KeyError, and the membership of every site
+        # below it is loaded into the site column before filtering.
+        from .site_index import device_sites, site_hierarchy
+        hierarchy = site_hierarchy(client, site)
+        self.assign_sites(device_sites(client, hierarchy, workers=workers))
+        return self.filter(site=hierarchy)
+
+    def counts(self, field: str) -> Counter:
+        col = self._cols[field]
+        if isinstance(col, _DictColumn):
+            by_code = Counter(self._codes(col))
+            return Counter({col.values[c]: n for c, n in by_code.items()})
+        return Counter(self.column(field))
+
+    def group_by(self, field: str) -> Dict[Any, "Inventory"]:
+        col = self._cols[field]
+        groups: Dict[Any, List[int]] = {}
+        for r in self.row_ids():
+            groups.setdefault(col.get(r), []).append(r)
+        return {k: self._view(v) for k, v in groups.items()}
+
+    # ---- export ----
+
+    def to_csv(self, path: str, fields: Optional[Sequence[str]] = None,
+               header: Optional[Sequence[str]] = None) -> int:
+        fields = tuple(fields or self.fields)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(header or fields)
+            w.writerows(tuple("" if v is None else v for v in row) for row in self.rows(fields))
+        return len(self)
+
+    def to_arrow(self, fields: Optional[Sequence[str]] = None):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise RuntimeError("Parquet/Arrow export needs pyarrow (pip install pyarrow)") from e
+        arrays, names = [], []
+        for f in fields or self.fields:
+            col = self._cols[f]
+            if isinstance(col, _DictColumn):
+                codes = pa.array(list(self._codes(col)), type=pa.uint32())
+                arrays.append(pa.DictionaryArray.from_arrays(codes, pa.array(col.values, type=pa.string())))
+            else:
+                arrays.append(pa.array(self.column(f), type=pa.string()))
+            names.append(f)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def to_parquet(self, path: str, fields: Optional[Sequence[str]] = None) -> int:
+        table = self.to_arrow(fields)  # raises a clear error when pyarrow is missing
+        import pyarrow.parquet as pq
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        pq.write_table(table, path)
+        return len(self)
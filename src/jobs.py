@@ -1,16 +1,41 @@
 import time
-from typing import Optional
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import TYPE_CHECKING, Optional
+from .deadline import DeadlineExceeded, remaining
 from .dnac_client import DNACClient
 
-def wait_for_task(client: DNACClient, task_id: str, timeout_s: int = 300, poll_s: int = 3) -> dict:
+if TYPE_CHECKING:
+    from .webhooks import WebhookListener
+
+def wait_for_task(client: DNACClient, task_id: str, timeout_s: int = 300, poll_s: int = 3,
+                  listener: Optional["WebhookListener"] = None, fallback_poll_s: float = 30) -> dict:
     # Poll the task API until completion or timeout.
-    end = time.time() + timeout_s
-    while time.time() < end:
-        data = client.get(f"/dna/intent/api/v1/task/{task_id}")
-        progress = data.get("response", {})
-        is_error = progress.get("isError")
-        end_time = progress.get("endTime")
-        if end_time or is_error:
-            return progress
-        time.sleep(poll_s)
-    raise TimeoutError(f"Task {task_id} did not complete within {timeout_s}s")
\ No newline at end of file
+    # With a webhook listener (src/webhooks.py) the task is re-read as soon as a notification for it
+    # arrives, and otherwise only every fallback_poll_s in case a notification is lost.
+    # Inside a shorter deadline (src/deadline.py) polling stops there, with DeadlineExceeded.
+    left = remaining()
+    bounded = left is not None and left < timeout_s
+    end = time.time() + (left if bounded else timeout_s)
+    notified = listener.expect(task_id) if listener is not None else None
+    try:
+        while time.time() < end:
+            data = client.get(f"/dna/intent/api/v1/task/{task_id}")
+            progress = data.get("response", {})
+            is_error = progress.get("isError")
+            end_time = progress.get("endTime")
+            if end_time or is_error:
+                return progress
+            if notified is None:
+                time.sleep(max(min(poll_s, end - time.time()), 0))
+                continue
+            try:
+                notified.result(timeout=max(min(fallback_poll_s, end - time.time()), 0))
+            except FutureTimeout:
+                continue
+            notified = listener.expect(task_id)  # the event may precede the final state; wait for the next
+    finally:
+        if notified is not None:
+            listener.forget(task_id, notified)
+    if bounded:
+        raise DeadlineExceeded(f"Task {task_id} did not complete before the deadline")
+    raise TimeoutError(f"Task {task_id} did not complete within {timeout_s}s")
@@ -0,0 +1,552 @@
+#!/usr/bin/env python
+# Offline mock Catalyst Center for load and regression testing.
+#
+# Serves the endpoints our tooling uses (auth, network-device pagination and config, Command Runner
+# read-request/task/file, PnP, sites and site membership, templates, compliance) from a synthetic fleet,
+# over plain HTTP on localhost. Latency (incl. a slow tail), 429 throttling and 5xx failures are injectable
+# via MockConfig.
+#
+#   python -m src.mock_dnac --devices 5000 --port 8080 --latency-ms 20 --throttle-rate 0.01
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .http_server import serve_connection
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEVICE_FIXTURES = (
+    os.path.join(REPO_ROOT, "api", "testing", "devices.json"),
+    os.path.join(REPO_ROOT, "tests", "fixtures", "sample_network_device.json"),
+)
+
+PLATFORMS = ("C9300-48P", "C9300X-48HX", "C9200L-48P-4G", "C9410R", "C9500-48Y4C")
+VERSIONS = ("17.9.4a", "17.12.4", "17.12.5", "17.15.1")
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 0.0          # fixed delay added to every response
+    jitter_ms: float = 0.0           # uniform random extra delay
+    slow_rate: float = 0.0           # probability of a tail-latency response...
+    slow_ms: float = 0.0             # ...delayed this much more
+    throttle_rate: float = 0.0       # probability of answering 429
+    max_rps: float = 0.0             # 429 once this request rate is exceeded (0 = unlimited)
+    retry_after_s: float = 1.0       # Retry-After sent with 429s
+    failure_rate: float = 0.0        # probability of answering 500
+    task_delay_s: float = 0.0        # time before an async task reports completion
+    page_limit: int = 500            # server-side cap on "limit"
+    ports_per_switch: int = 48
+    seed: int = 7
+
+
+def _load_template() -> Dict[str, Any]:
+    for path in DEVICE_FIXTURES:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                items = json.load(f).get("response") or []
+        except (OSError, ValueError):
+            continue
+        if items:
+            return items[0]
+    return {"hostname": "sw"}
+
+
+def synthetic_fleet(count: int, template: Optional[Dict[str, Any]] = None, seed: int = 7) -> List[Dict[str, Any]]:
+    # Clone a real inventory record (api/testing/devices.json) into count unique devices.
+    template = dict(template or _load_template())
+    rnd = random.Random(seed)
+    fleet = []
+    for i in range(count):
+        d = dict(template)
+        dev_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"mock-device-{i}"))
+        d.update({
+            "id": dev_id,
+            "instanceUuid": dev_id,
+            "hostname": f"SW-{i // 100:03d}-{i % 100:02d}.mock.local",
+            "managementIpAddress": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+            "serialNumber": f"FOC{i:08d}",
+            "macAddress": ":".join(f"{(i >> s) & 255:02x}" for s in (40, 32, 24, 16, 8, 0)),
+            "platformId": PLATFORMS[i % len(PLATFORMS)],
+            "softwareVersion": VERSIONS[rnd.randrange(len(VERSIONS))],
+            "reachabilityStatus": "Unreachable" if rnd.random() < 0.02 else "Reachable",
+        })
+        fleet.append(d)
+    return fleet
+
+
+def synthetic_assignments(devices: List[Dict[str, Any]]) -> Dict[str, str]:
+    # deviceId -> site nameHierarchy, served through the membership API. Like a real cluster, the device
+    # records themselves carry no site (locationName stays whatever the template had, normally null).
+    return {d["id"]: f"Global/US/Orlando/Campus/Building{i // 200}/Floor{(i // 50) % 4 + 1}"
+            for i, d in enumerate(devices)}
+
+
+def synthetic_sites(hierarchies: Iterable[str]) -> List[Dict[str, Any]]:
+    names = {"Global"}
+    for h in hierarchies:
+        parts = h.split("/")
+        for n in range(1, len(parts) + 1):
+            names.add("/".join(parts[:n]))
+    sites = []
+    for name in sorted(names):
+        leaf = name.rsplit("/", 1)[-1]
+        site_type = "floor" if leaf.startswith("Floor") else ("building" if leaf.startswith("Building") else "area")
+        sites.append({
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, name)),
+            "name": leaf,
+            "nameHierarchy": name,
+            "type": site_type,
+        })
+    return sites
+
+
+def device_config(device: Dict[str, Any], generation: int = 0) -> str:
+    lines = [
+        "!",
+        f"hostname {device['hostname'].split('.')[0]}",
+        "!",
+        "aaa new-model",
+        "ip domain name mock.local",
+        "no ip http server",
+        "ip http secure-server",
+        "!",
+        "interface Vlan10",
+        " vrf forwarding MGMT",
+        f" ip address {device['managementIpAddress']} 255.255.255.0",
+        "!",
+    ]
+    for port in range(1, 9):
+        lines += [f"interface GigabitEthernet1/0/{port}", " switchport mode access", " switchport access vlan 20", "!"]
+    if generation:
+        lines += [f"! generation {generation}", "logging host 10.0.0.50", "!"]
+    lines.append("end")
+    return "\n".join(lines) + "\n"
+
+
+def _poe_on(device: Dict[str, Any], port: int) -> bool:
+    # crc32 rather than hash() so outputs are stable across processes
+    return zlib.crc32(f"{device['id']}/{port}/poe".encode()) % 3 == 0
+
+
+def _has_lldp(device: Dict[str, Any], port: int) -> bool:
+    return zlib.crc32(f"{device['id']}/{port}/lldp".encode()) % 4 != 0
+
+
+def _has_cdp(device: Dict[str, Any], port: int) -> bool:
+    # Some powered ports without LLDP are Cisco phones that only speak CDP
+    return zlib.crc32(f"{device['id']}/{port}/cdp".encode()) % 2 == 0
+
+
+def _port_mac(device: Dict[str, Any], port: int) -> str:
+    h = "%08x" % zlib.crc32(f"{device['id']}/{port}/mac".encode())
+    return f"00{h[:2]}.{h[2:6]}.{h[6:8]}{port:02x}"
+
+
+def device_interfaces(device: Dict[str, Any], ports: int = 48) -> List[Dict[str, Any]]:
+    # /interface records: the access ports the show-command outputs describe, plus the management SVI.
+    dev_id = device["id"]
+    items = []
+    for p in range(1, ports + 1):
+        admin_up = zlib.crc32(f"{dev_id}/{p}/shut".encode()) % 16 != 0
+        up = admin_up and (_poe_on(device, p) or zlib.crc32(f"{dev_id}/{p}/link".encode()) % 2 == 0)
+        items.append({"id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"{dev_id}/{p}")), "deviceId": dev_id,
+                      "portName": f"GigabitEthernet1/0/{p}", "interfaceType": "Physical", "portMode": "access",
+                      "adminStatus": "UP" if admin_up else "DOWN", "status": "up" if up else "down",
+                      "vlanId": "20", "speed": "1000000" if up else "10000"})
+    items.append({"id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"{dev_id}/vlan10")), "deviceId": dev_id,
+                  "portName": "Vlan10", "interfaceType": "Virtual", "portMode": "routed",
+                  "adminStatus": "UP", "status": "up", "vlanId": "10", "speed": "1000000"})
+    return items
+
+
+def command_output(device: Dict[str, Any], command: str, ports: int = 48) -> str:
+    cmd = " ".join(command.lower().split())
+    if cmd.startswith("show power inline"):
+        rows = [
+            "Interface  Admin  Oper       Power   Device              Class Max",
+            "                             (Watts)",
+            "---------- ------ ---------- ------- ------------------- ----- ----",
+        ]
+        for p in range(1, ports + 1):
+            on = _poe_on(device, p)
+            rows.append(
+                f"Gi1/0/{p:<5}auto   {'on ' if on else 'off'}        {'15.4' if on else '0.0 '}    "
+                f"{'Ieee PD' if on else 'n/a':<20}{'4' if on else 'n/a':<6}30.0"
+            )
+        return "\n".join(rows) + "\n"
+    if cmd.startswith("show lldp neighbors"):
+        rows = [
+            "Capability codes:",
+            "    (R) Router, (B) Bridge, (T) Telephone, (C) DOCSIS Cable Device",
+            "    (W) WLAN Access Point, (P) Repeater, (S) Station, (O) Other",
+            "",
+            "Device ID           Local Intf     Hold-time  Capability      Port ID",
+        ]
+        count = 0
+        for p in range(1, ports + 1):
+            if _poe_on(device, p) and _has_lldp(device, p):
+                rows.append(f"{'AP-' + str(p):<20}Gi1/0/{p:<9}120        W               Gi0")
+                count += 1
+        rows += ["", f"Total entries displayed: {count}"]
+        return "\n".join(rows) + "\n"
+    if cmd.startswith("show cdp neighbors"):
+        rows = [
+            "Capability Codes: R - Router, T - Trans Bridge, B - Source Route Bridge",
+            "                  S - Switch, H - Host, I - IGMP, r - Repeater, P - Phone",
+            "",
+            "Device ID        Local Intrfce     Holdtme    Capability  Platform  Port ID",
+        ]
+        count = 0
+        for p in range(1, ports + 1):
+            if _poe_on(device, p) and not _has_lldp(device, p) and _has_cdp(device, p):
+                rows.append(f"{'SEP' + _port_mac(device, p).replace('.', '').upper():<17}"
+                            f"{'Gig 1/0/' + str(p):<18}{'150':<16}{'H P M':<7}{'IP Phone':<10}Port 1")
+                count += 1
+        rows += ["", f"Total cdp entries displayed : {count}"]
+        return "\n".join(rows) + "\n"
+    if cmd.startswith("show mac address-table"):
+        rows = [
+            "          Mac Address Table",
+            "-------------------------------------------",
+            "",
+            "Vlan    Mac Address       Type        Ports",
+            "----    -----------       --------    -----",
+            " All    0100.0ccc.cccc    STATIC      CPU",
+        ]
+        count = 1
+        for p in range(1, ports + 1):
+            if _poe_on(device, p):
+                rows.append(f"  20    {_port_mac(device, p)}    DYNAMIC     Gi1/0/{p}")
+                count += 1
+        rows.append(f"Total Mac Addresses for this criterion: {count}")
+        return "\n".join(rows) + "\n"
+    if cmd.startswith("show version"):
+        return f"Cisco IOS XE Software, Version {device.get('softwareVersion')}\n{device['hostname']} uptime is 5 days\n"
+    return ""
+
+
+class MockDNAC:
+    # Runs the asyncio server on a private event loop in a daemon thread.
+
+    def __init__(self, devices: Optional[List[Dict[str, Any]]] = None, config: Optional[MockConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or MockConfig()
+        self.devices = devices if devices is not None else synthetic_fleet(200, seed=self.config.seed)
+        self.by_id = {d["id"]: d for d in self.devices}
+        self.assignments = synthetic_assignments(self.devices)
+        self.sites = synthetic_sites(self.assignments.values())
+        self.config_generation: Dict[str, int] = {}
+        self.pnp_devices = [
+            {"id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"pnp-{i}")), "serialNumber": f"FOCPNP{i:05d}",
+             "state": "Unclaimed"}
+            for i in range(20)
+        ]
+        self.projects = [{"id": "proj-1", "name": "Onboarding Configuration",
+                          "templates": [{"id": "tmpl-day0", "name": "day0_switch"},
+                                        {"id": "tmpl-dayn", "name": "dayN_core"}]}]
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Any] = {}
+        self.hits: Counter = Counter()
+        self.host = host
+        self.port = port
+        self.token = uuid.uuid4().hex
+        self._rnd = random.Random(self.config.seed)
+        self._window: List[float] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes: List[Tuple[str, "re.Pattern[str]", Callable[..., Any]]] = [
+            ("POST", re.compile(r"^/dna/system/api/v1/auth/token$"), self._auth),
+            ("GET", re.compile(r"^/dna/intent/api/v1/network-device$"), self._devices),
+            ("GET", re.compile(r"^/dna/intent/api/v1/network-device/count$"), self._device_count),
+            ("GET", re.compile(r"^/dna/intent/api/v1/network-device/(?P<id>[^/]+)/config$"), self._config),
+            ("GET", re.compile(r"^/dna/intent/api/v1/network-device/(?P<id>[^/]+)$"), self._device),
+            ("POST", re.compile(r"^/dna/intent/api/v1/network-device-poller/cli/read-request/?$"), self._read_request),
+            ("GET", re.compile(r"^/dna/intent/api/v1/task/(?P<id>[^/]+)$"), self._task),
+            ("GET", re.compile(r"^/dna/intent/api/v1/tasks/(?P<id>[^/]+)/detail$"), self._task_detail),
+            ("GET", re.compile(r"^/dna/intent/api/v1/file/(?P<id>[^/]+)$"), self._file),
+            ("GET", re.compile(r"^/dna/intent/api/v1/interface$"), self._interfaces),
+            ("GET", re.compile(r"^/dna/intent/api/v1/sites?$"), self._sites),
+            ("GET", re.compile(r"^/dna/intent/api/v1/membership/(?P<id>[^/]+)$"), self._membership),
+            ("GET", re.compile(r"^/dna/intent/api/v1/onboarding/pnp-device$"), self._pnp_devices),
+            ("POST", re.compile(r"^/dna/intent/api/v1/onboarding/pnp-device/site-claim$"), self._task_ack),
+            ("POST", re.compile(r"^/dna/intent/spl/v1/onboarding/pnp-device/site-claim$"), self._task_ack),
+            ("GET", re.compile(r"^/dna/intent/api/v1/template-programmer/project$"), self._projects),
+            ("GET", re.compile(r"^/dna/intent/api/v1/template-programmer/project/(?P<id>[^/]+)$"), self._project),
+            ("POST", re.compile(r"^/dna/intent/api/v1/template-programmer/template/deploy$"), self._task_ack),
+            ("POST", re.compile(r"^/dna/intent/api/v1/compliance/?$"), self._task_ack),
+            ("GET", re.compile(r"^/dna/intent/api/v1/compliance/(?P<id>[^/]+)/detail$"), self._compliance_detail),
+        ]
+
+    # ---- lifecycle ----
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-dnac", daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+            self._thread = None
+
+    def __enter__(self) -> "MockDNAC":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def mutate_configs(self, fraction: float = 0.1) -> List[str]:
+        # Bump the config generation on a share of devices so drift runs see changes.
+        changed = [d["id"] for d in self.devices if self._rnd.random() < fraction]
+        for dev_id in changed:
+            self.config_generation[dev_id] = self.config_generation.get(dev_id, 0) + 1
+        return changed
+
+    # ---- HTTP plumbing ----
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await serve_connection(reader, writer, self._respond)
+
+    async def _respond(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        status, payload, extra = await self._dispatch(method, target, headers, body)
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        if method == "GET" and status == 200:
+            etag = f'"{zlib.crc32(data):08x}"'
+            extra["ETag"] = etag
+            if headers.get("if-none-match") == etag:
+                self.hits["not_modified"] += 1
+                status, data = 304, b""
+        return status, {"Content-Type": "application/json", **extra}, data
+
+    def _throttled(self) -> bool:
+        cfg = self.config
+        if cfg.throttle_rate and self._rnd.random() < cfg.throttle_rate:
+            return True
+        if cfg.max_rps:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= cfg.max_rps:
+                return True
+            self._window.append(now)
+        return False
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        cfg = self.config
+        parts = urlsplit(target)
+        params = dict(parse_qsl(parts.query))
+        delay = cfg.latency_ms + (self._rnd.random() * cfg.jitter_ms if cfg.jitter_ms else 0.0)
+        if cfg.slow_rate and self._rnd.random() < cfg.slow_rate:
+            delay += cfg.slow_ms
+        if delay:
+            await asyncio.sleep(delay / 1000.0)
+
+        for route_method, pattern, handler in self._routes:
+            m = pattern.match(parts.path)
+            if not m or route_method != method:
+                continue
+            name = handler.__name__.lstrip("_")
+            self.hits[name] += 1
+            if self._throttled():
+                self.hits["throttled"] += 1
+                return 429, {"message": "Too many requests"}, {"Retry-After": str(cfg.retry_after_s)}
+            if cfg.failure_rate and self._rnd.random() < cfg.failure_rate:
+                self.hits["failed"] += 1
+                return 500, {"message": "Injected failure"}, {}
+            if name != "auth" and headers.get("x-auth-token") != self.token:
+                return 401, {"message": "Unauthorized"}, {}
+            payload = json.loads(body) if body else None
+            return 200, handler(params=params, body=payload, **m.groupdict()), {}
+        self.hits["not_found"] += 1
+        return 404, {"message": f"No mock route for {method} {parts.path}"}, {}
+
+    def _new_task(self, result: Any = None) -> str:
+        task_id = str(uuid.uuid4())
+        file_id = None
+        if result is not None:
+            file_id = str(uuid.uuid4())
+            self.files[file_id] = result
+        self.tasks[task_id] = {"created": time.time(), "fileId": file_id}
+        return task_id
+
+    def _task_state(self, task_id: str) -> Dict[str, Any]:
+        task = self.tasks.get(task_id)
+        if task is None:
+            return {"id": task_id, "isError": True, "failureReason": "Unknown task"}
+        done = time.time() - task["created"] >= self.config.task_delay_s
+        state: Dict[str, Any] = {"id": task_id, "isError": False, "startTime": int(task["created"] * 1000)}
+        if not done:
+            state["progress"] = "CLI Runner request creation"
+            return state
+        state["endTime"] = int(time.time() * 1000)
+        state["progress"] = json.dumps({"fileId": task["fileId"]}) if task["fileId"] else "Task completed"
+        if task["fileId"]:
+            state["fileId"] = task["fileId"]
+        return state
+
+    # ---- handlers ----
+
+    def _auth(self, **_: Any) -> Dict[str, Any]:
+        return {"Token": self.token}
+
+    def _devices(self, params: Dict[str, str], **_: Any) -> Dict[str, Any]:
+        items = self.devices
+        for key in ("hostname", "managementIpAddress", "platformId", "reachabilityStatus"):
+            if key in params:
+                items = [d for d in items if d.get(key) == params[key]]
+        offset = max(int(params.get("offset", 1)), 1)
+        limit = min(int(params.get("limit", self.config.page_limit)), self.config.page_limit)
+        return {"response": items[offset - 1:offset - 1 + limit], "version": "1.0"}
+
+    def _device_count(self, **_: Any) -> Dict[str, Any]:
+        return {"response": len(self.devices), "version": "1.0"}
+
+    def _device(self, id: str, **_: Any) -> Dict[str, Any]:
+        return {"response": self.by_id.get(id) or {}, "version": "1.0"}
+
+    def _config(self, id: str, **_: Any) -> Dict[str, Any]:
+        device = self.by_id.get(id)
+        if not device:
+            return {"response": ""}
+        return {"response": device_config(device, self.config_generation.get(id, 0)), "version": "1.0"}
+
+    def _read_request(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        result = []
+        for dev_id in body.get("deviceUuids") or []:
+            device = self.by_id.get(dev_id)
+            entry: Dict[str, Any] = {"deviceUuid": dev_id,
+                                     "commandResponses": {"SUCCESS": {}, "FAILURE": {}, "BLACKLISTED": {}}}
+            for cmd in body.get("commands") or []:
+                if device is None or device.get("reachabilityStatus") != "Reachable":
+                    entry["commandResponses"]["FAILURE"][cmd] = "Device unreachable"
+                else:
+                    entry["commandResponses"]["SUCCESS"][cmd] = command_output(device, cmd, self.config.ports_per_switch)
+            result.append(entry)
+        task_id = self._new_task(result)
+        return {"response": {"taskId": task_id, "url": f"/api/v1/task/{task_id}"}, "version": "1.0"}
+
+    def _task(self, id: str, **_: Any) -> Dict[str, Any]:
+        return {"response": self._task_state(id), "version": "1.0"}
+
+    def _task_detail(self, id: str, **_: Any) -> Dict[str, Any]:
+        state = self._task_state(id)
+        if state.get("endTime"):
+            state["progress"] = "Task completed successfully"
+        return state
+
+    def _file(self, id: str, **_: Any) -> Any:
+        return self.files.get(id, [])
+
+    def _interfaces(self, params: Dict[str, str], **_: Any) -> Dict[str, Any]:
+        # Fleet-wide interface list; only the requested page is materialized.
+        per_dev = self.config.ports_per_switch + 1
+        devices = [self.by_id[params["deviceId"]]] if params.get("deviceId") in self.by_id else (
+            [] if "deviceId" in params else self.devices)
+        offset = max(int(params.get("offset", 1)), 1) - 1
+        limit = min(int(params.get("limit", self.config.page_limit)), self.config.page_limit)
+        items: List[Dict[str, Any]] = []
+        for i in range(offset // per_dev, min((offset + limit - 1) // per_dev + 1, len(devices))):
+            items.extend(device_interfaces(devices[i], self.config.ports_per_switch))
+        skip = offset % per_dev
+        return {"response": items[skip:skip + limit], "version": "1.0"}
+
+    def _sites(self, params: Dict[str, str], **_: Any) -> Dict[str, Any]:
+        offset = max(int(params.get("offset", 1)), 1)
+        limit = min(int(params.get("limit", self.config.page_limit)), self.config.page_limit)
+        return {"response": self.sites[offset - 1:offset - 1 + limit], "version": "1.0"}
+
+    def _membership(self, id: str, params: Dict[str, str], **_: Any) -> Dict[str, Any]:
+        # Devices assigned directly to the site, in one group tagged with its siteId (real clusters also
+        # return a group per child site; callers keep only the group for the site they asked about).
+        site = next((s for s in self.sites if s["id"] == id), None)
+        if site is None:
+            return {"site": {"response": []}, "device": []}
+        items = [self.by_id[d] for d, h in self.assignments.items() if h == site["nameHierarchy"] and d in self.by_id]
+        offset = max(int(params.get("offset", 1)), 1)
+        limit = min(int(params.get("limit", self.config.page_limit)), self.config.page_limit)
+        return {"site": {"response": [], "version": "1.0"},
+                "device": [{"siteId": id, "response": items[offset - 1:offset - 1 + limit], "version": "1.0"}]}
+
+    def _pnp_devices(self, **_: Any) -> List[Dict[str, Any]]:
+        return self.pnp_devices
+
+    def _task_ack(self, **_: Any) -> Dict[str, Any]:
+        return {"response": {"taskId": self._new_task()}, "version": "1.0"}
+
+    def _projects(self, params: Dict[str, str], **_: Any) -> Dict[str, Any]:
+        offset = max(int(params.get("offset", 1)), 1)
+        return {"response": [{"id": p["id"], "name": p["name"]} for p in self.projects[offset - 1:]]}
+
+    def _project(self, id: str, **_: Any) -> Dict[str, Any]:
+        return next((p for p in self.projects if p["id"] == id), {})
+
+    def _compliance_detail(self, id: str, **_: Any) -> Dict[str, Any]:
+        status = "NON_COMPLIANT" if self.config_generation.get(id) else "COMPLIANT"
+        return {"response": [{"deviceUuid": id, "complianceType": "RUNNING_CONFIG", "status": status}]}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run a mock Catalyst Center on localhost.")
+    ap.add_argument("--devices", type=int, default=1000, help="Synthetic fleet size (default: 1000)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--slow-rate", type=float, default=0.0, help="Probability of a tail-latency response")
+    ap.add_argument("--slow-ms", type=float, default=0.0, help="Extra delay of tail-latency responses")
+    ap.add_argument("--throttle-rate", type=float, default=0.0, help="Probability of a 429")
+    ap.add_argument("--max-rps", type=float, default=0.0, help="Answer 429 above this request rate")
+    ap.add_argument("--failure-rate", type=float, default=0.0, help="Probability of a 500")
+    ap.add_argument("--task-delay", type=float, default=0.0, help="Seconds before tasks complete")
+    args = ap.parse_args()
+
+    cfg = MockConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, slow_rate=args.slow_rate,
+                     slow_ms=args.slow_ms, throttle_rate=args.throttle_rate,
+                     max_rps=args.max_rps, failure_rate=args.failure_rate, task_delay_s=args.task_delay)
+    mock = MockDNAC(synthetic_fleet(args.devices), cfg, host=args.host, port=args.port)
+    print(f"Mock Catalyst Center on {mock.start()} ({len(mock.devices)} devices). Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import re
+from typing import Any, Dict, List, Optional
+
+# Show-command parsers shared by the AP hunt tools and fleet collectors.
+
+SHORTEN_MAP = {
+    "GigabitEthernet": "Gi",
+    "TenGigabitEthernet": "Te",
+    "TwentyFiveGigE": "Twe",      # seen on some platforms
+    "FortyGigabitEthernet": "Fo",
+    "HundredGigE": "Hu",
+    "FastEthernet": "Fa",
+    "TwoGigabitEthernet": "Tw",
+    "AppGigabitEthernet": "Ap",
+    "Ethernet": "Eth",
+}
+
+# Three-letter forms used by `show cdp neighbors` (Gig 1/0/1, Ten 1/1/1, ...)
+CDP_SHORT = {"Gig": "Gi", "Ten": "Te", "Fas": "Fa", "For": "Fo", "Hun": "Hu", "Two": "Tw"}
+
+def norm_intf(name: str) -> str:
+    """
+    Normalize interface names so 'GigabitEthernet1/0/1' and 'Gi1/0/1' match.
+    - trims spaces
+    - titlecase long names to consistent map
+    - converts long names to Cisco short forms (Gi/Te/Fa, etc.)
+    - uppercases final
+    """
+    if not name:
+        return ""
+    s = name.strip()
+    # remove trailing commas/colons common in outputs
+    s = s.rstrip(",:")
+    # compress multiple spaces
+    s = re.sub(r"\s+", "", s)
+
+    short = CDP_SHORT.get(s[:3])
+    if short and s[3:4].isdigit():
+        s = short + s[3:]
+
+    # If already looks short (Gi1/0/1), just uppercase Gi->GI for stable compare
+    m = re.match(r"^[A-Za-z]{1,3}\d", s)
+    if m:
+        return s[:2].capitalize() + s[2:]  # keep Gi/Te/Hu casing consistent
+
+    # Try replacing long names to short
+    for long, short in SHORTEN_MAP.items():
+        if s.startswith(long):
+            return short + s[len(long):]
+    return s  # fallback unchanged
+
+
+def parse_poe_on(output: str) -> set:
+    """
+    Parse 'show power inline' output.
+    We accept any line where the operational state shows 'on'.
+    Works with table lines like:
+    Gi1/0/1  auto   on   15.4   Ieee PD   4     30.0
+    """
+    poe_on = set()
+    for line in output.splitlines():
+        # quick pass: must start with an interface token
+        line = line.strip()
+        if not line or line.lower().startswith(("interface", "module", "device", "system", "available", "max", "admin", "----")):
+            continue
+        # Find a leading interface token
+        m = re.match(r"^(?P<intf>[A-Za-z][A-Za-z0-9/._-]+)\s+.*?\b(on)\b", line, flags=re.IGNORECASE)
+        if m:
+            poe_on.add(norm_intf(m.group("intf")))
+    return poe_on
+
+
+def parse_lldp_local_intf(output: str) -> set:
+    """
+    Parse 'show lldp neighbors' (summary) output to collect Local Intf column.
+    Summary rows start with the Device ID (truncated to 20 chars); Local Intf is the next column.
+    Also supports 'show lldp neighbors detail' by detecting 'Local Intf:' lines.
+    """
+    lldp_ports = set()
+    lines = output.splitlines()
+
+    # Try 'detail' style first
+    for line in lines:
+        dm = re.search(r"Local\s+Intf\s*:\s*([A-Za-z0-9/._-]+)", line, flags=re.IGNORECASE)
+        if dm:
+            lldp_ports.add(norm_intf(dm.group(1)))
+
+    if lldp_ports:
+        return lldp_ports
+
+    # Summary table style: fixed columns (Local Intf starts at col 20, after the Device ID)
+    return {r["intf"] for r in parse_lldp_neighbors(output)}
+
+
+_INTF_TOKEN = re.compile(r"^[A-Za-z][A-Za-z-]*\d[\w/.:-]*$")
+_LLDP_HEADER = re.compile(r"Device\s+ID\s+Local\s+Intf", re.IGNORECASE)
+_CDP_HEADER = re.compile(r"Device\s+ID\s+Local\s+Intrfce", re.IGNORECASE)
+_MAC_ROW = re.compile(
+    r"^\s*(?P<vlan>\d+|All)\s+(?P<mac>[0-9a-fA-F]{4}\.[0-9a-fA-F]{4}\.[0-9a-fA-F]{4})\s+(?P<type>\S+)"
+    r"(?:\s+(?:\S+\s+)*?)?\s*(?P<ports>[A-Za-z][\w/.:,-]*\d[\w/.:,-]*)\s*$"
+)
+
+
+def _col(header: str, *names: str) -> Optional[int]:
+    for name in names:
+        m = re.search(name, header, flags=re.IGNORECASE)
+        if m:
+            return m.start()
+    return None
+
+
+def parse_lldp_neighbors(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse 'show lldp neighbors' summary rows into
+    {"intf", "neighbor", "capability", "port_id"} records (intf normalized).
+    Column positions come from the header when present; otherwise the IOS-XE default (Local Intf at 20).
+    Device IDs are truncated to 20 chars and can run straight into the Local Intf column.
+    """
+    records = []
+    local_col, cap_col, port_col = 20, None, None
+    for line in output.splitlines():
+        if _LLDP_HEADER.search(line):
+            local_col = _col(line, r"Local\s+Intf")
+            cap_col = _col(line, r"Capabilit")
+            port_col = _col(line, r"Port\s+ID")
+            continue
+        if len(line) <= local_col or line.lower().startswith("total entries"):
+            continue
+        rest = line[local_col:].split()
+        if len(rest) < 2 or not _INTF_TOKEN.match(rest[0]) or not rest[1].isdigit():
+            continue
+        if port_col is not None and len(line) > port_col:
+            port_id = line[port_col:].strip()
+            capability = line[cap_col:port_col].strip() if cap_col is not None else ""
+        else:
+            port_id = rest[-1] if len(rest) > 2 else ""
+            capability = " ".join(rest[2:-1])
+        records.append({"intf": norm_intf(rest[0]), "neighbor": line[:local_col].strip(),
+                        "capability": capability, "port_id": port_id})
+    return records
+
+
+def parse_cdp_neighbors(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse 'show cdp neighbors' summary rows into
+    {"intf", "neighbor", "capability", "platform", "port_id"} records (intf normalized).
+    Long Device IDs sit alone on their own line, with the rest of the row on the next line.
+    """
+    records: List[Dict[str, Any]] = []
+    cols: Optional[Dict[str, Optional[int]]] = None
+    pending = ""
+    for line in output.splitlines():
+        if _CDP_HEADER.search(line):
+            cols = {
+                "local": _col(line, r"Local\s+Intrfce"),
+                "hold": _col(line, r"Holdtme", r"Hold\s*time"),
+                "cap": _col(line, r"Capability"),
+                "platform": _col(line, r"Platform"),
+                "port": _col(line, r"Port\s+ID"),
+            }
+            continue
+        if cols is None or not line.strip() or line.lower().startswith("total cdp entries"):
+            continue
+        local, hold = cols["local"], cols["hold"] or cols["local"] + 18
+        intf = norm_intf(line[local:hold]) if len(line.rstrip()) > local else ""
+        if not _INTF_TOKEN.match(intf):
+            pending = line.strip()  # a long Device ID wrapped onto its own line
+            continue
+        name = line[:local].strip() or pending
+        pending = ""
+        cap, plat, port = cols["cap"], cols["platform"], cols["port"]
+        records.append({
+            "intf": intf,
+            "neighbor": name,
+            "capability": line[cap:plat].strip() if cap is not None and plat is not None else "",
+            "platform": line[plat:port].strip() if plat is not None and port is not None else "",
+            "port_id": line[port:].strip() if port is not None else "",
+        })
+    return records
+
+
+def parse_mac_table(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse 'show mac address-table' rows into {"vlan", "mac", "type", "intf"} records.
+    Entries on CPU/Router or multi-port (comma separated) entries are skipped: they don't identify an edge port.
+    """
+    records = []
+    for line in output.splitlines():
+        m = _MAC_ROW.match(line)
+        if not m or "," in m.group("ports"):
+            continue
+        port = m.group("ports")
+        if port.upper() in ("CPU", "ROUTER", "SWITCH"):
+            continue
+        records.append({"vlan": m.group("vlan"), "mac": m.group("mac").lower(),
+                        "type": m.group("type").upper(), "intf": norm_intf(port)})
+    return records
+
+
+def parse_poe_ports(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse 'show power inline' table rows into {"intf", "admin", "oper", "watts", "device"} records.
+    Interface  Admin  Oper       Power   Device              Class Max
+    Gi1/0/1    auto   on         15.4    Ieee PD             4     30.0
+    """
+    records = []
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) < 4 or not _INTF_TOKEN.match(parts[0]):
+            continue
+        try:
+            watts = float(parts[3])
+        except ValueError:
+            continue
+        records.append({"intf": norm_intf(parts[0]), "admin": parts[1].lower(), "oper": parts[2].lower(),
+                        "watts": watts, "device": " ".join(parts[4:-2]) if len(parts) > 6 else ""})
+    return records
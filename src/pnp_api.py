@@ -1,5 +1,8 @@
 from typing import Dict, Any
 from .dnac_client import DNACClient
+from .site_index import resolve_site_id
+
+SITE_CLAIM_PATH = "/dna/intent/api/v1/onboarding/pnp-device/site-claim"
 
 def site_claim(client: DNACClient, device_id: str, site_name: str, template_name: str = None, template_params: Dict[str, Any]=None) -> Dict[str, Any]:
     # Claim a PnP device to a site (optionally with Day-0 template).
@@ -11,4 +14,21 @@ def site_claim(client: DNACClient, device_id: str, site_name: str, template_name
     if template_name:
         payload["templateName"] = template_name
         payload["templateParams"] = template_params or {}
-    return client.post("/dna/intent/spl/v1/onboarding/pnp-device/site-claim", payload)
\ No newline at end of file
+    return client.post("/dna/intent/spl/v1/onboarding/pnp-device/site-claim", payload)
+
+def site_claim_by_hierarchy(client: DNACClient, device_id: str, name_hierarchy: str, claim_type: str = "Default", config_id: str = None, config_params: Dict[str, Any]=None, **fields: Any) -> Dict[str, Any]:
+    # Claim using a siteId resolved from the shared site index (no full sites download per claim).
+    # Other claim fields (imageInfo, a ready-made configInfo, ...) are sent as given.
+    # Endpoint: /dna/intent/api/v1/onboarding/pnp-device/site-claim
+    payload: Dict[str, Any] = {
+        **fields,
+        "deviceId": device_id,
+        "siteId": resolve_site_id(client, name_hierarchy),
+        "type": claim_type,
+    }
+    if config_id:
+        payload["configInfo"] = {
+            "configId": config_id,
+            "configParameters": [{"key": k, "value": v} for k, v in (config_params or {}).items()],
+        }
+    return client.post(SITE_CLAIM_PATH, payload)
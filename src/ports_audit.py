@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .aphunt import COMMANDS as SHOW_COMMANDS
+from .parsers import norm_intf
+
+if TYPE_CHECKING:
+    from .dnac_client import DNACClient
+
+# Fleet port audit (csv/ports_audit.csv): one row per switch interface.
+# Admin/oper state comes from the paginated interface intent API in bulk (a few hundred interfaces per
+# request, every switch at once); PoE and LLDP/CDP neighbors come from chunked Command Runner jobs and are
+# parsed with the src/aphunt.py parsers. Both sides are joined per switch on normalized interface names
+# (GigabitEthernet1/0/1 == Gi1/0/1 == Gig 1/0/1), and rows are produced switch by switch so they can be
+# streamed to a sink as each Command Runner chunk lands.
+#
+#   ifaces = fetch_interfaces(client, device_ids)
+#   for row in audit_rows(hostname, ifaces.get(device_id, []), parse_outputs(outputs)):
+#       sink.write(row)
+
+AUDIT_FIELDS = ["switch", "ifName", "adminStatus", "operStatus", "poe", "neighbor", "detectedType"]
+COMMANDS = [SHOW_COMMANDS["poe"], SHOW_COMMANDS["lldp"], SHOW_COMMANDS["cdp"]]
+INTERFACE_PATH = "/dna/intent/api/v1/interface"
+
+Interface = Tuple[str, str, str]  # (portName, adminStatus, operStatus)
+
+
+def fetch_interfaces(client: DNACClient, device_ids: Optional[Iterable[str]] = None,
+                     page_size: int = 500) -> Dict[str, List[Interface]]:
+    # deviceId -> [(portName, adminStatus, operStatus)]; pages are reduced to tuples as they arrive.
+    wanted = set(device_ids) if device_ids is not None else None
+    by_dev: Dict[str, List[Interface]] = {}
+    for page in client.iter_pages(INTERFACE_PATH, params={"limit": page_size}):
+        for item in page:
+            dev = item.get("deviceId")
+            if wanted is not None and dev not in wanted:
+                continue
+            by_dev.setdefault(dev, []).append(
+                (item.get("portName") or "", (item.get("adminStatus") or "").lower(), (item.get("status") or "").lower())
+            )
+    return by_dev
+
+
+def detect_type(poe: Optional[Dict[str, Any]], lldp: Optional[Dict[str, Any]],
+                cdp: Optional[Dict[str, Any]]) -> str:
+    # Best guess at what is plugged in, from LLDP capability codes, CDP capability/platform and PoE draw.
+    lldp_cap = set((lldp or {}).get("capability", "").replace(",", " ").upper().split())
+    cdp_cap = set((cdp or {}).get("capability", "").split())
+    platform = (cdp or {}).get("platform", "").upper()
+    if "W" in lldp_cap or platform.startswith(("AIR-", "C91", "CW91")):
+        return "ap"
+    if "T" in lldp_cap or "P" in cdp_cap or "PHONE" in platform:
+        return "phone"
+    if lldp_cap & {"B", "R"} or cdp_cap & {"R", "S", "B"}:
+        return "network"
+    if lldp or cdp:
+        return "host" if "S" in lldp_cap or "H" in cdp_cap else "other"
+    if poe and poe.get("oper") == "on":
+        return "powered-unknown"
+    return ""
+
+
+def audit_rows(switch: str, interfaces: Iterable[Interface],
+               parsed: Dict[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    # parsed: aphunt.parse_outputs() for the switch (poe/lldp/cdp records, each may be missing).
+    # Every API interface gets a row; ports seen only in show output are appended with blank state.
+    poe = {r["intf"]: r for r in parsed.get("poe") or ()}
+    lldp = {r["intf"]: r for r in parsed.get("lldp") or ()}
+    cdp = {r["intf"]: r for r in parsed.get("cdp") or ()}
+    seen = set()
+    for name, admin, oper in interfaces:
+        key = norm_intf(name)
+        seen.add(key)
+        yield _row(switch, name, admin, oper, poe.get(key), lldp.get(key), cdp.get(key))
+    for key in sorted((poe.keys() | lldp.keys() | cdp.keys()) - seen):
+        yield _row(switch, key, "", "", poe.get(key), lldp.get(key), cdp.get(key))
+
+
+def _row(switch: str, name: str, admin: str, oper: str, poe: Optional[Dict[str, Any]],
+         lldp: Optional[Dict[str, Any]], cdp: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    neighbor = (lldp or {}).get("neighbor") or (cdp or {}).get("neighbor") or ""
+    return {"switch": switch, "ifName": name, "adminStatus": admin, "operStatus": oper,
+            "poe": poe["oper"] if poe else "", "neighbor": neighbor, "detectedType": detect_type(poe, lldp, cdp)}
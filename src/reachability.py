@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .inventory import Inventory
+
+# Dispatch pre-filter: unreachable devices burn the whole Command Runner / SSH timeout and hold a worker
+# slot while they do, so they are dropped before any expensive collection.
+# - Inventory: devices whose reachabilityStatus is not "Reachable" are skipped (no extra API call when the
+#   caller already has an Inventory, or the inventory GET is served by the response cache).
+# - Probe (optional): one asyncio TCP connect per device to 22/443, the whole target list in parallel under a
+#   single deadline; devices with neither port answering in time are skipped.
+#
+#   targets, skipped = prefilter(inv, uuids, probe_ports=PROBE_PORTS, deadline_s=2.0)
+#   # skipped: {deviceId: reason}; write_skipped("skipped_devices.csv", skipped, inv) lists them
+#
+# Devices the inventory doesn't know are passed through: there is nothing to judge them by.
+# inv must carry FIELDS.
+
+PROBE_PORTS = (22, 443)
+FIELDS = ("id", "hostname", "managementIpAddress", "reachabilityStatus")
+SKIPPED_FIELDS = ["deviceId", "hostname", "managementIpAddress", "reason"]
+
+
+async def _connect(host: str, port: int) -> int:
+    _, writer = await asyncio.open_connection(host, port)
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return port
+
+
+async def _probe_host(host: str, ports: Sequence[int], sem: asyncio.Semaphore) -> Optional[int]:
+    # First port to accept a connection, or None when all refuse/fail.
+    async with sem:
+        tasks = [asyncio.ensure_future(_connect(host, p)) for p in ports]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                try:
+                    return await fut
+                except OSError:
+                    continue
+            return None
+        finally:
+            for t in tasks:
+                t.cancel()
+
+
+async def probe_async(hosts: Dict[str, str], ports: Sequence[int] = PROBE_PORTS, deadline_s: float = 2.0,
+                      concurrency: int = 512) -> Dict[str, Optional[int]]:
+    # {key: port that answered, or None} for every host; whatever hasn't answered by the deadline is None.
+    sem = asyncio.Semaphore(concurrency)
+    tasks = {asyncio.ensure_future(_probe_host(ip, ports, sem)): key for key, ip in hosts.items()}
+    result: Dict[str, Optional[int]] = {key: None for key in hosts}
+    if not tasks:
+        return result
+    done, pending = await asyncio.wait(tasks, timeout=deadline_s)
+    for t in pending:
+        t.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    for t in done:
+        if not t.cancelled() and t.exception() is None:
+            result[tasks[t]] = t.result()
+    return result
+
+
+def probe(hosts: Dict[str, str], ports: Sequence[int] = PROBE_PORTS, deadline_s: float = 2.0,
+          concurrency: int = 512) -> Dict[str, Optional[int]]:
+    # Synchronous wrapper: hosts is {key (e.g. deviceId): ip or hostname}.
+    return asyncio.run(probe_async(hosts, ports, deadline_s, concurrency))
+
+
+def prefilter(inv: Inventory, device_ids: Iterable[str], probe_ports: Optional[Sequence[int]] = None,
+              deadline_s: float = 2.0) -> Tuple[List[str], Dict[str, str]]:
+    # (targets in input order, {skipped deviceId: reason}). probe_ports=None skips the TCP probe.
+    ids = list(dict.fromkeys(device_ids))
+    status = dict(zip(inv.column("id"), inv.column("reachabilityStatus")))
+    skipped: Dict[str, str] = {}
+    for dev in ids:
+        st = status.get(dev)
+        if dev in status and st != "Reachable":
+            skipped[dev] = f"inventory: {st or 'no reachabilityStatus'}"
+    if probe_ports:
+        ips = dict(zip(inv.column("id"), inv.column("managementIpAddress")))
+        hosts = {dev: ips[dev] for dev in ids if dev not in skipped and ips.get(dev)}
+        ports = "/".join(map(str, probe_ports))
+        for dev, port in probe(hosts, probe_ports, deadline_s).items():
+            if port is None:
+                skipped[dev] = f"probe: no answer on {ports} within {deadline_s:g}s"
+    return [dev for dev in ids if dev not in skipped], skipped
+
+
+def write_skipped(path: str, skipped: Dict[str, str], inv: Optional[Inventory] = None) -> None:
+    from .sinks import open_sink
+    info: Dict[str, Tuple[str, str]] = {}
+    if inv is not None:
+        info = {dev: (host, ip) for dev, host, ip in
+                zip(inv.column("id"), inv.column("hostname"), inv.column("managementIpAddress"))}
+    with open_sink(path, SKIPPED_FIELDS) as sink:
+        for dev, reason in skipped.items():
+            host, ip = info.get(dev, ("", ""))
+            sink.write({"deviceId": dev, "hostname": host, "managementIpAddress": ip, "reason": reason})
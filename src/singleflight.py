@@ -0,0 +1,62 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from .deadline import DeadlineExceeded, remaining
+
+# Single-flight de-duplication: concurrent calls with the same key share one execution.
+# The first caller (leader) runs fn; callers that arrive while it is in flight wait for and receive
+# the leader's result (or exception). Nothing is cached once the call completes.
+# Deadlines (src/deadline.py) stay per caller: a waiter gives up at its own deadline, and when the leader
+# fails with DeadlineExceeded (its budget, not the waiter's) a waiter retries and may become the leader.
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0  # calls answered by another caller's in-flight request
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.waiters += 1
+                    self.shared += 1
+            if leader:
+                break
+            left = remaining()
+            if not call.event.wait(None if left is None else max(left, 0)):
+                raise DeadlineExceeded("deadline exceeded waiting for a shared in-flight call")
+            if isinstance(call.error, DeadlineExceeded):
+                with self._lock:
+                    self.shared -= 1
+                continue  # the leader ran out of its own budget; try again
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Streaming result sinks: rows are written as they arrive instead of being collected for one final dump,
+# so a sweep's memory stays flat and completed rows are on disk if the run dies (CSV/JSONL; a Parquet file
+# is only readable once closed, see ParquetSink).
+#
+#   with BufferedSink(open_sink("out/results.csv", ["deviceUuid", "command", "output", "error"])) as sink:
+#       ... workers call sink.write(row) from any thread ...
+#
+# CsvSink/ParquetSink take a declared schema (field list); keys outside it are dropped and missing keys are
+# written empty. JsonlSink writes rows as-is. BufferedSink puts a bounded queue and one writer thread in
+# front of any sink: producers block when the queue is full, and the writer flushes in batches.
+
+
+class Sink(ABC):
+    # Subclasses implement write_many(); write() is one row through it.
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self.write_many([row])
+
+    @abstractmethod
+    def write_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        ...
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _open(path: str, mode: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return open(path, mode, newline="" if "b" not in mode else None, encoding=None if "b" in mode else "utf-8")
+
+
+class CsvSink(Sink):
+
+    def __init__(self, path: str, fields: Sequence[str], header: Optional[Sequence[str]] = None,
+                 append: bool = False) -> None:
+        self.path = path
+        self.fields = tuple(fields)
+        self.rows = 0
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._f = _open(path, "a" if append else "w")
+        self._w = csv.writer(self._f)
+        if write_header:
+            self._w.writerow(header or self.fields)
+
+    def write_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        fields = self.fields
+        for row in rows:
+            self._w.writerow(["" if row.get(k) is None else row.get(k) for k in fields])
+            self.rows += 1
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+
+class JsonlSink(Sink):
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        self.path = path
+        self.rows = 0
+        self._f = _open(path, "a" if append else "w")
+
+    def write_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            self.rows += 1
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+
+class ParquetSink(Sink):
+    # Columns are strings (None stays null); needs pyarrow. Rows are held until a whole row group of
+    # row_group_size is ready, so BufferedSink's frequent flushes don't leave thousands of tiny row groups.
+    # A Parquet file is unreadable until close() writes its footer: if the run dies, the open file is lost.
+    # With rows_per_file, output rolls over to <stem>-00000.parquet, <stem>-00001.parquet, ... and each part
+    # is closed as soon as it is full, so a crash loses only the part being written. `paths` lists them.
+
+    def __init__(self, path: str, fields: Sequence[str], row_group_size: int = 64 * 1024,
+                 rows_per_file: Optional[int] = None) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)") from e
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.fields = tuple(fields)
+        self.row_group_size = max(int(row_group_size), 1)
+        self.rows_per_file = rows_per_file
+        self.rows = 0
+        self.paths: List[str] = []
+        self._schema = pa.schema([(f, pa.string()) for f in self.fields])
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._writer = None
+        self._file_rows = 0
+        self._pending: List[Dict[str, Any]] = []
+
+    def write_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        self._pending.extend(rows)
+        while len(self._pending) >= self.row_group_size:
+            self._write(self.row_group_size)
+
+    def flush(self) -> None:
+        # Nothing to do: full row groups are written as they fill, the remainder at close().
+        pass
+
+    def _write(self, n: int) -> None:
+        if self._writer is None:
+            self._open_part()
+        if self.rows_per_file:
+            n = min(n, self.rows_per_file - self._file_rows)
+        batch, self._pending = self._pending[:n], self._pending[n:]
+        cols = {f: [None if r.get(f) is None else str(r.get(f)) for r in batch] for f in self.fields}
+        self._writer.write_table(self._pa.Table.from_pydict(cols, schema=self._schema), row_group_size=n)
+        self.rows += n
+        self._file_rows += n
+        if self.rows_per_file and self._file_rows >= self.rows_per_file:
+            self._writer.close()
+            self._writer = None
+
+    def _open_part(self) -> None:
+        path = self.path
+        if self.rows_per_file:
+            stem, ext = os.path.splitext(self.path)
+            path = f"{stem}-{len(self.paths):05d}{ext}"
+        self._writer = self._pq.ParquetWriter(path, self._schema)
+        self._file_rows = 0
+        self.paths.append(path)
+
+    def close(self) -> None:
+        while self._pending:
+            self._write(len(self._pending))
+        if self._writer is None and not self.paths:
+            self._open_part()  # no rows at all: still leave a (schema-only) file behind
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def open_sink(path: str, fields: Sequence[str], append: bool = False) -> Sink:
+    # Format from the extension: .csv, .jsonl/.ndjson, .parquet.
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return JsonlSink(path, append=append)
+    if ext == ".parquet":
+        return ParquetSink(path, fields)
+    return CsvSink(path, fields, append=append)
+
+
+_STOP = object()
+
+
+class BufferedSink(Sink):
+
+    def __init__(self, sink: Sink, maxsize: int = 10000, batch_size: int = 500,
+                 flush_interval_s: float = 1.0) -> None:
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.error: Optional[BaseException] = None
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sink-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        # Blocks while the queue is full (back-pressure on fast producers).
+        if self.error is not None:
+            raise RuntimeError("sink writer failed") from self.error
+        if self._closed:
+            raise ValueError("write to closed sink")
+        self._q.put(row)
+
+    def write_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            try:
+                item = self._q.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                continue
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+            if batch and self.error is None:
+                try:
+                    self.sink.write_many(batch)
+                    self.sink.flush()
+                except BaseException as e:  # surfaced to producers on their next write/close
+                    self.error = e
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(_STOP)
+        self._thread.join()
+        self.sink.close()
+        if self.error is not None:
+            raise RuntimeError("sink writer failed") from self.error
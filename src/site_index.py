@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .dnac_client import DNACClient
+
+SITES_PATH = "/dna/intent/api/v1/sites"
+MEMBERSHIP_PATH = "/dna/intent/api/v1/membership/{}"
+CACHE_DIR = ".cache"
+DEFAULT_TTL_S = 6 * 60 * 60
+MISS_REFRESH_S = 5 * 60   # a lookup miss refetches only an index older than this
+
+
+class SiteIndex:
+    # In-memory index of the site hierarchy.
+    # - by_hierarchy: exact "Global/US/Orlando/..." -> site record (O(1) lookups).
+    # - trie: nested dict keyed by hierarchy segment; each node keeps its site under "_site",
+    #   so every floor under a building can be enumerated without scanning all sites.
+
+    _SITE = "_site"
+
+    def __init__(self, sites: List[Dict[str, Any]], loaded_at: Optional[float] = None) -> None:
+        self.loaded_at = loaded_at or time.time()
+        self.by_hierarchy: Dict[str, Dict[str, Any]] = {}
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.trie: Dict[str, Any] = {}
+        for s in sites:
+            self._add(s)
+
+    def _add(self, site: Dict[str, Any]) -> None:
+        # Older releases expose groupNameHierarchy instead of nameHierarchy
+        hierarchy = site.get("nameHierarchy") or site.get("groupNameHierarchy")
+        if not hierarchy or not site.get("id"):
+            return
+        self.by_hierarchy[hierarchy] = site
+        self.by_id[site["id"]] = site
+        node = self.trie
+        for part in hierarchy.split("/"):
+            node = node.setdefault(part, {})
+        node[self._SITE] = site
+
+    def __len__(self) -> int:
+        return len(self.by_hierarchy)
+
+    def age(self) -> float:
+        return time.time() - self.loaded_at
+
+    def get(self, name_hierarchy: str) -> Optional[Dict[str, Any]]:
+        return self.by_hierarchy.get(name_hierarchy.strip("/"))
+
+    def site_id(self, name_hierarchy: str) -> Optional[str]:
+        site = self.get(name_hierarchy)
+        return site["id"] if site else None
+
+    def descendants(self, prefix: str, site_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        # Yield every site at or below prefix (e.g. all floors of a building with site_type="floor").
+        node = self.trie
+        for part in prefix.strip("/").split("/"):
+            node = node.get(part)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            cur = stack.pop()
+            site = cur.get(self._SITE)
+            if site and (site_type is None or (site.get("type") or "").lower() == site_type.lower()):
+                yield site
+            stack.extend(v for k, v in cur.items() if k != self._SITE)
+
+    def site_ids_under(self, prefix: str, site_type: Optional[str] = None) -> List[str]:
+        return [s["id"] for s in self.descendants(prefix, site_type)]
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"  # several processes may share one cache file
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"loaded_at": self.loaded_at, "sites": list(self.by_hierarchy.values())}, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SiteIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("sites") or [], loaded_at=data.get("loaded_at"))
+
+    @classmethod
+    def fetch(cls, client: DNACClient) -> "SiteIndex":
+        return cls(client.paginate(SITES_PATH))
+
+
+def default_cache_path(client: DNACClient) -> str:
+    host = client.base_url.split("://", 1)[-1].replace(":", "_").replace("/", "_")
+    return os.path.join(CACHE_DIR, f"sites-{host}.json")
+
+
+# Shared per-cluster indexes so PnP, inventory and template helpers resolve sites from one download.
+_INDEXES: Dict[str, SiteIndex] = {}
+_LOCK = threading.RLock()
+
+
+def get_site_index(
+    client: DNACClient,
+    cache_path: Optional[str] = "",
+    ttl_s: int = DEFAULT_TTL_S,
+    refresh: bool = False,
+) -> SiteIndex:
+    # Memory first, then the on-disk copy, then the cluster. Stale entries (older than ttl_s) are refetched.
+    # cache_path="" uses .cache/sites-<host>.json; None disables the on-disk copy. Loads are serialized, so
+    # workers that all start with a cold index share one download.
+    if cache_path == "":
+        cache_path = default_cache_path(client)
+    idx = _INDEXES.get(client.base_url)
+    if idx is not None and not refresh and idx.age() < ttl_s:
+        return idx
+
+    with _LOCK:
+        idx = _INDEXES.get(client.base_url)
+        if idx is not None and not refresh and idx.age() < ttl_s:
+            return idx  # loaded by another thread while this one waited
+
+        if cache_path and not refresh and os.path.exists(cache_path):
+            try:
+                idx = SiteIndex.load(cache_path)
+            except (OSError, ValueError):
+                idx = None
+            if idx is not None and idx.age() < ttl_s:
+                _INDEXES[client.base_url] = idx
+                return idx
+
+        idx = SiteIndex.fetch(client)
+        if cache_path:
+            idx.save(cache_path)
+        _INDEXES[client.base_url] = idx
+        return idx
+
+
+def _find(client: DNACClient, lookup: Callable[[SiteIndex], Optional[str]], **kwargs: Any) -> Optional[str]:
+    # lookup() against the shared index; on a miss, refetch once in case the site is new. An index
+    # downloaded less than MISS_REFRESH_S ago is trusted, so a run full of unknown names (typos in a claim
+    # file) costs one download, not one per name, even when its workers miss at the same time.
+    found = lookup(get_site_index(client, **kwargs))
+    if found is not None:
+        return found
+    with _LOCK:
+        idx = get_site_index(client, **kwargs)
+        if idx.age() >= MISS_REFRESH_S:
+            idx = get_site_index(client, **{**kwargs, "refresh": True})
+    return lookup(idx)
+
+
+def resolve_site_id(client: DNACClient, name_hierarchy: str, **kwargs: Any) -> str:
+    # Look up a siteId by exact nameHierarchy (see _find for when a miss refetches).
+    site_id = _find(client, lambda idx: idx.site_id(name_hierarchy), **kwargs)
+    if site_id is None:
+        raise KeyError(f"Site not found by nameHierarchy: {name_hierarchy}")
+    return site_id
+
+
+def site_hierarchy(client: DNACClient, site: str, **kwargs: Any) -> str:
+    # Canonical nameHierarchy for a site given by nameHierarchy or siteId (see _find for when a miss refetches).
+    def lookup(idx: SiteIndex) -> Optional[str]:
+        rec = idx.get(site) or idx.by_id.get(site)
+        return (rec.get("nameHierarchy") or rec.get("groupNameHierarchy")) if rec else None
+
+    hierarchy = _find(client, lookup, **kwargs)
+    if hierarchy is None:
+        raise KeyError(f"Site not found by nameHierarchy or id: {site}")
+    return hierarchy
+
+
+def site_devices(client: DNACClient, site_id: str, limit: int = 500) -> List[str]:
+    # Ids of the devices assigned directly to site_id. The membership API also returns a group per child
+    # site; only the group tagged with site_id is kept, since device_sites() asks each site separately.
+    ids: List[str] = []
+    offset = 1
+    while True:
+        data = client.get(MEMBERSHIP_PATH.format(site_id), params={"offset": offset, "limit": limit})
+        page = [d for group in data.get("device") or [] if group.get("siteId", site_id) == site_id
+                for d in group.get("response") or []]
+        ids.extend(d.get("instanceUuid") or d.get("id") for d in page)
+        if len(page) < limit:
+            break
+        offset += limit
+    return [i for i in ids if i]
+
+
+def device_sites(client: DNACClient, under: str = "Global", workers: int = 8, **kwargs: Any) -> Dict[str, str]:
+    # deviceId -> site nameHierarchy for every device assigned at or below `under`, from one membership
+    # call per site in the shared index. Device records don't carry this (locationName is null on real
+    # clusters), so this is the only reliable source for a device's site.
+    hierarchy = site_hierarchy(client, under, **kwargs)
+    sites = list(get_site_index(client, **kwargs).descendants(hierarchy))
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as ex:
+        members = list(ex.map(lambda s: site_devices(client, s["id"]), sites))
+    found: Dict[str, str] = {}
+    for site, ids in zip(sites, members):
+        name = site.get("nameHierarchy") or site.get("groupNameHierarchy")
+        for dev in ids:
+            # A device is assigned to one site; should a cluster list it twice, the deeper site wins.
+            if len(name) > len(found.get(dev, "")):
+                found[dev] = name
+    return found
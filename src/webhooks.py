@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .http_server import serve_connection
+
+# Embedded receiver for Catalyst Center event notifications (a REST webhook destination).
+# Point an event subscription's webhook destination at listener.url; every POSTed notification that
+# carries a task id resolves the futures waiting on that task, so jobs.wait_for_task(listener=...) can
+# fetch the final task state as soon as the event lands instead of polling every few seconds. The
+# server runs on its own asyncio loop in a daemon thread.
+#
+#   with WebhookListener(port=9443, headers={"Authorization": "Bearer s3cret"}) as listener:
+#       task = wait_for_task(client, task_id, listener=listener)   # slow polling stays as a safety net
+
+TASK_KEYS = ("taskId", "task_id")
+
+
+def task_ids(payload: Any, depth: int = 4) -> Iterator[str]:
+    # Task ids anywhere in a notification (top level, "details", lists of events, ...).
+    if depth < 0:
+        return
+    if isinstance(payload, dict):
+        for k, v in payload.items():
+            if k in TASK_KEYS and isinstance(v, str) and v:
+                yield v
+            elif isinstance(v, (dict, list)):
+                yield from task_ids(v, depth - 1)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from task_ids(item, depth - 1)
+
+
+class WebhookListener:
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = "/events",
+                 headers: Optional[Dict[str, str]] = None, remember: int = 10000) -> None:
+        # headers: values every notification must carry (the destination's auth header); remember: how many
+        # unclaimed task ids to keep, for events that arrive before anyone waits on them.
+        self.host = host
+        self.port = port
+        self.path = path
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.remember = remember
+        self.received = 0
+        self.rejected = 0
+        self._waiters: Dict[str, List[Future]] = {}
+        self._seen: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- lifecycle ----
+
+    @property
+    def url(self) -> str:
+        host = "127.0.0.1" if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self.port}{self.path}"
+
+    def start(self) -> str:
+        ready = threading.Event()
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            try:
+                server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+            except OSError as e:
+                errors.append(e)
+                ready.set()
+                return
+            self.port = server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+            server.close()
+            self._loop.run_until_complete(server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="webhook-listener", daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        if errors:
+            raise errors[0]
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+            self._thread = None
+
+    def __enter__(self) -> "WebhookListener":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # ---- waiting ----
+
+    def expect(self, task_id: str) -> Future:
+        # Future resolved with the next notification for task_id (immediately if one is already buffered).
+        fut: Future = Future()
+        with self._lock:
+            if task_id in self._seen:
+                fut.set_result(self._seen.pop(task_id))
+            else:
+                self._waiters.setdefault(task_id, []).append(fut)
+        return fut
+
+    def forget(self, task_id: str, fut: Optional[Future] = None) -> None:
+        with self._lock:
+            waiters = self._waiters.get(task_id, [])
+            if fut is not None and fut in waiters:
+                waiters.remove(fut)
+            if fut is None or not waiters:
+                self._waiters.pop(task_id, None)
+
+    def notify(self, payload: Any) -> int:
+        # Dispatch one notification; returns the number of task ids it carried.
+        count = 0
+        for task_id in task_ids(payload):
+            count += 1
+            with self._lock:
+                waiters = self._waiters.pop(task_id, None)
+                if not waiters:
+                    self._seen[task_id] = payload
+                    self._seen.move_to_end(task_id)
+                    while len(self._seen) > self.remember:
+                        self._seen.popitem(last=False)
+            for fut in waiters or ():
+                if not fut.done():
+                    fut.set_result(payload)
+        return count
+
+    # ---- HTTP ----
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await serve_connection(reader, writer, self._respond)
+
+    async def _respond(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        return self._receive(method, target.split("?", 1)[0], headers, body), {}, b""
+
+    def _receive(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> int:
+        if path.rstrip("/") != self.path.rstrip("/"):
+            return 404
+        if method != "POST":
+            return 405
+        if any(headers.get(k) != v for k, v in self.headers.items()):
+            self.rejected += 1
+            return 401
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            return 400
+        self.received += 1
+        self.notify(payload)
+        return 202
@@ -0,0 +1,50 @@
+from src.aphunt import COMMANDS, FleetTables, classify, find_suspects, load_state, save_state
+from src.mock_dnac import _has_cdp, _has_lldp, _poe_on, command_output, synthetic_fleet
+from src.parsers import parse_cdp_neighbors, parse_lldp_local_intf, parse_lldp_neighbors
+
+LLDP = """Device ID           Local Intf     Hold-time  Capability      Port ID
+UE-DC-B1040-PARK-DISTwe3/0/1       120        B,R             Ethernet6/9
+B0000-C-336o        Te2/0/35       120        W               dcb7.acc5.7239
+
+Total entries displayed: 2
+"""
+
+CDP = """Device ID        Local Intrfce     Holdtme    Capability  Platform  Port ID
+very-long-access-point-name.example.com
+                 Gig 1/0/7         150              R T   AIR-AP380 Gig 0
+SEP001122334455  Gig 1/0/9         150              H P M IP Phone  Port 1
+"""
+
+
+def test_neighbor_parsers_use_columns():
+    rows = parse_lldp_neighbors(LLDP)
+    assert [r["intf"] for r in rows] == ["Twe3/0/1", "Te2/0/35"]
+    assert parse_lldp_local_intf(LLDP) == {"Twe3/0/1", "Te2/0/35"}
+    cdp = parse_cdp_neighbors(CDP)
+    assert [(r["neighbor"], r["intf"]) for r in cdp] == [
+        ("very-long-access-point-name.example.com", "Gi1/0/7"), ("SEP001122334455", "Gi1/0/9")]
+
+
+def test_fleet_join_and_run_state(tmp_path):
+    fleet = synthetic_fleet(20)
+    tables = FleetTables()
+    for d in fleet:
+        tables.add_outputs(d["hostname"], {c: command_output(d, c, 24) for c in COMMANDS.values()})
+    rows = find_suspects(tables)
+    expected = {(d["hostname"], f"Gi1/0/{p}") for d in fleet for p in range(1, 25)
+                if _poe_on(d, p) and not _has_lldp(d, p) and not _has_cdp(d, p)}
+    assert {(r["switch"], r["interface"]) for r in rows} == expected
+    assert all(r["mac_count"] == 1 for r in rows)
+
+    state = str(tmp_path / "state.json")
+    first = classify(rows, load_state(state))
+    assert {r["status"] for r in first} == {"NEW"}
+    save_state(state, first, tables.switches)
+
+    gone = rows[0]
+    second = classify(rows[1:], load_state(state, tables.switches))
+    by_status = {}
+    for r in second:
+        by_status.setdefault(r["status"], []).append((r["switch"], r["interface"]))
+    assert by_status["CLEARED"] == [(gone["switch"], gone["interface"])]
+    assert len(by_status["PERSISTING"]) == len(rows) - 1 and "NEW" not in by_status
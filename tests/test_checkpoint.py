@@ -0,0 +1,19 @@
+from src.checkpoint import Checkpoint
+
+def test_resume_skips_done_and_retries_failures(tmp_path):
+    path = str(tmp_path / "ckpt.db")
+    ckpt = Checkpoint(path, "sweep")
+    ckpt.done("sw1", ["Gi1/0/1"])
+    ckpt.failed("sw2", TimeoutError("token expired"))
+    ckpt.close()
+
+    resumed = Checkpoint(path, "sweep", resume=True)
+    assert resumed.pending(["sw1", "sw2", "sw3"]) == ["sw2", "sw3"]
+    assert resumed.failures() == {"sw2": "token expired"}
+    resumed.done("sw2", [])
+    assert resumed.outputs() == {"sw1": ["Gi1/0/1"], "sw2": []}
+    assert resumed.counts() == {"DONE": 2}
+
+    # other jobs in the same file are untouched; a fresh (non-resume) run starts over
+    assert Checkpoint(path, "other", resume=True).pending(["sw1"]) == ["sw1"]
+    assert Checkpoint(path, "sweep").pending(["sw1", "sw2"]) == ["sw1", "sw2"]
@@ -0,0 +1,132 @@
+import csv
+import os
+import subprocess
+import sys
+from src.cli import main
+from src.concurrency import RateLimiter, WorkerPool
+from src.drift import save_snapshot
+from src.mock_dnac import MockConfig, MockDNAC, device_config, synthetic_fleet
+
+def test_cmd_and_drift_resume(tmp_path, monkeypatch):
+    with MockDNAC(synthetic_fleet(60), MockConfig(task_delay_s=0.05)) as mock:
+        monkeypatch.setenv("DNAC_URL", mock.base_url)
+        monkeypatch.setenv("DNAC_USERNAME", "u")
+        monkeypatch.setenv("DNAC_PASSWORD", "p")
+        reachable = [d["id"] for d in mock.devices if d["reachabilityStatus"] == "Reachable"]
+        devices = tmp_path / "devices.txt"
+        devices.write_text("\n".join(reachable[:25]))
+        journal, out = str(tmp_path / "ckpt.db"), str(tmp_path / "out.csv")
+        common = ["--journal", journal, "--workers", "4", "--rate", "500"]
+
+        assert main(["cmd", "--devices", str(devices), "--chunk", "10", "--out", out, *common]) == 0
+        assert mock.hits["read_request"] == 3
+        with open(out, newline="") as f:
+            assert len(list(csv.DictReader(f))) == 25
+
+        # nothing left to do: no new jobs, same report
+        assert main(["cmd", "--devices", str(devices), "--chunk", "10", "--out", out, "--resume", *common]) == 0
+        assert mock.hits["read_request"] == 3
+
+        outdir = str(tmp_path / "baselines")
+        assert main(["drift", "--devices", str(devices), "--outdir", outdir, *common]) == 0
+        assert mock.hits["config"] == 25
+        assert main(["drift", "--devices", str(devices), "--outdir", outdir, "--resume", *common]) == 0
+        assert mock.hits["config"] == 25
+
+def test_drift_report_covers_devices_done_before_resume(tmp_path, monkeypatch):
+    with MockDNAC(synthetic_fleet(20)) as mock:
+        monkeypatch.setenv("DNAC_URL", mock.base_url)
+        monkeypatch.setenv("DNAC_USERNAME", "u")
+        monkeypatch.setenv("DNAC_PASSWORD", "p")
+        ids = [d["id"] for d in mock.devices]
+        devices, first = tmp_path / "devices.txt", tmp_path / "first.txt"
+        devices.write_text("\n".join(ids))
+        first.write_text("\n".join(ids[:8]))
+        report = str(tmp_path / "drift_report.txt")
+        common = ["--journal", str(tmp_path / "ckpt.db"), "--outdir", str(tmp_path / "baselines"),
+                  "--report", report, "--workers", "4"]
+
+        for d in mock.devices:
+            save_snapshot(d["id"], device_config(d), str(tmp_path / "baselines"), "20250101_000000")
+        mock.mutate_configs(1.0)
+        assert main(["drift", "--devices", str(first), *common]) == 0  # interrupted after 8 devices
+        assert main(["drift", "--devices", str(devices), "--resume", *common]) == 0
+        assert mock.hits["config"] == 20
+        with open(report) as f:
+            assert f.readline().startswith("# 20 drifted devices, 1 distinct change")
+
+
+def test_pool_and_rate_limiter():
+    limiter = RateLimiter(rate=200, burst=1)
+
+    def work(i):
+        limiter.acquire()
+        return 1 / (i - 3)
+
+    outcomes = list(WorkerPool(4, max_pending=2).map(work, range(6)))
+    assert sorted(o.item for o in outcomes) == list(range(6))
+    assert [o.item for o in outcomes if not o.ok] == [3]
+    assert limiter.waited_s > 0
+
+def test_import_and_offline_diff_stay_light(tmp_path):
+    (tmp_path / "a.cfg").write_text("hostname a\n")
+    (tmp_path / "b.cfg").write_text("hostname b\n")
+    code = (
+        "import sys, src.cli\n"
+        "heavy = [m for m in ('requests', 'yaml', 'dotenv', 'urllib3') if m in sys.modules]\n"
+        f"rc = src.cli.main(['diff', {str(tmp_path / 'a.cfg')!r}, {str(tmp_path / 'b.cfg')!r}])\n"
+        "heavy += [m for m in ('requests', 'yaml', 'dotenv', 'urllib3') if m in sys.modules]\n"
+        "print(rc, sorted(set(heavy)))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip().splitlines()[-1] == "1 []"
+
+def test_inventory_csv_site_column_comes_from_membership(tmp_path, monkeypatch):
+    from src import site_index
+    monkeypatch.chdir(tmp_path)                  # the site index is cached under ./.cache
+    site_index._INDEXES.clear()
+    with MockDNAC(synthetic_fleet(120)) as mock:
+        monkeypatch.setenv("DNAC_URL", mock.base_url)
+        monkeypatch.setenv("DNAC_USERNAME", "u")
+        monkeypatch.setenv("DNAC_PASSWORD", "p")
+        out = str(tmp_path / "inv.csv")
+        assert main(["inventory", "--csv", out, "--site", "Global/US/Orlando/Campus/Building0/Floor1"]) == 0
+        with open(out, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert rows and {r["site"] for r in rows} == {"Global/US/Orlando/Campus/Building0/Floor1"}
+        assert {r["id"] for r in rows} == {d for d, s in mock.assignments.items() if s.endswith("/Floor1")}
+    site_index._INDEXES.clear()
+
+def test_pnp_claims_resolve_sites_from_one_index_download(tmp_path, monkeypatch):
+    import json
+    from src import site_index
+    monkeypatch.chdir(tmp_path)
+    site_index._INDEXES.clear()
+    with MockDNAC(synthetic_fleet(20)) as mock:
+        monkeypatch.setenv("DNAC_URL", mock.base_url)
+        monkeypatch.setenv("DNAC_USERNAME", "u")
+        monkeypatch.setenv("DNAC_PASSWORD", "p")
+        floor = "Global/US/Orlando/Campus/Building0/Floor1"
+        claims = [{"deviceId": p["id"], "siteNameHierarchy": floor} for p in mock.pnp_devices[:4]]
+        claims.append({"deviceId": "typo", "siteNameHierarchy": "Global/US/Orlandoo"})
+        payload = tmp_path / "pnp.json"
+        payload.write_text(json.dumps({"claims": claims}))
+        assert main(["pnp", "--payload", str(payload), "--journal", str(tmp_path / "ckpt.db")]) == 1
+        assert mock.hits["task_ack"] == 4          # the unknown site fails before anything is posted
+        assert mock.hits["sites"] == 1             # one download; the fresh index is trusted on the miss
+    site_index._INDEXES.clear()
+
+def test_http_cache_flag_serves_second_run_from_disk(tmp_path, monkeypatch):
+    with MockDNAC(synthetic_fleet(120)) as mock:
+        monkeypatch.setenv("DNAC_URL", mock.base_url)
+        monkeypatch.setenv("DNAC_USERNAME", "u")
+        monkeypatch.setenv("DNAC_PASSWORD", "p")
+        cache = str(tmp_path / "http.json")
+        assert main(["inventory", "--http-cache", cache]) == 0
+        fetched = mock.hits["devices"]
+        assert fetched and os.path.exists(cache)
+        assert main(["inventory", "--http-cache", cache]) == 0         # new process state, same file
+        assert mock.hits["devices"] == fetched
+        assert main(["inventory"]) == 0                                 # without the flag: no cache
+        assert mock.hits["devices"] == 2 * fetched
@@ -0,0 +1,43 @@
+from src.cluster_group import ClusterGroup
+from src.dnac_client import DNACClient
+from src.mock_dnac import MockConfig, MockDNAC, synthetic_fleet
+
+def test_fan_out_merges_and_tags_clusters():
+    with MockDNAC(synthetic_fleet(300), MockConfig(latency_ms=20)) as east, MockDNAC(synthetic_fleet(120)) as west:
+        group = ClusterGroup({
+            "east": DNACClient(east.base_url, "u", "p"),
+            "west": DNACClient(west.base_url, "u", "p"),
+            "down": DNACClient("http://127.0.0.1:9", "u", "p", timeout=1),
+        })
+        inv, errors = group.inventory(["id", "hostname", "platformId"])
+        assert inv.counts("cluster") == {"east": 300, "west": 120}
+        assert set(errors) == {"down"}
+
+        targets = {"east": [east.devices[0]["id"]], "west": [west.devices[1]["id"]]}
+        rows, errors = group.run_commands(["show version"], targets)
+        assert sorted((r["cluster"], r["deviceUuid"]) for r in rows) == sorted(
+            (name, uuids[0]) for name, uuids in targets.items()
+        )
+        assert set(errors) == set()                  # "down" has no targets, so nothing to fail
+        assert not hasattr(group, "errors")
+
+def test_clusters_flag_merges_inventories(tmp_path, monkeypatch):
+    import csv
+    from src import site_index
+    from src.cli import main
+    monkeypatch.chdir(tmp_path)
+    site_index._INDEXES.clear()
+    with MockDNAC(synthetic_fleet(30)) as east, MockDNAC(synthetic_fleet(20)) as west:
+        (tmp_path / "settings.yaml").write_text(
+            f"clusters:\n  east:\n    url: {east.base_url}\n  west:\n    url: {west.base_url}\n")
+        monkeypatch.setenv("DNAC_URL", east.base_url)
+        monkeypatch.setenv("DNAC_USERNAME", "u")
+        monkeypatch.setenv("DNAC_PASSWORD", "p")
+        out = str(tmp_path / "inv.csv")
+        assert main(["inventory", "--clusters", "--csv", out, "--settings", str(tmp_path / "settings.yaml")]) == 0
+        with open(out, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert sorted((r["cluster"], r["id"]) for r in rows) == sorted(
+            [("east", d["id"]) for d in east.devices] + [("west", d["id"]) for d in west.devices])
+        assert all(r["site"] == east.assignments.get(r["id"], west.assignments.get(r["id"])) for r in rows)
+    site_index._INDEXES.clear()
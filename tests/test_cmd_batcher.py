@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.cmd_batcher import CommandBatcher
+from src.cmdrunner import collect_read_results, command_rows
+from src.dnac_client import DNACClient
+from src.mock_dnac import MockConfig, MockDNAC, synthetic_fleet
+
+
+def test_concurrent_callers_share_jobs():
+    with MockDNAC(synthetic_fleet(120), MockConfig(task_delay_s=0.05)) as mock:
+        client = DNACClient(mock.base_url, "u", "p")
+        uuids = [d["id"] for d in mock.devices]
+        asks = [(uuids[i * 10:(i + 1) * 10], ["show version"] if i % 2 else ["show version", "show clock"])
+                for i in range(12)]
+        with CommandBatcher(client, window_s=0.25, max_devices=100, poll_s=0.01) as batcher:
+            with ThreadPoolExecutor(12) as pool:
+                results = list(pool.map(
+                    lambda a: command_rows(collect_read_results(client, a[0], a[1], batcher=batcher)), asks))
+        assert batcher.requests == 12 and batcher.jobs == mock.hits["read_request"] == 2
+        for (devs, cmds), rows in zip(asks, results):
+            # each caller sees only its own devices and commands
+            assert sorted((r["deviceUuid"], r["command"]) for r in rows) == sorted((d, c) for d in devs for c in cmds)
+
+
+def test_large_request_split_and_errors():
+    with MockDNAC(synthetic_fleet(50)) as mock:
+        client = DNACClient(mock.base_url, "u", "p")
+        uuids = [d["id"] for d in mock.devices]
+        with CommandBatcher(client, window_s=0.05, max_devices=20, max_commands=2, poll_s=0.01) as batcher:
+            entries = batcher.collect(uuids, ["show version"])
+            assert [e["deviceUuid"] for e in entries] == uuids and batcher.jobs == 3
+            with pytest.raises(ValueError):
+                batcher.submit(uuids, ["a", "b", "c"])
+
+    class Down:
+        def post(self, path, body):
+            raise ConnectionError("cluster down")
+
+    with CommandBatcher(Down(), window_s=0.01) as bad:
+        futures = [bad.submit(["d1"], ["show version"]), bad.submit(["d2"], ["show clock"])]
+        for f in futures:
+            with pytest.raises(ConnectionError):
+                f.result()
@@ -0,0 +1,40 @@
+import time
+
+from src.cmd_cache import CommandCache, normalize_command
+from src.cmdrunner import collect_read_results, command_rows
+from src.dnac_client import DNACClient
+from src.mock_dnac import MockDNAC, synthetic_fleet
+
+
+def test_only_misses_are_submitted(tmp_path):
+    with MockDNAC(synthetic_fleet(20)) as mock:
+        client = DNACClient(mock.base_url, "u", "p")
+        cache = CommandCache(str(tmp_path / "c.db"))
+        uuids = [d["id"] for d in mock.devices]
+        first = command_rows(collect_read_results(client, uuids[:10], ["show version"], poll_s=0.01, cache=cache))
+        assert mock.hits["read_request"] == 1
+
+        # 10 cached + 10 new devices, plus a command with no TTL: one job for the new devices' two commands,
+        # one for the uncached command on the rest
+        cmds = ["show  VERSION", "show clock"]
+        rows = command_rows(collect_read_results(client, uuids, cmds, poll_s=0.01, cache=cache))
+        assert mock.hits["read_request"] == 3 and len(rows) == 40
+        by_key = {(r["deviceUuid"], r["command"]): r["output"] for r in rows}
+        assert all(by_key[(r["deviceUuid"], "show  VERSION")] == r["output"] for r in first)
+
+        collect_read_results(client, uuids, ["show version"], poll_s=0.01, cache=cache)
+        assert mock.hits["read_request"] == 3
+        collect_read_results(client, uuids[:3], ["show version"], poll_s=0.01, cache=cache, max_age=0)
+        assert mock.hits["read_request"] == 4
+        assert cache.stats()["entries"] == 20
+
+
+def test_ttls_and_max_age(tmp_path):
+    cache = CommandCache(str(tmp_path / "c.db"), ttls={"show power inline": 300, "show ip route": 0})
+    assert normalize_command("  Show   POWER inline |  include  Gi1/0/1 ") == "show power inline | include Gi1/0/1"
+    assert cache.ttl_for("show power inline gi1/0/1") == 300 and cache.ttl_for("show power inlinex") == 0
+    cache.store([("d1", "show power inline", "old")], at=time.time() - 600)
+    cache.store([("d2", "show power inline", "new")])
+    assert cache.lookup(["d1", "d2"], ["show power inline"]) == {("d2", "show power inline"): "new"}
+    assert len(cache.lookup(["d1", "d2"], ["show power inline"], max_age=3600)) == 2
+    assert cache.purge(300) == 1
@@ -0,0 +1,52 @@
+import time
+
+from src import compliance_api
+from src.compliance_api import collect_device_compliance
+from src.compliance_store import ComplianceStore
+from src.dnac_client import DNACClient
+from src.mock_dnac import MockConfig, MockDNAC, synthetic_fleet
+
+def test_batches_wait_concurrently_then_non_compliant_and_delta(tmp_path):
+    store = ComplianceStore(str(tmp_path / "c.db"))
+    with MockDNAC(synthetic_fleet(30), MockConfig(task_delay_s=0.3)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        ids = [d["id"] for d in mock.devices]
+        t0 = time.perf_counter()
+        first = collect_device_compliance(c, ids, store, batch_size=10, workers=4, poll_s=0.05)
+        assert time.perf_counter() - t0 < 0.8                     # three 0.3 s tasks awaited together
+        assert mock.hits["task_ack"] == 3 and mock.hits["compliance_detail"] == 30
+        assert store.non_compliant(first) == []
+
+        changed = mock.mutate_configs(0.3)
+        assert changed
+        second = collect_device_compliance(c, ids, store, batch_size=10, workers=4, poll_s=0.05)
+        assert sorted(r["deviceUuid"] for r in store.non_compliant(second)) == sorted(changed)
+        assert {(d["deviceUuid"], d["previous"], d["current"]) for d in store.delta(second)} == {
+            (dev, "COMPLIANT", "NON_COMPLIANT") for dev in changed}
+    store.close()
+
+def test_failed_batch_is_recorded_not_collected(tmp_path, monkeypatch):
+    store = ComplianceStore(str(tmp_path / "c.db"))
+    started = []
+    real_run, real_wait = compliance_api.run_compliance, compliance_api.wait_for_task
+
+    def run(client, batch, categories=None):
+        job = real_run(client, batch, categories)
+        started.append((job["response"]["taskId"], batch))
+        return job
+
+    def wait(client, task_id, **kwargs):
+        if task_id == started[1][0]:
+            return {"id": task_id, "isError": True, "failureReason": "NCC device busy"}
+        return real_wait(client, task_id, **kwargs)
+
+    monkeypatch.setattr(compliance_api, "run_compliance", run)
+    monkeypatch.setattr(compliance_api, "wait_for_task", wait)
+    with MockDNAC(synthetic_fleet(30)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        run_id = collect_device_compliance(c, [d["id"] for d in mock.devices], store, batch_size=10, poll_s=0.05)
+        assert mock.hits["compliance_detail"] == 20
+    bad = store.non_compliant(run_id)
+    assert sorted(r["deviceUuid"] for r in bad) == sorted(started[1][1])
+    assert {(r["category"], r["status"]) for r in bad} == {("TRIGGER", "ERROR")}
+    store.close()
@@ -0,0 +1,61 @@
+import pytest
+from src import compliance_rules
+from src.compliance_rules import RuleSet, evaluate_fleet, latest_snapshots
+from src.config_history import ConfigHistory
+from src.drift import save_snapshot
+from src.mock_dnac import device_config, synthetic_fleet
+
+RULES = [
+    {"id": "no-http", "must_not_contain": "^ip http server$", "severity": "high"},
+    {"id": "aaa", "must_contain": ["^aaa new-model$"]},
+    {"id": "mgmt-vrf", "block": "^interface Vlan${mgmt_vlan}$", "must_contain": "^vrf forwarding ${mgmt_vrf}$"},
+    {"id": "no-pnp-vlan", "must_not_contain": "^vlan ${pnp_vlan}$"},
+    {"id": "no-shut", "block": "^interface GigabitEthernet", "must_not_contain": "^shutdown$"},
+]
+
+
+def ruleset():
+    return RuleSet(RULES, {"mgmt_vlan": 10, "mgmt_vrf": "MGMT"}, {"EPIC": {"pnp_vlan": 3989, "mgmt_vrf": "Mgmt-vrf"}})
+
+
+def test_rules_with_site_variables_and_blocks():
+    cfg = device_config(synthetic_fleet(1)[0])
+    rs = ruleset()
+    assert rs.evaluate("d1", cfg) == []
+    # the site overrides mgmt_vrf, and only that site defines pnp_vlan
+    assert [v.rule for v in rs.evaluate("d1", cfg, site="EPIC")] == ["mgmt-vrf"]
+    assert len(rs.compiled()) == 4 and len(rs.compiled("EPIC")) == 5
+
+    bad = cfg.replace("no ip http server", "ip http server").replace(
+        "interface GigabitEthernet1/0/3\n", "interface GigabitEthernet1/0/3\n shutdown\n") + "vlan 3989\n"
+    found = {(v.rule, v.block, v.line) for v in rs.evaluate("d1", bad, site="EPIC")}
+    assert ("no-http", "", "ip http server") in found
+    assert ("no-shut", "interface GigabitEthernet1/0/3", "shutdown") in found
+    assert ("no-pnp-vlan", "", "vlan 3989") in found
+    assert [v.rule for v in rs.evaluate("d1", "hostname x\n")] == ["aaa"]  # no Vlan10 block: nothing to check
+
+    with pytest.raises(ValueError):
+        RuleSet([{"id": "x"}])
+
+
+def test_fleet_over_snapshots_and_history(tmp_path):
+    outdir = str(tmp_path / "baselines")
+    hist = ConfigHistory(str(tmp_path / "h.db"))
+    fleet = synthetic_fleet(40)
+    for i, dev in enumerate(fleet):
+        cfg = device_config(dev)
+        if i % 4 == 0:
+            cfg = cfg.replace("aaa new-model\n", "")
+        save_snapshot(dev["id"], cfg, outdir, stamp="20250101_000000", history=hist)
+    hist.close()
+    sites = {dev["id"]: "EPIC" for dev in fleet[:20]}
+
+    pooled = dict(evaluate_fleet(ruleset(), latest_snapshots(outdir), sites, workers=2, chunk=8))
+    in_order = list(evaluate_fleet(ruleset(), [(d["id"], None) for d in fleet], sites, workers=1,
+                                   history=str(tmp_path / "h.db")))
+    assert [dev for dev, _ in in_order] == [d["id"] for d in fleet]
+    assert compliance_rules._worker_rules is None and compliance_rules._worker_history is None  # no globals in-process
+    local = dict(in_order)
+    assert pooled == local and len(pooled) == 40
+    assert sum(any(v.rule == "aaa" for v in vs) for vs in pooled.values()) == 10
+    assert sum(any(v.rule == "mgmt-vrf" for v in vs) for vs in pooled.values()) == 20
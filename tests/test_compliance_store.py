@@ -0,0 +1,19 @@
+from src.compliance_store import ComplianceStore
+
+def test_non_compliant_and_delta(tmp_path):
+    store = ComplianceStore(str(tmp_path / "c.db"))
+    first = store.start_run()
+    store.add_results(first, "d1", [{"complianceType": "RUNNING_CONFIG", "status": "COMPLIANT"}])
+    store.add_results(first, "d2", [{"complianceType": "RUNNING_CONFIG", "status": "NON_COMPLIANT"}])
+    store.finish_run(first)
+
+    second = store.start_run()
+    store.add_results(second, "d1", [{"complianceType": "RUNNING_CONFIG", "status": "NON_COMPLIANT"}])
+    store.add_results(second, "d2", [{"complianceType": "RUNNING_CONFIG", "status": "NON_COMPLIANT"}])
+    store.finish_run(second)
+
+    assert [r["deviceUuid"] for r in store.non_compliant()] == ["d1", "d2"]
+    assert store.delta() == [
+        {"deviceUuid": "d1", "category": "RUNNING_CONFIG", "previous": "COMPLIANT", "current": "NON_COMPLIANT"}
+    ]
+    store.close()
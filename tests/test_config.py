@@ -0,0 +1,15 @@
+import os
+from src import config
+from src.config import Settings
+
+def test_yaml_parsed_on_demand_and_cached_by_mtime(tmp_path):
+    path = tmp_path / "settings.yaml"
+    path.write_text("sites:\n  A: {mgmt_vlan: 10}\n")
+    s = Settings(str(path))
+    assert str(path) not in config._yaml_cache
+    assert s.sites == {"A": {"mgmt_vlan": 10}}
+    assert Settings(str(path)).data is s.data
+
+    path.write_text("sites:\n  B: {mgmt_vlan: 20}\n")
+    os.utime(path, (1, 1))
+    assert list(s.sites) == ["B"]
@@ -0,0 +1,54 @@
+import random
+
+from src.config_history import ConfigHistory
+from src.drift import save_snapshot
+from src.mock_dnac import device_config, synthetic_fleet
+
+
+def _mutate(rnd, lines):
+    lines = list(lines)
+    for _ in range(rnd.randint(1, 4)):
+        i = rnd.randrange(len(lines))
+        op = rnd.random()
+        if op < 0.4:
+            lines.insert(i, f" description edit-{rnd.randrange(10**6)}\n")
+        elif op < 0.7 and len(lines) > 10:
+            del lines[i]
+        else:
+            lines[i] = f"logging host 10.0.{rnd.randrange(256)}.{rnd.randrange(256)}\n"
+    return lines
+
+
+def test_point_in_time_roundtrip(tmp_path):
+    rnd = random.Random(3)
+    hist = ConfigHistory(str(tmp_path / "h.db"), keyframe_every=8)
+    lines = device_config(synthetic_fleet(1)[0]).splitlines(keepends=True)
+    written = []
+    for n in range(60):
+        lines = _mutate(rnd, lines)
+        cfg = "".join(lines)
+        assert hist.add("dev1", cfg, at=1000 + n * 10)
+        assert not hist.add("dev1", cfg, at=1005 + n * 10)  # unchanged snapshot stores nothing
+        written.append(cfg)
+
+    assert len(hist.versions("dev1")) == 60
+    assert hist.get_config("dev1", at=999) is None
+    for n in rnd.sample(range(60), 20):
+        assert hist.get_config("dev1", at=1000 + n * 10 + 7) == written[n]
+    assert hist.get_config("dev1") == written[-1]
+    assert hist.diff("dev1", 1000, 1000) == ""
+    assert hist.diff("dev1", 1000, 1590).startswith("--- dev1@1000")
+    st = hist.stats()
+    assert st["full"] <= 60 // 7 + 1 and st["stored_bytes"] < st["raw_bytes"] / 5
+
+
+def test_import_and_drift_hook(tmp_path):
+    outdir = str(tmp_path / "baselines")
+    hist = ConfigHistory(str(tmp_path / "h.db"))
+    save_snapshot("d1", "hostname a\n", outdir, stamp="20250101_000000")
+    save_snapshot("d1", "hostname b\n", outdir, stamp="20250102_000000", history=hist)
+
+    imported = ConfigHistory(str(tmp_path / "imported.db"))
+    assert imported.import_baselines(outdir) == 2 and imported.import_baselines(outdir) == 0
+    assert imported.get_config("d1", at="2025-01-01 12:00") == "hostname a\n"
+    assert hist.get_config("d1", at="20250102_000000") == imported.get_config("d1") == "hostname b\n"
@@ -0,0 +1,45 @@
+from src.config_search import ConfigIndex, config_lines
+from src.drift import save_snapshot
+from src.mock_dnac import device_config, synthetic_fleet
+
+
+def test_line_regex_and_block_queries(tmp_path):
+    fleet = synthetic_fleet(40)
+    idx = ConfigIndex(str(tmp_path / "idx.db"))
+    outdir = str(tmp_path / "baselines")
+    for n, d in enumerate(fleet):
+        cfg = device_config(d)
+        if n % 4 == 0:
+            cfg = cfg.replace("no ip http server", "ip http server")
+        if n % 5 == 0:
+            cfg = cfg.replace(" switchport access vlan 20\n", " switchport access vlan 20\n shutdown\n", 1)
+        save_snapshot(d["id"], cfg, outdir, stamp="20250101_000000", index=idx)
+
+    http = {d["id"] for n, d in enumerate(fleet) if n % 4 == 0}
+    assert {h["device"] for h in idx.search_line("ip http server")} == http
+    assert set(idx.devices(r"^ip http server$")) == http
+    assert set(idx.devices(r"ip http")) == {d["id"] for d in fleet}  # no whole word: substring prefilter
+    assert set(idx.devices(r"(?i)^IP HTTP SERVER$")) == http
+
+    shut = idx.search(r"^shutdown$", block=r"^interface GigabitEthernet1/0/1$")
+    assert {h["device"] for h in shut} == {d["id"] for n, d in enumerate(fleet) if n % 5 == 0}
+    assert shut[0]["block"] == "interface GigabitEthernet1/0/1" and shut[0]["snapshot"] == "20250101_000000"
+    assert idx.search(r"^shutdown$", block=r"^interface Vlan") == []
+    assert len(idx.search(r"ip address 10\.0\.0\.\d+ 255")) == 40
+
+
+def test_only_changed_snapshots_are_reindexed(tmp_path):
+    outdir = str(tmp_path / "baselines")
+    save_snapshot("a", "hostname a\nip http server\n", outdir, stamp="20250101_000000")
+    save_snapshot("b", "hostname b\n", outdir, stamp="20250101_000000")
+    idx = ConfigIndex(str(tmp_path / "idx.db"))
+    assert idx.index_baselines(outdir) == 2
+
+    save_snapshot("a", "hostname a\nip http server\n", outdir, stamp="20250102_000000")
+    save_snapshot("b", "hostname b\nip http server\n", outdir, stamp="20250102_000000")
+    assert idx.index_baselines(outdir) == 1
+    hits = idx.search_line("ip http server")
+    assert [(h["device"], h["snapshot"]) for h in hits] == [("a", "20250102_000000"), ("b", "20250102_000000")]
+    assert idx.stats()["postings"] == 4
+
+    assert [t for _, t, p in config_lines("interface Gi1\n description x\n!\n") if p] == ["description x"]
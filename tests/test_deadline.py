@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from src.cmdrunner import run_read_cli_commands
+from src.concurrency import WorkerPool
+from src.deadline import DeadlineExceeded, clamp, deadline, remaining
+from src.dnac_client import DNACClient
+from src.instrumentation import RequestMetrics
+from src.jobs import wait_for_task
+from src.mock_dnac import MockConfig, MockDNAC, synthetic_fleet
+
+def test_nested_deadlines_only_shrink():
+    assert remaining() is None
+    with deadline(10):
+        with deadline(60):
+            assert remaining() <= 10
+        with deadline(1):
+            assert clamp(30) <= 1
+    assert remaining() is None
+    with deadline(-1):
+        with pytest.raises(DeadlineExceeded):
+            clamp(30)
+
+def test_request_timeout_is_capped_by_the_deadline():
+    with MockDNAC(synthetic_fleet(5), MockConfig(latency_ms=600)) as mock:
+        metrics = RequestMetrics()
+        c = DNACClient(mock.base_url, "u", "p", timeout=30, hooks=[metrics])
+        c._ensure_token()
+        t0 = time.perf_counter()
+        with deadline(0.2), pytest.raises(DeadlineExceeded):
+            c.get("/dna/intent/api/v1/sites")
+        assert time.perf_counter() - t0 < 0.5
+        with deadline(-1), pytest.raises(DeadlineExceeded):
+            c.get("/dna/intent/api/v1/sites")
+        assert metrics.stats[("GET", "/dna/intent/api/v1/sites")].latency.count == 1  # expired: nothing sent
+        time.sleep(0.5)  # let the abandoned request finish before the mock stops
+
+def test_task_polling_stops_at_the_step_deadline():
+    with MockDNAC(synthetic_fleet(5), MockConfig(task_delay_s=30)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        job = run_read_cli_commands(c, [mock.devices[0]["id"]], ["show version"])
+
+        def step(_):
+            return wait_for_task(c, job["response"]["taskId"], timeout_s=300, poll_s=0.1)
+
+        t0 = time.perf_counter()
+        [out] = list(WorkerPool(1, deadline_s=0.5).map(step, [1]))
+        assert isinstance(out.error, DeadlineExceeded)
+        assert time.perf_counter() - t0 < 2
@@ -0,0 +1,32 @@
+from src.decoding import project, record_type
+from src.dnac_client import DNACClient
+from src.mock_dnac import MockDNAC, synthetic_fleet
+
+FIELDS = ("hostname", "managementIpAddress", "platformId")
+
+def test_paginate_projection():
+    with MockDNAC(synthetic_fleet(700)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        full = c.paginate("/dna/intent/api/v1/network-device")
+        slim = c.paginate("/dna/intent/api/v1/network-device", fields=FIELDS)
+    assert len(slim) == 700
+    assert slim[0].get("hostname") == full[0]["hostname"]
+    assert slim[0]["platformId"] == full[0]["platformId"]
+    assert slim[0].get("serialNumber") is None
+    assert slim[0] == {k: full[0][k] for k in FIELDS}
+    assert not hasattr(slim[0], "__dict__")
+
+def test_record_type_is_shared():
+    assert record_type(FIELDS) is record_type(list(FIELDS))
+    assert project([{"hostname": "a"}], FIELDS)[0].to_dict() == {"hostname": "a", "managementIpAddress": None, "platformId": None}
+
+def test_unsafe_field_names_fall_back_to_dicts():
+    import pytest
+    item = {"hostname": "a", "items": 3, "config-id": "c1", "class": "x"}
+    for fields in (("hostname", "items"), ("hostname", "config-id"), ("class",), ("__x",), ("hostname", "hostname")):
+        with pytest.raises(ValueError):
+            record_type(fields)
+        out = project([item], fields)
+        assert out == [{f: item.get(f) for f in fields}] and type(out[0]) is dict
+    rec = project([item], ("hostname", "_private"))[0]
+    assert not isinstance(rec, dict) and rec.items() == [("hostname", "a"), ("_private", None)]
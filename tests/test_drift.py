@@ -0,0 +1,41 @@
+from src.drift import DiffCache, cluster_drift, diff_configs, save_snapshot, write_drift_report
+from src.mock_dnac import device_config, synthetic_fleet
+
+
+def test_fleet_change_diffed_once_and_clustered(tmp_path):
+    outdir = str(tmp_path / "baselines")
+    fleet = synthetic_fleet(30)
+    diffs = DiffCache()
+    for d in fleet:
+        save_snapshot(d["id"], device_config(d), outdir, stamp="20250101_000000", diffs=diffs)
+    results = []
+    for n, d in enumerate(fleet):
+        cfg = device_config(d, generation=1 if n % 3 else 0)
+        if n % 10 == 0:
+            cfg = cfg.replace("ip http secure-server\n", "")
+        results.append(save_snapshot(d["id"], cfg, outdir, stamp="20250102_000000", diffs=diffs))
+
+    # one diff for the generation bump and one for the https removal; devices with both changes span their
+    # management address, so each of those is diffed separately
+    assert diffs.misses == 4
+    clusters = cluster_drift(results)
+    assert [len(c["devices"]) for c in clusters] == [18, 1, 1, 1]
+    assert sum(r["status"] == "NO_CHANGE" for r in results) == 9
+    # same text as a plain difflib run, hunk line numbers included
+    d = fleet[1]
+    with open(results[1]["diff"]) as f:
+        assert f.read() == diff_configs(device_config(d), device_config(d, generation=1))
+
+    report = str(tmp_path / "report.txt")
+    write_drift_report(report, clusters)
+    text = open(report).read()
+    assert text.startswith("# 21 drifted devices, 4 distinct change(s)") and text.count("+logging host") == 3
+
+
+def test_hunk_offsets_follow_each_device():
+    diffs = DiffCache()
+    base = "".join(f"line {i}\n" for i in range(20))
+    a = diffs.diff("hostname a\n" + base, "hostname a\n" + base.replace("line 10\n", "line ten\n"))
+    b = diffs.diff("hostname b\nbanner x\n" + base, "hostname b\nbanner x\n" + base.replace("line 10\n", "line ten\n"))
+    assert diffs.hits == 1 and a.splitlines()[2] == "@@ -9,7 +9,7 @@" and b.splitlines()[2] == "@@ -10,7 +10,7 @@"
+    assert b == diff_configs("hostname b\nbanner x\n" + base, "hostname b\nbanner x\n" + base.replace("line 10\n", "line ten\n"))
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from src.hedging import Hedger, RetryBudget
+from src.instrumentation import RequestEvent, RequestMetrics
+
+TASK = "/dna/intent/api/v1/task/{id}"
+
+def _metrics(latency_s=0.01, n=20):
+    metrics = RequestMetrics()
+    for _ in range(n):
+        metrics(RequestEvent("GET", TASK, TASK, 200, 10, latency_s))
+    return metrics
+
+def _slow_then_fast():
+    calls = []
+    lock = threading.Lock()
+
+    def attempt():
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            time.sleep(1.0)
+            return "slow"
+        return "fast"
+    return attempt, calls
+
+def test_budget_refills_per_request():
+    budget = RetryBudget(ratio=0.5, burst=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+def test_slow_get_is_hedged_and_first_answer_wins():
+    hedger = Hedger(_metrics(), RetryBudget(burst=1))
+    attempt, calls = _slow_then_fast()
+    t0 = time.perf_counter()
+    assert hedger.call("GET", TASK, attempt) == "fast"
+    assert time.perf_counter() - t0 < 0.5
+    assert (len(calls), hedger.hedged, hedger.won) == (2, 1, 1)
+
+def test_no_hedge_without_samples_or_budget():
+    hedger = Hedger(_metrics(n=5), RetryBudget(burst=1))
+    attempt, calls = _slow_then_fast()
+    assert hedger.call("GET", TASK, attempt) == "slow"  # below min_samples: no p95 to go by
+    hedger = Hedger(_metrics(), RetryBudget(burst=0))
+    attempt, calls = _slow_then_fast()
+    assert hedger.call("GET", TASK, attempt) == "slow"
+    assert (len(calls), hedger.hedged, hedger.denied) == (1, 0, 1)
+
+def test_more_callers_than_pool_threads_never_queue():
+    # 10 callers, 4 pool threads: four primaries get a thread, the other six run on their callers' threads
+    # instead of waiting for one, so the batch takes one attempt's time, not three.
+    hedger = Hedger(_metrics(), RetryBudget(burst=0), max_workers=4)
+    start = threading.Barrier(10)
+    took = []
+
+    def caller():
+        start.wait()
+        t0 = time.perf_counter()
+        assert hedger.call("GET", TASK, lambda: time.sleep(0.3) or "ok") == "ok"
+        took.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=caller) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(took) == 10 and max(took) < 0.55
+    assert (hedger.inline, hedger.denied) == (6, 4)
+    assert hedger._busy == 0
+    hedger.close()
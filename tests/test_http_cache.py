@@ -0,0 +1,51 @@
+import time
+
+from src.dnac_client import DNACClient
+from src.http_cache import ResponseCache
+from src.mock_dnac import MockDNAC, synthetic_fleet
+
+def test_ttl_revalidation_and_persistence(tmp_path):
+    path = str(tmp_path / "http.json")
+    cache = ResponseCache(path=path)
+    with MockDNAC(synthetic_fleet(50)) as mock:
+        c = DNACClient(mock.base_url, "u", "p", cache=cache)
+        first = c.get("/dna/intent/api/v1/sites")
+        assert c.get("/dna/intent/api/v1/sites") == first
+        assert mock.hits["sites"] == 1 and cache.hits == 1
+
+        # Expire the entry: the next read revalidates with If-None-Match and gets a 304
+        for entry in cache._entries.values():
+            entry.stored_at = time.time() - 7200
+        assert c.get("/dna/intent/api/v1/sites") == first
+        assert mock.hits["not_modified"] == 1 and cache.revalidated == 1
+
+        # Task endpoints have no TTL and are never cached
+        c.get("/dna/intent/api/v1/task/abc")
+        c.get("/dna/intent/api/v1/task/abc")
+        assert mock.hits["task"] == 2
+
+        cache.save()
+        reloaded = ResponseCache(path=path)
+        c2 = DNACClient(mock.base_url, "u", "p", cache=reloaded)
+        assert c2.get("/dna/intent/api/v1/sites") == first
+        assert mock.hits["sites"] == 2  # served from the persisted copy, not the cluster
+
+def test_lru_eviction_by_bytes():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", b"12345", 60)
+    cache.put("b", b"12345", 60)
+    cache.get("a")
+    cache.put("c", b"12345", 60)
+    assert cache.get("b") is None and cache.get("a") is not None and cache.size == 10
+
+def test_hit_and_miss_counts_are_exact_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    cache = ResponseCache(ttls={})
+    cache.put("k", b"{}", ttl=60)
+
+    def look(i):
+        return cache.lookup("k" if i % 2 else "missing")[1]
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        fresh = sum(ex.map(look, range(20000)))
+    assert (cache.hits, cache.misses) == (fresh, 20000 - fresh) == (10000, 10000)
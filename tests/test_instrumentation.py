@@ -0,0 +1,28 @@
+from src.dnac_client import DNACClient
+from src.instrumentation import LatencyHistogram, RequestMetrics, endpoint_template
+from src.mock_dnac import MockConfig, MockDNAC, synthetic_fleet
+
+def test_endpoint_template():
+    assert endpoint_template("/dna/intent/api/v1/task/3f2a1c6e-0a1b-4c2d-9e8f-123456789abc") == "/dna/intent/api/v1/task/{id}"
+    assert endpoint_template("/dna/intent/api/v1/network-device") == "/dna/intent/api/v1/network-device"
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    for ms in range(1, 1001):
+        h.record(ms / 1000)
+    assert abs(h.percentile(50) - 0.5) < 0.005
+    assert abs(h.percentile(99) - 0.99) < 0.01
+    assert h.count_le(0.1) in range(98, 101)
+
+def test_metrics_capture_throttle_retries():
+    metrics = RequestMetrics()
+    cfg = MockConfig(throttle_rate=0.3, retry_after_s=0)
+    with MockDNAC(synthetic_fleet(600), cfg) as mock:
+        c = DNACClient(mock.base_url, "u", "p", hooks=[metrics], throttle_retries=20)
+        assert len(c.paginate("/dna/intent/api/v1/network-device")) == 600
+    rows = {r["endpoint"]: r for r in metrics.summary_rows()}
+    assert rows["/dna/intent/api/v1/network-device"]["count"] == 2
+    assert sum(r["retries"] for r in rows.values()) == mock.hits["throttled"]
+    text = metrics.to_prometheus()
+    assert 'catalyst_http_request_duration_seconds_count{method="GET",endpoint="/dna/intent/api/v1/network-device"} 2' in text
+    assert "network-device" in metrics.summary_table()
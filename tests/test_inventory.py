@@ -0,0 +1,74 @@
+import csv
+import json
+
+from src.dnac_client import DNACClient
+from src.inventory import SITE_FIELD, Inventory
+from src.mock_dnac import DEVICE_FIXTURES, MockDNAC, synthetic_assignments, synthetic_fleet
+
+def test_filters_and_group_by():
+    fleet = synthetic_fleet(1000)
+    inv = Inventory.from_records(fleet)
+    assert len(inv) == 1000
+
+    c9300 = inv.filter(platform="C9300-48P")
+    assert len(c9300) == sum(1 for d in fleet if d["platformId"] == "C9300-48P")
+    assert set(c9300.column("platformId")) == {"C9300-48P"}
+
+    sites = synthetic_assignments(fleet)
+    assert inv.assign_sites(sites) == 1000
+    site = "Global/US/Orlando/Campus/Building1"
+    down = inv.filter(site=site, reachable=False)
+    expected = [d["id"] for d in fleet
+                if sites[d["id"]].startswith(site + "/") and d["reachabilityStatus"] != "Reachable"]
+    assert down.column("id") == expected
+
+    counts = inv.counts("softwareVersion")
+    assert sum(counts.values()) == 1000
+    groups = inv.filter(platform=["C9410R", "C9500-48Y4C"]).group_by("platformId")
+    assert set(groups) == {"C9410R", "C9500-48Y4C"}
+    assert len(groups["C9410R"]) == 200
+
+def test_fetch_and_csv(tmp_path):
+    with MockDNAC(synthetic_fleet(1200)) as mock:
+        inv = Inventory.fetch(DNACClient(mock.base_url, "u", "p"))
+    path = tmp_path / "inv.csv"
+    assert inv.filter(version="17.12.4").to_csv(str(path), ["hostname", "softwareVersion"]) > 0
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["hostname", "softwareVersion"]
+    assert {r[1] for r in rows[1:]} == {"17.12.4"}
+
+def test_site_prefix_matches_whole_segments_for_any_column_layout():
+    import pytest
+    records = [{"id": "a", SITE_FIELD: "Global/US/Orlando"}, {"id": "b", SITE_FIELD: "Global/US/Orlando/B1"},
+               {"id": "c", SITE_FIELD: "Global/US/Orlean"}, {"id": "d", SITE_FIELD: None}]
+    for categorical in ((SITE_FIELD,), ()):
+        inv = Inventory.from_records(records, fields=("id", SITE_FIELD), categorical=categorical)
+        assert inv.filter(site="Global/US/Orlando/").column("id") == ["a", "b"]
+        assert inv.filter(site="Global/US/Orl").column("id") == []
+        assert inv.filter(site=["Global/US/Orlean", "Global/US/Orlando/B1"]).column("id") == ["b", "c"]
+        with pytest.raises(ValueError):
+            inv.filter(site=[None])
+
+def test_filter_site_uses_membership_for_real_device_records():
+    # Real records (api/testing/devices.json) have no locationName; sites come from the membership API.
+    from src import site_index
+    with open(DEVICE_FIXTURES[0], encoding="utf-8") as f:
+        devices = json.load(f)["response"]
+    assert devices and all(d.get("locationName") is None for d in devices)
+    site_index._INDEXES.clear()
+    with MockDNAC(devices) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        inv = Inventory.fetch(c)
+        assert len(inv) == len(devices)
+        building = "Global/US/Orlando/Campus/Building0"
+        assert len(inv.filter(site=building)) == 0          # nothing assigned yet
+        view = inv.filter_site(c, building)
+        expected = [d["id"] for d in devices if mock.assignments[d["id"]].startswith(building + "/")]
+        assert expected and view.column("id") == expected
+        assert set(view.column(SITE_FIELD)) == {mock.assignments[i] for i in expected}
+        floor = [d["id"] for d in devices if mock.assignments[d["id"]] == building + "/Floor2"]
+        assert 0 < len(floor) < len(devices) and inv.filter(site=building + "/Floor2").column("id") == floor
+        floors = [s for s in mock.sites if s["nameHierarchy"].startswith(building)]
+        assert mock.hits["membership"] == len(floors)       # one membership call per site in the subtree
+    site_index._INDEXES.clear()
@@ -0,0 +1,24 @@
+from src.dnac_client import DNACClient
+from src.jobs import wait_for_task
+from src.cmdrunner import run_read_cli_commands, collect_read_results, command_rows
+from src.mock_dnac import MockDNAC, synthetic_fleet
+
+def test_paginate_and_command_runner():
+    with MockDNAC(synthetic_fleet(1234)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        devices = c.paginate("/dna/intent/api/v1/network-device")
+        assert len(devices) == 1234
+        assert len({d["id"] for d in devices}) == 1234
+
+        job = run_read_cli_commands(c, [devices[0]["id"]], ["show power inline"])
+        task = wait_for_task(c, job["response"]["taskId"], poll_s=0)
+        assert "fileId" in task["progress"]
+        assert mock.hits["devices"] == 3
+
+def test_collect_read_results_rows():
+    with MockDNAC(synthetic_fleet(5)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        uuids = [d["id"] for d in mock.devices]
+        rows = command_rows(collect_read_results(c, uuids, ["show version", "show power inline"], poll_s=0))
+        assert len(rows) == 10
+        assert {r["deviceUuid"] for r in rows} == set(uuids)
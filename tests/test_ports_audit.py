@@ -0,0 +1,45 @@
+import csv
+from collections import Counter
+
+from src.cli import main
+from src.mock_dnac import MockConfig, MockDNAC, _has_cdp, _has_lldp, _poe_on, synthetic_fleet
+from src.ports_audit import AUDIT_FIELDS
+
+
+def test_ports_audit_joins_api_state_with_show_output(tmp_path, monkeypatch):
+    fleet = synthetic_fleet(30)
+    fleet[3]["reachabilityStatus"] = "Unreachable"
+    with MockDNAC(fleet, MockConfig(ports_per_switch=24)) as mock:
+        monkeypatch.setenv("DNAC_URL", mock.base_url)
+        monkeypatch.setenv("DNAC_USERNAME", "u")
+        monkeypatch.setenv("DNAC_PASSWORD", "p")
+        out = str(tmp_path / "ports_audit.csv")
+        skipped = str(tmp_path / "skipped.csv")
+        rc = main(["ports", "--out", out, "--chunk", "8", "--journal", str(tmp_path / "ckpt.db"), "--skipped", skipped])
+        assert rc == 0  # the unreachable switch is skipped before dispatch, not failed
+        assert mock.hits["interfaces"] == 2 and mock.hits["read_request"] == 4
+    with open(skipped, newline="") as f:
+        assert [(r["hostname"], r["reason"]) for r in csv.DictReader(f)] == [(fleet[3]["hostname"], "inventory: Unreachable")]
+
+    with open(out, newline="") as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == AUDIT_FIELDS
+        rows = list(reader)
+    assert len(rows) == 30 * 25  # API interfaces, including the skipped switch
+
+    dev = next(d for d in mock.devices if d["reachabilityStatus"] == "Reachable")
+    mine = {r["ifName"]: r for r in rows if r["switch"] == dev["hostname"]}
+    for p in range(1, 25):
+        row = mine[f"GigabitEthernet1/0/{p}"]
+        assert row["poe"] == ("on" if _poe_on(dev, p) else "off")
+        if not _poe_on(dev, p):
+            assert row["detectedType"] == ""
+        elif _has_lldp(dev, p):
+            assert (row["neighbor"], row["detectedType"]) == (f"AP-{p}", "ap")
+        elif _has_cdp(dev, p):
+            assert row["detectedType"] == "phone" and row["neighbor"].startswith("SEP")
+        else:
+            assert row["detectedType"] == "powered-unknown"
+    assert mine["Vlan10"]["poe"] == "" and mine["Vlan10"]["operStatus"] == "up"
+    assert {r["poe"] for r in rows if r["switch"] == fleet[3]["hostname"]} == {""}
+    assert Counter(r["adminStatus"] for r in rows).keys() <= {"up", "down"}
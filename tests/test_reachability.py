@@ -0,0 +1,44 @@
+import asyncio
+import socket
+import time
+
+from src import reachability
+from src.inventory import Inventory
+from src.reachability import FIELDS, prefilter, probe
+
+
+def _closed_port():
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def test_probe_and_prefilter():
+    server = socket.create_server(("127.0.0.1", 0))
+    open_port, closed = server.getsockname()[1], _closed_port()
+    try:
+        assert probe({"up": "127.0.0.1"}, (closed, open_port)) == {"up": open_port}
+        assert probe({"down": "127.0.0.1"}, (closed,)) == {"down": None}
+
+        inv = Inventory.from_records([
+            {"id": "a", "hostname": "sw-a", "managementIpAddress": "127.0.0.1", "reachabilityStatus": "Reachable"},
+            {"id": "b", "hostname": "sw-b", "managementIpAddress": "127.0.0.1", "reachabilityStatus": "Unreachable"},
+            {"id": "c", "hostname": "sw-c", "managementIpAddress": "127.0.0.2", "reachabilityStatus": "Reachable"},
+        ], fields=FIELDS)
+        assert prefilter(inv, ["c", "b", "a", "zz"]) == (["c", "a", "zz"], {"b": "inventory: Unreachable"})
+        targets, skipped = prefilter(inv, ["a", "c"], probe_ports=(open_port,))
+        assert targets == ["a"] and skipped["c"].startswith("probe: no answer")
+    finally:
+        server.close()
+
+
+def test_probe_deadline_bounds_the_sweep(monkeypatch):
+    async def hang(host, port):
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(reachability, "_connect", hang)
+    t0 = time.perf_counter()
+    result = probe({f"d{i}": "10.0.0.1" for i in range(2000)}, deadline_s=0.3)
+    assert time.perf_counter() - t0 < 2 and set(result.values()) == {None} and len(result) == 2000
@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.dnac_client import DNACClient
+from src.mock_dnac import MockConfig, MockDNAC, synthetic_fleet
+from src.singleflight import SingleFlight
+
+def test_concurrent_identical_gets_share_one_request():
+    with MockDNAC(synthetic_fleet(20), MockConfig(latency_ms=200)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        c.get("/dna/intent/api/v1/task/warm")  # fetch the token up front
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(lambda _: c.get("/dna/intent/api/v1/sites", {"limit": 10}), range(8)))
+        assert mock.hits["sites"] == 1
+        assert all(r == results[0] for r in results)
+        assert c.inflight.shared == 7
+
+def test_errors_propagate_to_waiters():
+    sf = SingleFlight()
+    gate = threading.Event()
+    errors = []
+
+    def boom():
+        gate.wait(5)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            sf.do("k", boom)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    deadline = time.time() + 5
+    while sf.shared < 3 and time.time() < deadline:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(errors) == 4
+
+def test_deadlines_stay_per_caller_when_coalesced():
+    from src.deadline import DeadlineExceeded, deadline
+    with MockDNAC(synthetic_fleet(5), MockConfig(latency_ms=1000)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        c._ensure_token()
+        path = "/dna/intent/api/v1/sites"
+
+        def bounded_get(seconds, delay=0.0):
+            time.sleep(delay)
+            t0 = time.perf_counter()
+            with deadline(seconds):
+                try:
+                    c.get(path)
+                    return "ok", time.perf_counter() - t0
+                except DeadlineExceeded:
+                    return "deadline", time.perf_counter() - t0
+
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            # (a) the leader's expired budget is not handed to a waiter without one
+            leader = ex.submit(bounded_get, 0.3)
+            waiter = ex.submit(bounded_get, None, 0.1)
+            assert leader.result()[0] == "deadline"
+            assert waiter.result()[0] == "ok"
+            # (b) a waiter gives up at its own deadline, not the leader's
+            leader = ex.submit(bounded_get, None)
+            waiter = ex.submit(bounded_get, 0.2, 0.1)
+            status, elapsed = waiter.result()
+            assert status == "deadline" and elapsed < 0.5
+            assert leader.result()[0] == "ok"
@@ -0,0 +1,81 @@
+import csv
+import json
+import threading
+import pytest
+from src.sinks import BufferedSink, CsvSink, JsonlSink, ParquetSink, Sink, open_sink
+
+def test_buffered_csv_from_concurrent_writers(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = BufferedSink(CsvSink(str(path), ["dev", "n"]), maxsize=16, batch_size=10, flush_interval_s=0.05)
+
+    def produce(w):
+        for n in range(250):
+            sink.write({"dev": f"d{w}", "n": n, "extra": "dropped"})
+
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    sink.close()
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 1000 and set(rows[0]) == {"dev", "n"}
+    assert sorted(int(r["n"]) for r in rows if r["dev"] == "d2") == list(range(250))
+
+def test_rows_reach_disk_before_close_and_jsonl(tmp_path):
+    path = tmp_path / "out.jsonl"
+    sink = BufferedSink(open_sink(str(path), []), flush_interval_s=0.01)
+    assert isinstance(sink.sink, JsonlSink)
+    sink.write({"a": 1})
+    sink.write({"a": 2})
+    for _ in range(200):  # writer thread flushes within the interval, without close()
+        if path.read_text().count("\n") == 2:
+            break
+        threading.Event().wait(0.01)
+    assert [json.loads(l) for l in path.read_text().splitlines()] == [{"a": 1}, {"a": 2}]
+    sink.close()
+
+def test_writer_errors_surface_to_producer(tmp_path):
+    class Broken(CsvSink):
+        def write_many(self, rows):
+            raise OSError("disk full")
+
+    sink = BufferedSink(Broken(str(tmp_path / "x.csv"), ["a"]), flush_interval_s=0.01)
+    sink.write({"a": 1})
+    with pytest.raises(RuntimeError):
+        sink.close()
+
+def test_sink_subclasses_must_implement_write_many():
+    class Nothing(Sink):
+        pass
+
+    class Listed(Sink):
+        def __init__(self):
+            self.rows = []
+
+        def write_many(self, rows):
+            self.rows.extend(rows)
+
+    with pytest.raises(TypeError):
+        Nothing()
+    sink = Listed()
+    sink.write({"a": 1})
+    assert sink.rows == [{"a": 1}]
+
+def test_parquet_row_groups_and_part_files(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+    with BufferedSink(ParquetSink(path, ["n"], row_group_size=100), batch_size=7, flush_interval_s=0.01) as sink:
+        for n in range(250):
+            sink.write({"n": n})
+    meta = pq.ParquetFile(path).metadata
+    assert meta.num_rows == 250 and meta.num_row_groups == 3     # 100 + 100 + 50, not one per batch of 7
+
+    parts = ParquetSink(str(tmp_path / "rolled.parquet"), ["n"], row_group_size=40, rows_per_file=100)
+    parts.write_many({"n": n} for n in range(150))
+    assert len(parts.paths) == 2
+    assert pq.ParquetFile(parts.paths[0]).metadata.num_rows == 100  # full part already closed and readable
+    parts.close()
+    assert [pq.ParquetFile(p).metadata.num_rows for p in parts.paths] == [100, 50]
@@ -0,0 +1,61 @@
+from src.site_index import SiteIndex
+
+SITES = [
+    {"id": "g", "nameHierarchy": "Global", "type": "area"},
+    {"id": "b1", "nameHierarchy": "Global/US/Orlando/Epic/Building1", "type": "building"},
+    {"id": "f1", "nameHierarchy": "Global/US/Orlando/Epic/Building1/Floor1", "type": "floor"},
+    {"id": "f2", "nameHierarchy": "Global/US/Orlando/Epic/Building1/Floor2", "type": "floor"},
+    {"id": "b2", "nameHierarchy": "Global/US/Orlando/Epic/Building2", "type": "building"},
+]
+
+def test_lookup_and_floors(tmp_path):
+    idx = SiteIndex(SITES)
+    assert idx.site_id("Global/US/Orlando/Epic/Building1/Floor1") == "f1"
+    assert idx.site_id("Global/Nowhere") is None
+    floors = idx.site_ids_under("Global/US/Orlando/Epic/Building1", site_type="floor")
+    assert sorted(floors) == ["f1", "f2"]
+
+    path = tmp_path / "sites.json"
+    idx.save(str(path))
+    again = SiteIndex.load(str(path))
+    assert len(again) == len(SITES)
+    assert again.loaded_at == idx.loaded_at
+
+def test_shared_index_ttl_and_disk_reload(tmp_path):
+    import pytest
+    from src import site_index
+    from src.dnac_client import DNACClient
+    from src.inventory import Inventory
+    from src.mock_dnac import MockDNAC, synthetic_fleet
+    with MockDNAC(synthetic_fleet(50)) as mock:
+        c = DNACClient(mock.base_url, "u", "p")
+        path = str(tmp_path / "sites.json")
+        site_index._INDEXES.clear()
+        idx = site_index.get_site_index(c, cache_path=path)
+        fetched = mock.hits["sites"]
+        assert fetched and len(idx)
+        assert site_index.get_site_index(c, cache_path=path) is idx          # memory
+        site_index._INDEXES.clear()
+        again = site_index.get_site_index(c, cache_path=path)                # disk copy, no download
+        assert mock.hits["sites"] == fetched and len(again) == len(idx)
+
+        again.loaded_at -= 120                                               # stale in memory and on disk
+        again.save(path)
+        fresh = site_index.get_site_index(c, cache_path=path, ttl_s=60)
+        assert mock.hits["sites"] == 2 * fetched and fresh.age() < 60
+        assert SiteIndex.load(path).loaded_at == fresh.loaded_at
+
+        building = "Global/US/Orlando/Campus/Building0"
+        inv = Inventory.from_records(mock.devices)
+        by_id = inv.filter_site(c, fresh.site_id(building))
+        assert by_id.column("id") == inv.filter(site=building).column("id") and len(by_id)
+        with pytest.raises(KeyError):
+            inv.filter_site(c, "Global/Nowhere")
+
+        # misses refetch only an index older than MISS_REFRESH_S, however many names miss
+        assert mock.hits["sites"] == 2 * fetched
+        fresh.loaded_at -= site_index.MISS_REFRESH_S
+        for name in ("Global/Nowhere", "Global/Elsewhere", "Global/Nowhere"):
+            with pytest.raises(KeyError):
+                site_index.resolve_site_id(c, name, cache_path=path)
+        assert mock.hits["sites"] == 3 * fetched
@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from src.cmdrunner import run_read_cli_commands
+from src.dnac_client import DNACClient
+from src.jobs import wait_for_task
+from src.mock_dnac import MockConfig, MockDNAC, synthetic_fleet
+from src.webhooks import WebhookListener
+
+AUTH = {"Authorization": "Bearer s3cret"}
+
+
+def send(url, payload, headers=AUTH):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST",
+                                 headers={"Content-Type": "application/json", **headers})
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return resp.status
+
+
+def test_notification_ends_wait_without_polling():
+    with MockDNAC(synthetic_fleet(5), MockConfig(task_delay_s=0.3)) as mock, \
+            WebhookListener(host="127.0.0.1", headers=AUTH) as listener:
+        client = DNACClient(mock.base_url, "u", "p")
+        task_id = run_read_cli_commands(client, [mock.devices[0]["id"]], ["show version"])["response"]["taskId"]
+
+        def sender():
+            time.sleep(0.4)
+            send(listener.url, {"eventId": "TASK-COMPLETE", "details": {"taskId": task_id}})
+
+        threading.Thread(target=sender).start()
+        t0 = time.perf_counter()
+        task = wait_for_task(client, task_id, listener=listener, fallback_poll_s=30)
+        assert task.get("endTime") and time.perf_counter() - t0 < 5
+        assert mock.hits["task"] == 2  # first look, then one read after the notification
+        assert listener.received == 1 and not listener._waiters
+
+
+def test_rejects_unauthenticated_and_buffers_early_events():
+    with WebhookListener(host="127.0.0.1", headers=AUTH) as listener:
+        with pytest.raises(urllib.error.HTTPError) as e:
+            send(listener.url, {"taskId": "t1"}, headers={})
+        assert e.value.code == 401 and listener.rejected == 1
+
+        assert send(listener.url, [{"details": {"taskId": "t1"}}, {"taskId": "t2"}]) == 202
+        early = listener.expect("t1")
+        assert early.done() and early.result()[0]["details"]["taskId"] == "t1"
+        assert not listener.expect("t3").done()
+
+def test_cli_listener_stays_on_loopback_without_token(monkeypatch, tmp_path, capsys):
+    import socket
+    from src.cli import build_parser, start_listener
+    monkeypatch.delenv("DNAC_WEBHOOK_TOKEN", raising=False)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    args = build_parser().parse_args(["inventory", "--settings", str(tmp_path / "none.yaml"), "--webhook", str(port)])
+    listener = start_listener(args)
+    try:
+        assert listener.host == "127.0.0.1" and not listener.headers
+        assert "loopback only" in capsys.readouterr().out
+    finally:
+        listener.stop()